@@ -0,0 +1,21 @@
+"""
+Benchmarks for the mastery tracker and the Gaussian elimination notes
+
+The bench_*/stress_* scripts each measure one change in depth. The package
+modules are the reproducible suite shared by both sides of the repository:
+    generators   seeded synthetic curricula and linear systems
+    suite        run the tracker and solver cases, save JSON baselines, compare runs
+
+    python -m benchmarks run --save-baseline main
+    python -m benchmarks compare main
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SOLVER_DIR = ROOT / "maths" / "notes"
+
+for path in (ROOT, SOLVER_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Concept memory benchmark
+Measures the resident size of N concepts as the dict-of-dicts json.load builds
+against the same concepts in a ConceptStore, plus the cost of reading fields
+and of turning the store back into the JSON layout; then the memory of a whole
+CompleteMathTracker loaded from a file of N concepts, index by index, and its
+RSS growth
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from benchmarks.generators import curriculum  # noqa: E402
+from complete_math_tracker import MASTERY_THRESHOLD, CompleteMathTracker  # noqa: E402
+from tracker_graph import PrerequisiteGraph  # noqa: E402
+from tracker_review import ReviewScheduler  # noqa: E402
+from tracker_store import ConceptStore  # noqa: E402
+
+
+def concepts_json(count: int, seed: int) -> str:
+    """A concepts section as stored on disk, for the shared synthetic curriculum"""
+    return json.dumps({concept.name: asdict(concept) for concept in curriculum(count, seed)})
+
+
+def measure(build):
+    """(result, bytes still allocated once build returns, seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def scan(concepts) -> int:
+    return sum(concept["mastery_level"] * concept["difficulty"] for concept in concepts.values())
+
+
+def resident_bytes() -> int:
+    """Current RSS (peak RSS where /proc is not available)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def seed_tracker(data_file: Path, count: int, seed: int):
+    """Store the synthetic curriculum the way an import does"""
+    tracker = CompleteMathTracker(str(data_file))
+    with tracker.bulk_load():
+        tracker.add_concepts(curriculum(count, seed))
+    tracker.storage.close()
+
+
+def tracker_rss(data_file: str) -> int:
+    """RSS growth from loading the tracker (run in a fresh process, without tracemalloc)"""
+    gc.collect()
+    before = resident_bytes()
+    tracker = CompleteMathTracker(data_file)
+    tracker.get_current_recommendations()
+    gc.collect()
+    return resident_bytes() - before
+
+
+def tracker_bytes(data_file: str) -> Dict[str, float]:
+    """Bytes a loaded tracker keeps, and what each index on its ConceptStore costs (run in a fresh process)"""
+    tracker, total, load_time = measure(lambda: CompleteMathTracker(data_file))
+    store = tracker.data["concepts"]
+    _, store_size, _ = measure(lambda: ConceptStore(store.to_dict()))
+    _, graph, _ = measure(lambda: PrerequisiteGraph.from_concepts(store, MASTERY_THRESHOLD))
+    _, reviews, _ = measure(lambda: ReviewScheduler(tracker.data["spaced_repetition"], store))
+    _, columns, _ = measure(tracker._concept_columns)  # built by the first report
+    return {"total": total, "store": store_size, "graph": graph, "reviews": reviews, "columns": columns,
+            "load": load_time}
+
+
+def in_fresh_process(function, *args):
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(function, *args).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare concept memory: dict-of-dicts vs ConceptStore, "
+                                                 "and measure a whole loaded tracker")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000], help="Concept counts")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    print(f"{'concepts':>10} {'dicts MB':>9} {'store MB':>9} {'saved':>6} {'load s':>7} "
+          f"{'scan dict s':>11} {'scan store s':>12} {'to_dict s':>9}")
+    for count in args.sizes:
+        text = concepts_json(count, args.seed)
+        plain, plain_size, _ = measure(lambda: json.loads(text))
+        store, store_size, load_time = measure(lambda: ConceptStore(json.loads(text)))
+        del text
+
+        start = time.perf_counter()
+        expected = scan(plain)
+        scan_plain = time.perf_counter() - start
+        start = time.perf_counter()
+        matches = scan(store) == expected
+        scan_store = time.perf_counter() - start
+        start = time.perf_counter()
+        matches = matches and store.to_dict() == plain
+        to_dict = time.perf_counter() - start
+
+        print(f"{count:>10,} {plain_size / 2**20:>9.1f} {store_size / 2**20:>9.1f} "
+              f"{1 - store_size / plain_size:>6.0%} {load_time:>7.2f} {scan_plain:>11.3f} {scan_store:>12.3f} "
+              f"{to_dict:>9.2f}" + ("" if matches else "  MISMATCH"))
+        del plain, store
+        if not matches:
+            sys.exit(1)
+
+    print(f"\n{'concepts':>10} {'tracker MB':>10} {'store MB':>9} {'graph MB':>9} {'reviews MB':>10} "
+          f"{'columns MB':>10} {'B/concept':>9} {'RSS MB':>7} {'load s':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.sizes:
+            data_file = Path(directory) / f"tracker-{count}.json"
+            seed_tracker(data_file, count, args.seed)
+            sizes = in_fresh_process(tracker_bytes, str(data_file))
+            rss = in_fresh_process(tracker_rss, str(data_file))
+            mb = {key: value / 2**20 for key, value in sizes.items()}
+            print(f"{count:>10,} {mb['total']:>10.1f} {mb['store']:>9.1f} {mb['graph']:>9.1f} "
+                  f"{mb['reviews']:>10.1f} {mb['columns']:>10.1f} {sizes['total'] / count:>9.0f} "
+                  f"{rss / 2**20:>7.1f} {sizes['load']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
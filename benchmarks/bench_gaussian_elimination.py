@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Gaussian elimination benchmark
+Compares the blocked LU solver (float64 and mixed precision) with the original
+row loop and numpy.linalg.solve
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "maths" / "notes"))
+from gausianelimination import gaussian_elimination  # noqa: E402
+
+DEFAULT_SIZES = [10, 50, 100, 250, 500, 1000, 2000, 4000]
+
+
+def loop_gaussian_elimination(matrix, vector):
+    """The original element-by-element implementation, kept as the baseline"""
+    n = len(matrix)
+    augmented = np.column_stack([matrix.astype(float), vector.astype(float)])
+
+    for i in range(n):
+        max_row = i
+        for k in range(i + 1, n):
+            if abs(augmented[k, i]) > abs(augmented[max_row, i]):
+                max_row = k
+
+        augmented[[i, max_row]] = augmented[[max_row, i]]
+
+        for k in range(i + 1, n):
+            if augmented[i, i] == 0:
+                raise ValueError("Matrix is singular and cannot be solved")
+
+            factor = augmented[k, i] / augmented[i, i]
+            augmented[k, i:] -= factor * augmented[i, i:]
+
+    solution = np.zeros(n)
+    for i in range(n - 1, -1, -1):
+        solution[i] = augmented[i, n]
+        for j in range(i + 1, n):
+            solution[i] -= augmented[i, j] * solution[j]
+        solution[i] /= augmented[i, i]
+
+    return solution
+
+
+def time_solver(solver, matrix, vector, repeats: int):
+    """Best wall-clock time over repeats, plus the relative residual of the last run"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        x = solver(matrix, vector)
+        best = min(best, time.perf_counter() - start)
+    residual = np.linalg.norm(matrix @ x - vector) / np.linalg.norm(vector)
+    return best, residual
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gaussian_elimination")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="System sizes n")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per solver, best time is kept")
+    parser.add_argument("--max-loop-n", type=int, default=1000,
+                        help="Skip the original loop above this n (it is O(n²) interpreted work)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the test systems")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    solvers = {
+        "loop": loop_gaussian_elimination,
+        "blocked": gaussian_elimination,
+        "mixed": lambda matrix, vector: gaussian_elimination(matrix, vector, precision="mixed"),
+        "numpy": np.linalg.solve,
+    }
+
+    print(f"{'n':>6} " + " ".join(f"{name + ' (s)':>14}" for name in solvers) + f" {'speedup':>9} {'residual':>10}")
+    for n in args.sizes:
+        matrix = rng.standard_normal((n, n)) + n * np.eye(n) * 0.1
+        vector = rng.standard_normal(n)
+
+        timings = {}
+        residual = float("nan")
+        for name, solver in solvers.items():
+            if name == "loop" and n > args.max_loop_n:
+                continue
+            repeats = 1 if name == "loop" else args.repeats
+            timings[name], res = time_solver(solver, matrix, vector, repeats)
+            if name == "blocked":
+                residual = res
+
+        cells = [f"{timings[name]:>14.5f}" if name in timings else f"{'-':>14}" for name in solvers]
+        speedup = timings["loop"] / timings["blocked"] if "loop" in timings else float("nan")
+        print(f"{n:>6} " + " ".join(cells) + f" {speedup:>9.1f} {residual:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
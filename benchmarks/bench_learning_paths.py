@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Learning path benchmark
+Times a goal x timeline grid of learning paths computed one call at a time
+(uncached and memoized) against the vectorized grid call
+"""
+
+import argparse
+import datetime
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tracker_paths import CAREER_PATHS, learning_path, learning_path_grid  # noqa: E402
+
+PROGRESS = (0.9, 0.6, 0.3, 0.1, 0.0, 0.0, 0.0, 0.0, 0.0)
+CONCEPTS = (40, 60, 30, 10, 0, 0, 0, 0, 0)
+VELOCITY = 1.5
+
+
+def per_call(goals, timelines, today):
+    return [[learning_path(goal, float(timeline), PROGRESS, CONCEPTS, VELOCITY, today) for timeline in timelines]
+            for goal in goals]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark learning path generation")
+    parser.add_argument("--timelines", type=int, default=1000, help="Timelines per goal (evenly spaced)")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per variant, best time is kept")
+    args = parser.parse_args()
+
+    goals = list(CAREER_PATHS)
+    timelines = np.linspace(2, 12, args.timelines)
+    today = datetime.date.today()
+
+    def best(fn):
+        times = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    def uncached():
+        learning_path.cache_clear()
+        return per_call(goals, timelines, today)
+
+    cold, paths = best(uncached)
+    warm, _ = best(lambda: per_call(goals, timelines, today))
+    grid_time, grid = best(lambda: learning_path_grid(goals, timelines, PROGRESS, CONCEPTS, VELOCITY))
+
+    per_call_days = np.array([[sum(m["remaining_days"] for m in path["projected_milestones"]) for path in row]
+                              for row in paths])
+    print(f"paths: {len(goals)} goals x {len(timelines)} timelines")
+    print(f"per call, uncached: {cold * 1000:9.2f} ms")
+    print(f"per call, memoized: {warm * 1000:9.2f} ms")
+    print(f"vectorized grid:    {grid_time * 1000:9.2f} ms ({cold / grid_time:.0f}x vs uncached)")
+    print(f"results match:      {np.allclose(per_call_days, grid['completion_days'])}")
+
+
+if __name__ == "__main__":
+    main()
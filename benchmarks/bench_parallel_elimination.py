@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Parallel elimination scaling benchmark
+Factors one n×n system with 1..N workers and reports speedup and efficiency
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# One BLAS thread per worker, otherwise the measurement is of BLAS threading
+for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(var, "1")
+
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "maths" / "notes"))
+from parallel_elimination import parallel_lu_factor  # noqa: E402
+
+
+def default_worker_counts():
+    counts, workers = [], 1
+    while workers < (os.cpu_count() or 1):
+        counts.append(workers)
+        workers *= 2
+    return counts + [os.cpu_count() or 1]
+
+
+def scaling_report(n: int, worker_counts, executor: str, block_size: int, seed: int = 0):
+    """Time the factorization for each worker count; efficiency is T1 / (p * Tp)"""
+    matrix = np.random.default_rng(seed).standard_normal((n, n))
+    rows = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        parallel_lu_factor(matrix, block_size, workers, executor)
+        elapsed = time.perf_counter() - start
+        baseline = rows[0]["seconds"] if rows else elapsed
+        rows.append({
+            "workers": workers,
+            "seconds": elapsed,
+            "speedup": baseline / elapsed,
+            "efficiency": baseline / (elapsed * workers),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel elimination scaling benchmark")
+    parser.add_argument("--n", type=int, default=4096, help="System size")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_worker_counts(),
+                        help="Worker counts to measure (first one is the baseline)")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--block-size", type=int, default=256, help="Tile edge length")
+    args = parser.parse_args()
+
+    print(f"n={args.n} executor={args.executor} block_size={args.block_size}")
+    print(f"{'workers':>8} {'time (s)':>10} {'speedup':>8} {'efficiency':>11}")
+    for row in scaling_report(args.n, args.workers, args.executor, args.block_size):
+        print(f"{row['workers']:>8} {row['seconds']:>10.3f} {row['speedup']:>8.2f} {row['efficiency']:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tracker API load test
+Starts `complete_math_tracker.py --serve` on a seeded temporary data file, drives it
+with keep-alive clients mixing reads and mastery updates, and reports requests per
+second and latency percentiles
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from benchmarks.generators import curriculum  # noqa: E402
+from complete_math_tracker import CompleteMathTracker  # noqa: E402
+
+READ_PATHS = ["/report", "/recommendations", "/path?goal=academic&timeline=8", "/due?limit=20"]
+
+
+def seed_tracker(data_file: Path, count: int, seed: int) -> List[str]:
+    """Store the synthetic curriculum (plus one logged update); returns the concept names"""
+    concepts = curriculum(count, seed)
+    tracker = CompleteMathTracker(str(data_file))
+    with tracker.batch():
+        tracker.add_concepts(concepts)
+        tracker.update_mastery(concepts[0].name, 3, 10)
+    return [concept.name for concept in concepts]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def request(reader, writer, method: str, path: str, body: bytes = b""):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                 + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port: int, deadline: float, write_ratio: float, concepts: List[str], rng: random.Random,
+                 latencies: list, errors: list, acknowledged: list):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            if rng.random() < write_ratio:
+                body = json.dumps({"concept": rng.choice(concepts),
+                                   "level": rng.randint(0, 5), "minutes": rng.randint(5, 60)}).encode()
+                method, path = "POST", "/mastery"
+            else:
+                method, path, body = "GET", rng.choice(READ_PATHS), b""
+            start = time.perf_counter()
+            status = await request(reader, writer, method, path, body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append((method, path, status))
+            elif method == "POST":
+                acknowledged.append(path)
+    finally:
+        writer.close()
+
+
+async def wait_for_server(port: int, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def load(port: int, args, concepts: List[str]):
+    await wait_for_server(port)
+    latencies, errors, acknowledged = [], [], []
+    deadline = time.perf_counter() + args.duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, deadline, args.write_ratio, concepts,
+                                  random.Random(args.seed + i), latencies, errors, acknowledged)
+                           for i in range(args.clients)))
+    return latencies, errors, len(acknowledged), time.perf_counter() - start
+
+
+def percentile(sorted_values, p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the tracker HTTP API")
+    parser.add_argument("--concepts", type=int, default=2000, help="Concepts in the seeded tracker")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Fraction of requests that update mastery")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json", help="Storage backend")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / ("bench.db" if args.storage == "sqlite" else "bench.json")
+        concepts = seed_tracker(data_file, args.concepts, args.seed)
+        port = free_port()
+        server = subprocess.Popen([sys.executable, str(ROOT / "complete_math_tracker.py"), "--serve",
+                                   "--port", str(port), "--data-file", str(data_file)],
+                                  cwd=tmp, stdout=subprocess.DEVNULL)
+        try:
+            latencies, errors, acknowledged, elapsed = asyncio.run(load(port, args, concepts))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+        # Everything acknowledged must have been persisted on shutdown
+        persisted = sum(1 for _ in CompleteMathTracker(str(data_file)).study_log) - 1  # minus the seed update
+
+    latencies.sort()
+    print(f"requests:  {len(latencies)} in {elapsed:.1f} s ({args.clients} clients, "
+          f"{args.write_ratio:.0%} writes, {args.concepts} concepts, {args.storage})")
+    print(f"rps:       {len(latencies) / elapsed:,.0f}")
+    print(f"latency:   p50 {percentile(latencies, 50) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 99) * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+    print(f"errors:    {len(errors)}")
+    for (method, path, status), count in collections.Counter(errors).most_common():
+        print(f"           {count} x {method} {path} -> {status}")
+    print(f"persisted: {persisted} of {acknowledged} acknowledged mastery updates")
+    sys.exit(1 if errors or persisted != acknowledged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tracker report benchmark
+Compares the columnar (NumPy group-by) report analytics with the original
+scans over the dict of per-concept dicts
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from benchmarks.generators import curriculum  # noqa: E402
+from complete_math_tracker import MASTERY_THRESHOLD, CompleteMathTracker  # noqa: E402
+from tracker_columns import PERCENTILES, ConceptColumns  # noqa: E402
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+
+def _percentiles(values):
+    """Linear-interpolation percentiles of a list, as numpy computes them"""
+    values = sorted(values)
+    result = {}
+    for p in PERCENTILES:
+        position = (len(values) - 1) * p / 100
+        low = int(position)
+        high = min(low + 1, len(values) - 1)
+        result[p] = values[low] + (values[high] - values[low]) * (position - low)
+    return result
+
+
+def legacy_report_aggregates(concepts):
+    """The same analytics as scans over the concept dicts, the way the report used to work"""
+    total_concepts = len(concepts)
+    mastered_concepts = len([c for c in concepts.values() if c["mastery_level"] >= MASTERY_THRESHOLD])
+    total_time = sum(c["time_invested"] for c in concepts.values())
+
+    def breakdown(key):
+        groups = {}
+        for concept in concepts.values():
+            groups.setdefault(concept[key], []).append(concept)
+        return {
+            group: {
+                "concepts": len(members),
+                "mastered": len([c for c in members if c["mastery_level"] >= MASTERY_THRESHOLD]),
+                "avg_mastery": sum(c["mastery_level"] for c in members) / len(members),
+                "avg_difficulty": sum(c["difficulty"] for c in members) / len(members),
+                "study_time_hours": sum(c["time_invested"] for c in members) / 60,
+            }
+            for group, members in groups.items()
+        }
+
+    return {
+        "totals": (total_concepts, mastered_concepts, total_time),
+        "phases": breakdown("phase"),
+        "modules": breakdown("module"),
+        "percentiles": {
+            "mastery_level": _percentiles([c["mastery_level"] for c in concepts.values()]),
+            "study_time_hours": {p: v / 60 for p, v in
+                                 _percentiles([c["time_invested"] for c in concepts.values()]).items()},
+        },
+    }
+
+
+def best_time(fn, repeats: int):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tracker report analytics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Concept counts")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per variant, best time is kept")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic curriculum")
+    args = parser.parse_args()
+
+    print(f"{'concepts':>10} {'legacy (s)':>12} {'build (s)':>11} {'columnar (s)':>13} "
+          f"{'speedup':>9} {'report (s)':>11} {'match':>6}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker = CompleteMathTracker(str(Path(tmp) / "bench.json"))
+            with tracker.bulk_load():
+                tracker.add_concepts(curriculum(n, args.seed))
+            store = tracker.data["concepts"]
+            concepts = store.to_dict()  # the dict-of-dicts layout the legacy scans ran over
+            legacy, expected = best_time(lambda: legacy_report_aggregates(concepts), args.repeats)
+            del concepts
+            build, columns = best_time(lambda: ConceptColumns.from_concepts(store), 1)
+            columnar, summary = best_time(lambda: columns.summary(MASTERY_THRESHOLD), args.repeats)
+
+            match = (summary["percentiles"] == expected["percentiles"]
+                     and summary["phases"].keys() == expected["phases"].keys()
+                     and all(np.allclose(list(summary["modules"][m].values()),
+                                         list(expected["modules"][m].values()))
+                             for m in expected["modules"]))
+
+            # The whole report on the tracker holding the concepts, with its columns already warm
+            tracker.generate_comprehensive_report()
+            report, _ = best_time(tracker.generate_comprehensive_report, args.repeats)
+            tracker.storage.close()
+
+        print(f"{n:>10} {legacy:>12.4f} {build:>11.4f} {columnar:>13.4f} "
+              f"{legacy / columnar:>8.1f}x {report:>11.4f} {str(match):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic inputs for the benchmark suite
+Curricula shaped like the 9-phase tracker data, and dense, banded,
+ill-conditioned and batched linear systems; the same seed gives the same data
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from complete_math_tracker import MathConcept
+
+PHASES = range(1, 10)
+MODULES_PER_PHASE = 8
+
+
+def curriculum(n: int, seed: int = 0, depth: int = 12, max_prerequisites: int = 3) -> List[MathConcept]:
+    """n concepts over the 9 phases, in an order where prerequisites always come first.
+
+    Concepts are spread evenly over the phases and over depth levels that run
+    across them. A concept takes 1..max_prerequisites prerequisites from the level
+    just below its own (a quarter of the time, two levels below), so the longest
+    prerequisite chain has depth concepts. Mastery falls off with the phase, as for
+    a learner partway through the path, and study time grows with mastery.
+    """
+    rng = np.random.default_rng(seed)
+    sampler = random.Random(seed)  # a few prerequisites from a large pool, far cheaper per call than rng.choice
+    index = np.arange(n)
+    phases = 1 + index * len(PHASES) // n
+    levels = np.minimum(depth - 1, index * depth // n)
+    level_start = [-(-level * n // depth) for level in range(depth + 1)]  # levels are runs of consecutive concepts
+    two_below = rng.random(n) < 0.25
+    counts = rng.integers(1, max_prerequisites + 1, n)
+    mastery = np.clip(rng.normal(5 * np.maximum(0.0, 1 - (phases - 1) / 5), 1.2), 0, 5).astype(int)
+    modules = rng.integers(MODULES_PER_PHASE, size=n)
+    difficulty = np.clip(phases + rng.integers(-1, 3, n), 1, 10)
+    time_invested = mastery * rng.integers(30, 240, n)
+    months, days = rng.integers(1, 13, n), rng.integers(1, 29, n)
+
+    names = [f"p{phase}-c{i}" for i, phase in enumerate(phases.tolist())]
+    columns = zip(phases.tolist(), levels.tolist(), two_below.tolist(), counts.tolist(), mastery.tolist(),
+                  modules.tolist(), difficulty.tolist(), time_invested.tolist(), months.tolist(), days.tolist())
+    concepts = []
+    for i, (phase, level, further, count, level_mastery, module, rank, minutes, month, day) in enumerate(columns):
+        prerequisites = []
+        if level > 0:
+            pool = range(level_start[level - 2 if level > 1 and further else level - 1], level_start[level])
+            prerequisites = [names[p] for p in sampler.sample(pool, min(len(pool), count))]
+        concepts.append(MathConcept(
+            name=names[i], phase=phase, module=f"Phase {phase} Module {module}", difficulty=rank,
+            prerequisites=prerequisites, mastery_level=level_mastery, time_invested=minutes,
+            last_reviewed=f"2025-{month:02d}-{day:02d}" if level_mastery else None))
+    return concepts
+
+
+def dag_depth(concepts: List[MathConcept]) -> int:
+    """Length of the longest prerequisite chain (concepts must come after their prerequisites)"""
+    depths: Dict[str, int] = {}
+    for concept in concepts:
+        depths[concept.name] = 1 + max((depths.get(p, 0) for p in concept.prerequisites), default=0)
+    return max(depths.values(), default=0)
+
+
+def mastery_updates(concepts: List[MathConcept], count: int, seed: int = 0) -> List[Tuple[str, int, int]]:
+    """count (concept_name, new_level, minutes) updates over random concepts"""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(len(concepts), size=count)
+    levels = rng.integers(0, 6, size=count)
+    minutes = rng.integers(5, 120, size=count)
+    return [(concepts[int(i)].name, int(level), int(spent)) for i, level, spent in zip(picks, levels, minutes)]
+
+
+# -- linear systems ---------------------------------------------------------------
+
+def dense_system(n: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """A random (well-conditioned in practice) n×n system A, b"""
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, n)), rng.standard_normal(n)
+
+
+def banded_system(n: int, lower: int, upper: int,
+                  seed: int = 0) -> Tuple[Tuple[int, int], np.ndarray, np.ndarray, np.ndarray]:
+    """A diagonally dominant banded system as ((lower, upper), ab, dense A, b): ab in the
+    solve_banded layout and the same matrix densely, so both solvers can run on it"""
+    rng = np.random.default_rng(seed)
+    ab = rng.standard_normal((lower + upper + 1, n))
+    ab[upper] = np.abs(ab).max() * (lower + upper) + 1.0  # main diagonal
+    dense = np.zeros((n, n))
+    for offset in range(-lower, upper + 1):  # A[i, j] = ab[upper + i - j, j]
+        columns = np.arange(max(0, offset), min(n, n + offset))
+        dense[columns - offset, columns] = ab[upper - offset, columns]
+    return (lower, upper), ab, dense, rng.standard_normal(n)
+
+
+def ill_conditioned_system(n: int, condition: float, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """A, b and the exact x for A = U diag(s) Vᵀ with singular values from 1 down to 1/condition"""
+    rng = np.random.default_rng(seed)
+    u, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    v, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    singular_values = np.logspace(0, -np.log10(condition), n)
+    matrix = (u * singular_values) @ v.T
+    x = rng.standard_normal(n)
+    return matrix, matrix @ x, x
+
+
+def batched_systems(batch: int, n: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """A (batch, n, n) stack of random systems and their (batch, n) right-hand sides"""
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((batch, n, n)), rng.standard_normal((batch, n))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Concurrent writer stress test
+Many processes update mastery of their own concepts in one shared tracker file at
+the same time; afterwards every update must be in the file and in the study log,
+and the phase totals must match the concepts. Exits non-zero on any lost update.
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from complete_math_tracker import CompleteMathTracker, MathConcept  # noqa: E402
+
+
+def concept_names(worker: int, per_worker: int):
+    return [f"w{worker}-c{j}" for j in range(per_worker)]
+
+
+def writer(path: str, worker: int, per_worker: int, updates: int, reopen: bool, seed: int,
+           barrier, results):
+    rng = random.Random(seed * 1000 + worker)
+    names = concept_names(worker, per_worker)
+    expected = {}
+    tracker = CompleteMathTracker(path)
+    barrier.wait()
+    for _ in range(updates):
+        if reopen:
+            tracker = CompleteMathTracker(path)  # like a fresh CLI run per update
+        name = rng.choice(names)
+        level, minutes = rng.randint(0, 5), rng.randint(1, 60)
+        tracker.update_mastery(name, level, minutes)
+        expected[name] = (level, expected.get(name, (0, 0))[1] + minutes)
+    results.put(expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress concurrent writers on one tracker file")
+    parser.add_argument("--writers", type=int, default=32, help="Parallel writer processes")
+    parser.add_argument("--updates", type=int, default=25, help="Mastery updates per writer")
+    parser.add_argument("--concepts-per-writer", type=int, default=5, help="Concepts each writer owns")
+    parser.add_argument("--reopen", action="store_true",
+                        help="Reload the tracker before every update instead of keeping one open")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json", help="Storage backend")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / ("stress.db" if args.storage == "sqlite" else "stress.json"))
+        tracker = CompleteMathTracker(path)
+        with tracker.batch():
+            for worker in range(args.writers):
+                for name in concept_names(worker, args.concepts_per_writer):
+                    tracker.add_concept(MathConcept(name=name, phase=1 + worker % 9, module=f"Module {worker}",
+                                                    difficulty=5, prerequisites=[], mastery_level=0,
+                                                    time_invested=0))
+
+        barrier = multiprocessing.Barrier(args.writers + 1)
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=writer, args=(path, worker, args.concepts_per_writer,
+                                                                  args.updates, args.reopen, args.seed,
+                                                                  barrier, results))
+                     for worker in range(args.writers)]
+        for process in processes:
+            process.start()
+        barrier.wait()
+        start = time.perf_counter()
+        expected = {}
+        for _ in processes:
+            expected.update(results.get())
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join()
+
+        final = CompleteMathTracker(path)
+        lost = [name for name, (level, minutes) in expected.items()
+                if (final.data["concepts"][name]["mastery_level"], final.data["concepts"][name]["time_invested"])
+                != (level, minutes)]
+        events = sum(1 for _ in final.study_log)
+        totals_ok = final.phase_stats_consistent()
+        progress_before = dict(final.data["phase_progress"])
+        final._update_phase_progress()
+        progress_ok = progress_before == final.data["phase_progress"]
+
+    total = args.writers * args.updates
+    print(f"writers: {args.writers}, updates: {total} ({args.storage}, "
+          f"{'reload per update' if args.reopen else 'long-lived trackers'})")
+    print(f"elapsed: {elapsed:.2f} s ({total / elapsed:,.0f} updates/s)")
+    print(f"lost concept updates: {len(lost)}")
+    print(f"study log events: {events}/{total}")
+    print(f"phase progress consistent: {totals_ok and progress_ok}")
+    sys.exit(0 if not lost and events == total and totals_ok and progress_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
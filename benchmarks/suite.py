@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the tracker and the Gaussian elimination solver
+Times tracker operations and solver cases on seeded synthetic data, stores the
+results as JSON baselines and compares a run against a baseline
+"""
+
+import argparse
+import datetime
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks import ROOT
+from benchmarks.generators import (banded_system, batched_systems, curriculum, dag_depth, dense_system,
+                                   ill_conditioned_system, mastery_updates)
+from complete_math_tracker import CompleteMathTracker, MathConcept
+import tracker_metrics
+from gausianelimination import batched_gaussian_elimination, gaussian_elimination, set_instrumentation, solve_banded
+from tracker_paths import CAREER_PATHS, learning_path
+
+if tracker_metrics.enabled():  # TRACKER_METRICS=<file>: solver calls go in the file with the tracker's
+    set_instrumentation(tracker_metrics.record)
+
+BASELINE_DIR = ROOT / "benchmarks" / "baselines"
+DEFAULT_THRESHOLD = 0.10  # slower than the baseline by more than this fraction is a regression
+
+SCALES = {
+    "quick": {"concepts": 2_000, "write_ops": 20, "bulk": 1_000, "read_ops": 20, "timelines": 4,
+              "dense_n": 200, "banded_n": 2_000, "band": (3, 3), "ill_n": 200, "condition": 1e10,
+              "batch": 1_000, "batch_n": 8},
+    "default": {"concepts": 20_000, "write_ops": 20, "bulk": 5_000, "read_ops": 50, "timelines": 10,
+                "dense_n": 1_000, "banded_n": 20_000, "band": (5, 5), "ill_n": 500, "condition": 1e12,
+                "batch": 10_000, "batch_n": 8},
+}
+
+# A case's setup returns (run, operations per run, checks): run() does the measured
+# work once, checks are recorded alongside the timings (residuals, sizes)
+Setup = Callable[["Fixture"], Tuple[Callable[[], object], int, Dict]]
+CASES: Dict[str, Setup] = {}
+
+
+def case(name: str):
+    def register(setup: Setup) -> Setup:
+        CASES[name] = setup
+        return setup
+    return register
+
+
+class Fixture:
+    """Inputs shared by the cases of one run, built on first use"""
+
+    def __init__(self, params: Dict, seed: int, storage: str, workdir: Path):
+        self.params = params
+        self.seed = seed
+        self.storage = storage
+        self.workdir = workdir
+        self._concepts: Optional[List[MathConcept]] = None
+        self._tracker: Optional[CompleteMathTracker] = None
+        self._fresh = 0
+
+    @property
+    def data_file(self) -> Path:
+        return self.workdir / ("bench.db" if self.storage == "sqlite" else "bench.json")
+
+    @property
+    def concepts(self) -> List[MathConcept]:
+        if self._concepts is None:
+            self._concepts = curriculum(self.params["concepts"], self.seed)
+        return self._concepts
+
+    @property
+    def tracker(self) -> CompleteMathTracker:
+        if self._tracker is None:
+            self._tracker = CompleteMathTracker(str(self.data_file))
+            self._tracker.add_concepts(self.concepts)
+        return self._tracker
+
+    def fresh_concepts(self, count: int) -> List[MathConcept]:
+        """count concepts not tracked yet, requiring tracked ones"""
+        concepts = curriculum(count, self.seed + 1 + self._fresh)
+        tag = f"new{self._fresh}"
+        self._fresh += 1
+        tracked = self.concepts
+        for i, concept in enumerate(concepts):
+            concept.name = f"{tag}-{concept.name}"
+            concept.prerequisites = [tracked[(i * 7919 + j) % len(tracked)].name for j in range(2)]
+        return concepts
+
+
+# -- tracker cases ----------------------------------------------------------------
+
+@case("tracker.load")
+def _load(fixture: Fixture):
+    fixture.tracker  # make sure the data file exists
+    return lambda: CompleteMathTracker(str(fixture.data_file)), 1, {"concepts": fixture.params["concepts"]}
+
+
+@case("tracker.add_concept")
+def _add_concept(fixture: Fixture):
+    tracker = fixture.tracker
+
+    def run():
+        for concept in fixture.fresh_concepts(fixture.params["write_ops"]):
+            tracker.add_concept(concept)
+    return run, fixture.params["write_ops"], {}
+
+
+@case("tracker.add_concepts")
+def _add_concepts(fixture: Fixture):
+    tracker = fixture.tracker
+    return (lambda: tracker.add_concepts(fixture.fresh_concepts(fixture.params["bulk"])),
+            fixture.params["bulk"], {})
+
+
+@case("tracker.update_mastery")
+def _update_mastery(fixture: Fixture):
+    tracker = fixture.tracker
+    updates = mastery_updates(fixture.concepts, fixture.params["write_ops"], fixture.seed)
+
+    def run():
+        for name, level, minutes in updates:
+            tracker.update_mastery(name, level, minutes)
+    return run, len(updates), {}
+
+
+@case("tracker.report")
+def _report(fixture: Fixture):
+    tracker = fixture.tracker
+    tracker.generate_comprehensive_report()  # the columnar view is built once, then kept in step
+    return tracker.generate_comprehensive_report, 1, {"dag_depth": dag_depth(fixture.concepts)}
+
+
+@case("tracker.recommendations")
+def _recommendations(fixture: Fixture):
+    tracker = fixture.tracker
+
+    def run():
+        for _ in range(fixture.params["read_ops"]):
+            tracker.get_current_recommendations()
+    return run, fixture.params["read_ops"], {}
+
+
+@case("tracker.learning_path")
+def _learning_path(fixture: Fixture):
+    tracker = fixture.tracker
+    timelines = np.linspace(2, 12, fixture.params["timelines"])
+
+    def run():
+        learning_path.cache_clear()  # measure the computation, not the memo
+        for goal in CAREER_PATHS:
+            for timeline in timelines:
+                tracker.generate_learning_path(goal, float(timeline))
+    return run, len(CAREER_PATHS) * len(timelines), {}
+
+
+# -- solver cases -----------------------------------------------------------------
+
+def _residual(matrix, x, b) -> float:
+    return float(np.linalg.norm(matrix @ x - b) / np.linalg.norm(b))
+
+
+@case("solver.dense")
+def _dense(fixture: Fixture):
+    matrix, b = dense_system(fixture.params["dense_n"], fixture.seed)
+    checks = {"n": len(b), "residual": _residual(matrix, gaussian_elimination(matrix, b), b)}
+    return lambda: gaussian_elimination(matrix, b), 1, checks
+
+
+@case("solver.banded")
+def _banded(fixture: Fixture):
+    (lower, upper) = fixture.params["band"]
+    l_and_u, ab, matrix, b = banded_system(fixture.params["banded_n"], lower, upper, fixture.seed)
+    checks = {"n": len(b), "band": [lower, upper],
+              "residual": _residual(matrix, solve_banded(l_and_u, ab, b), b)}
+    return lambda: solve_banded(l_and_u, ab, b), 1, checks
+
+
+@case("solver.banded_dense")
+def _banded_dense(fixture: Fixture):
+    lower, upper = fixture.params["band"]
+    n = min(fixture.params["banded_n"], fixture.params["dense_n"])  # O(n³) when treated as dense
+    _, _, matrix, b = banded_system(n, lower, upper, fixture.seed)
+    checks = {"n": n, "band": [lower, upper], "residual": _residual(matrix, gaussian_elimination(matrix, b), b)}
+    return lambda: gaussian_elimination(matrix, b), 1, checks
+
+
+@case("solver.ill_conditioned")
+def _ill_conditioned(fixture: Fixture):
+    matrix, b, expected = ill_conditioned_system(fixture.params["ill_n"], fixture.params["condition"], fixture.seed)
+    x, refinement = gaussian_elimination(matrix, b, precision="mixed", return_info=True)
+    checks = {"n": len(b), "condition": fixture.params["condition"], "residual": _residual(matrix, x, b),
+              "forward_error": float(np.linalg.norm(x - expected) / np.linalg.norm(expected)),
+              "refinement_iterations": refinement.iterations, "fell_back": refinement.fell_back}
+    return lambda: gaussian_elimination(matrix, b, precision="mixed"), 1, checks
+
+
+@case("solver.batched")
+def _batched(fixture: Fixture):
+    matrices, vectors = batched_systems(fixture.params["batch"], fixture.params["batch_n"], fixture.seed)
+    solutions, singular = batched_gaussian_elimination(matrices, vectors)
+    residual = np.linalg.norm(np.einsum("bij,bj->bi", matrices, solutions) - vectors) / np.linalg.norm(vectors)
+    checks = {"batch": len(matrices), "n": matrices.shape[1], "residual": float(residual),
+              "singular": int(singular.sum())}
+    return lambda: batched_gaussian_elimination(matrices, vectors), len(matrices), checks
+
+
+# -- running ------------------------------------------------------------------------
+
+def run_suite(scale: str = "default", seed: int = 0, repeats: int = 5, storage: str = "json",
+              patterns: Optional[List[str]] = None, log=print) -> Dict:
+    """Time every case (or the ones matching the glob patterns); returns the results document"""
+    params = SCALES[scale]
+    names = [name for name in CASES if not patterns or any(fnmatch.fnmatch(name, p) for p in patterns)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture = Fixture(params, seed, storage, Path(tmp))
+        for name in names:
+            run, operations, checks = CASES[name](fixture)
+            run()  # warm-up: imports, caches, first-touch allocation
+            times = []
+            for _ in range(repeats):
+                gc.collect()
+                start = time.perf_counter()
+                run()
+                times.append((time.perf_counter() - start) / operations)
+            results[name] = {"per_op_s": statistics.median(times), "min_per_op_s": min(times),
+                             "operations": operations, "repeats": times, "checks": checks}
+            log(f"{name:<26} {results[name]['per_op_s'] * 1e3:>12.4f} ms/op  ({operations} ops x {repeats})")
+        if fixture._tracker is not None:
+            fixture._tracker.storage.close()
+
+    return {
+        "meta": {"scale": scale, "seed": seed, "repeats": repeats, "storage": storage, "params": params,
+                 "python": platform.python_version(), "numpy": np.__version__,
+                 "machine": f"{platform.system()} {platform.machine()}", "cpus": os.cpu_count(),
+                 "created": datetime.datetime.now().isoformat(timespec="seconds")},
+        "results": results,
+    }
+
+
+def baseline_path(name_or_path: str) -> Path:
+    """A baseline given by file path, or by name under benchmarks/baselines"""
+    path = Path(name_or_path)
+    if path.suffix == ".json" or path.exists():
+        return path
+    return BASELINE_DIR / f"{name_or_path}.json"
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD,
+            metric: str = "per_op_s") -> List[Dict]:
+    """Per case: baseline and current time, their ratio, and whether it is a regression"""
+    rows = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before, after = baseline["results"][name][metric], result[metric]
+        ratio = after / before if before else float("inf")
+        rows.append({"case": name, "baseline": before, "current": after, "ratio": ratio,
+                     "regression": ratio > 1 + threshold, "improvement": ratio < 1 - threshold})
+    return rows
+
+
+def _setting_differences(baseline: Dict, current: Dict) -> List[str]:
+    return [f"{key}: {baseline['meta'].get(key)} -> {current['meta'].get(key)}"
+            for key in ("scale", "seed", "storage", "python", "numpy", "machine")
+            if baseline["meta"].get(key) != current["meta"].get(key)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracker and solver benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite")
+    compare_parser = commands.add_parser("compare", help="Compare a run with a baseline")
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--scale", choices=list(SCALES), help="Input sizes (default: default, or the baseline's)")
+        sub.add_argument("--seed", type=int, help="Seed for the synthetic data (default: 0, or the baseline's)")
+        sub.add_argument("--repeats", type=int, default=5, help="Timed runs per case, the median is kept")
+        sub.add_argument("--storage", choices=["json", "sqlite"], help="Tracker storage backend (default: json)")
+        sub.add_argument("--cases", nargs="+", metavar="PATTERN", help="Only cases matching these globs")
+    run_parser.add_argument("--output", type=str, help="Write the results to this JSON file")
+    run_parser.add_argument("--save-baseline", type=str, metavar="NAME",
+                            help="Write the results to benchmarks/baselines/NAME.json")
+    compare_parser.add_argument("baseline", help="Baseline name (benchmarks/baselines) or JSON file")
+    compare_parser.add_argument("current", nargs="?", help="Results JSON file (default: run the suite now)")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Flag cases slower than the baseline by more than this fraction")
+    compare_parser.add_argument("--metric", choices=["per_op_s", "min_per_op_s"], default="per_op_s",
+                                help="Median (default) or best time per operation")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_suite(args.scale or "default", args.seed or 0, args.repeats, args.storage or "json",
+                            args.cases)
+        for path in filter(None, [args.output, args.save_baseline and baseline_path(args.save_baseline)]):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(json.dumps(results, indent=2) + "\n")
+            print(f"Saved {path}")
+        return
+
+    baseline = json.loads(baseline_path(args.baseline).read_text())
+    if args.current:
+        current = json.loads(Path(args.current).read_text())
+    else:
+        meta = baseline["meta"]
+        current = run_suite(args.scale or meta["scale"], meta["seed"] if args.seed is None else args.seed,
+                            args.repeats, args.storage or meta["storage"], args.cases)
+        print()
+
+    for difference in _setting_differences(baseline, current):
+        print(f"warning: settings differ from the baseline ({difference})")
+    rows = compare(baseline, current, args.threshold, args.metric)
+    print(f"{'case':<26} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else "  faster" if row["improvement"] else ""
+        print(f"{row['case']:<26} {row['baseline'] * 1e3:>12.4f} {row['current'] * 1e3:>12.4f} "
+              f"{row['ratio'] - 1:>+8.1%}{flag}")
+    regressions = [row["case"] for row in rows if row["regression"]]
+    print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}" +
+          (f": {', '.join(regressions)}" if regressions else ""))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
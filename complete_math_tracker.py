@@ -4,15 +4,34 @@ Complete Mathematics Mastery Tracker
 Handles 9 phases from high school through research-level mathematics
 """
 
-import json
+import copy
+import dataclasses
 import datetime
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+import gc
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, asdict, fields
 from pathlib import Path
-import matplotlib.pyplot as plt
-import numpy as np
 
-@dataclass
+# numpy (tracker_columns) and matplotlib are imported where they are used, so
+# commands that neither report nor plot start without them
+from tracker_events import MasteryGains, StudyLog, mastery_event, stream_analytics
+from tracker_graph import PrerequisiteCycleError, PrerequisiteGraph
+from tracker_metrics import timed
+from tracker_paths import PHASE_CATALOG, PHASE_NUMBERS, learning_path, learning_path_grid, thaw
+from tracker_review import ReviewScheduler
+from tracker_storage import ChangeSet, StoredChanges, open_storage
+from tracker_store import ConceptStore
+
+if TYPE_CHECKING:
+    from tracker_columns import ConceptColumns
+
+# Undo-log marker for a key that did not exist before the batch touched it
+_MISSING = object()
+
+MASTERY_THRESHOLD = 4  # Consider 4+ as mastered
+
+@dataclass(slots=True)
 class MathConcept:
     """Represents a mathematical concept with mastery tracking"""
     name: str
@@ -24,7 +43,15 @@ class MathConcept:
     time_invested: int  # minutes
     last_reviewed: Optional[str] = None
     
-@dataclass
+_CONCEPT_FIELDS = tuple(f.name for f in fields(MathConcept))
+
+def _concept_dict(concept: MathConcept) -> Dict:
+    """asdict() without its recursive deep copy (prerequisites is the only nested value)"""
+    concept_dict = {name: getattr(concept, name) for name in _CONCEPT_FIELDS}
+    concept_dict["prerequisites"] = list(concept.prerequisites)
+    return concept_dict
+
+@dataclass(slots=True)
 class ResearchProject:
     """Track research projects and publications"""
     title: str
@@ -36,7 +63,7 @@ class ResearchProject:
     milestones: List[Dict]
     publications: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class CareerGoal:
     """Track career-related goals and milestones"""
     goal_type: str  # "academic", "industry", "consulting", "tech"
@@ -46,134 +73,59 @@ class CareerGoal:
     current_progress: float  # 0-1
     action_items: List[str]
 
+@dataclass
+class PhaseStats:
+    """Running per-phase totals, kept in step with the concepts"""
+    concepts: int = 0
+    mastery_sum: int = 0
+    time_invested: int = 0
+    mastered: int = 0
+
+    def add(self, concept: Dict, sign: int = 1):
+        """Count a concept in (sign=1) or out (sign=-1) of the totals"""
+        self.concepts += sign
+        self.mastery_sum += sign * concept["mastery_level"]
+        self.time_invested += sign * concept["time_invested"]
+        self.mastered += sign * (concept["mastery_level"] >= MASTERY_THRESHOLD)
+
 class CompleteMathTracker:
     """Comprehensive tracking system for complete mathematics mastery"""
     
-    def __init__(self, data_file: str = "complete_math_data.json"):
+    def __init__(self, data_file: str = "complete_math_data.json", storage: Optional[str] = None):
         self.data_file = Path(data_file)
+        self.storage = open_storage(self.data_file, storage)
         self.data = self._load_data()
-        self.phases = self._initialize_phases()
-    
-    def _initialize_phases(self) -> Dict:
-        """Initialize the complete phase structure"""
-        return {
-            1: {
-                "name": "Foundation (Matematik 5000 4&5)",
-                "duration_weeks": 14,
-                "level": "Advanced High School → Early College",
-                "modules": [
-                    "Complex Numbers & Advanced Algebra",
-                    "Sequences & Series", 
-                    "Differential & Integral Calculus",
-                    "Differential Equations",
-                    "Linear Algebra Fundamentals",
-                    "Vector Calculus & Statistics"
-                ]
-            },
-            2: {
-                "name": "Undergraduate Core Mathematics", 
-                "duration_months": 20,
-                "level": "College Sophomore → Junior",
-                "modules": [
-                    "Advanced Calculus & Real Analysis",
-                    "Abstract Algebra",
-                    "Advanced Linear Algebra", 
-                    "Discrete Mathematics & Combinatorics",
-                    "Ordinary Differential Equations (Advanced)",
-                    "Probability Theory & Statistics",
-                    "Mathematical Logic & Set Theory",
-                    "Introduction to Topology",
-                    "Complex Analysis",
-                    "Numerical Analysis"
-                ]
-            },
-            3: {
-                "name": "Advanced Undergraduate",
-                "duration_months": 12, 
-                "level": "Senior Undergraduate → Graduate Preparation",
-                "modules": [
-                    "Advanced Real Analysis",
-                    "Advanced Abstract Algebra",
-                    "Differential Geometry",
-                    "Algebraic Topology", 
-                    "Partial Differential Equations",
-                    "Mathematical Physics"
-                ]
-            },
-            4: {
-                "name": "Graduate Foundations",
-                "duration_months": 24,
-                "level": "First-Year Graduate",
-                "modules": [
-                    "Advanced Functional Analysis",
-                    "Algebraic Geometry",
-                    "Number Theory (Advanced)",
-                    "Representation Theory",
-                    "Advanced Topology",
-                    "Advanced Probability",
-                    "Advanced Differential Equations",
-                    "Mathematical Logic (Advanced)"
-                ]
-            },
-            5: {
-                "name": "Advanced Graduate",
-                "duration_months": 12,
-                "level": "Advanced Graduate → PhD Candidacy", 
-                "modules": [
-                    "Research Area Specialization",
-                    "Advanced Research Methods"
-                ]
-            },
-            6: {
-                "name": "Research Preparation",
-                "duration_months": 12,
-                "level": "PhD Research Preparation",
-                "modules": [
-                    "Literature Mastery",
-                    "Research Problem Identification", 
-                    "Advanced Seminar Participation",
-                    "Qualifying Examination Preparation"
-                ]
-            },
-            7: {
-                "name": "Specialized Research Tracks",
-                "duration_months": 12,
-                "level": "Advanced PhD Research",
-                "modules": [
-                    "Pure Mathematics Research Frontiers",
-                    "Applied Mathematics Research Frontiers",
-                    "Computational & Data Science"
-                ]
-            },
-            8: {
-                "name": "Cutting-Edge Research Topics", 
-                "duration_months": 12,
-                "level": "Research Leadership",
-                "modules": [
-                    "Emerging Mathematical Fields",
-                    "Advanced Research Methodologies",
-                    "Mathematical Innovation",
-                    "Research Impact & Legacy"
-                ]
-            },
-            9: {
-                "name": "Mathematical Frontiers & Beyond",
-                "duration_months": "Ongoing",
-                "level": "Research Pioneer",
-                "modules": [
-                    "Unsolved Problems & Grand Challenges",
-                    "Future Mathematics"
-                ]
-            }
-        }
+        self.phases = PHASE_CATALOG  # shared, read-only
+        self._phase_stats = self._compute_phase_stats()
+        self._graph = PrerequisiteGraph.from_concepts(self.data["concepts"], MASTERY_THRESHOLD)
+        self._reviews = ReviewScheduler(self.data["spaced_repetition"], self.data["concepts"])
+        self._columns: Optional["ConceptColumns"] = None  # built on the first report
+        self.study_log = StudyLog(self.data_file.with_suffix(".events.jsonl"))
+        self._batch_changes: Optional[ChangeSet] = None
+        self._pending_events: List[Dict] = []
+        self._deferred_changes: Optional[ChangeSet] = None  # set by defer_writes()
+        self._deferred_events: List[Dict] = []
+        self._mastery_gains = MasteryGains(self.study_log)
+        self._velocity_cache: Optional[Tuple] = None
+        self._undo_log: List[Tuple] = []
+        self._undo_seen = set()
     
+    @timed("tracker.load_data")
     def _load_data(self) -> Dict:
         """Load existing data or create new structure"""
-        if self.data_file.exists():
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
+        data = self.storage.load()
+        if data is not None:
+            for section, default in self._empty_data().items():
+                data.setdefault(section, default)
+            data["concepts"] = ConceptStore(data["concepts"])
+            return data
+        return self._empty_data()
+
+    @staticmethod
+    def _empty_data() -> Dict:
+        """The data layout of a brand new tracker"""
         return {
-            "concepts": {},
+            "concepts": ConceptStore(),
             "research_projects": [],
             "career_goals": [],
             "phase_progress": {str(i): 0.0 for i in range(1, 10)},
@@ -188,46 +140,249 @@ class CompleteMathTracker:
             "conference_presentations": []
         }
     
-    def add_concept(self, concept: MathConcept):
-        """Add a new mathematical concept to track"""
-        concept_dict = asdict(concept)
+    @timed("tracker.add_concept")
+    def add_concept(self, concept: MathConcept) -> List[str]:
+        """Add a new mathematical concept to track
+        
+        Returns the prerequisites that are not tracked concepts (yet). Raises
+        PrerequisiteCycleError, without adding anything, if the prerequisites
+        would become circular.
+        """
+        dangling = self._graph.add(concept.name, concept.prerequisites,
+                                   concept.mastery_level >= MASTERY_THRESHOLD)
+        changes = self._prepare(ChangeSet().touch("concepts", concept.name))
+        self._put_concept(concept)
+        self._persist(changes)
+        return dangling
+    
+    @timed("tracker.add_concepts")
+    def add_concepts(self, concepts: Iterable[MathConcept]) -> List[Tuple[MathConcept, PrerequisiteCycleError]]:
+        """Add many concepts as one batch, with phase progress updated for their mastery
+        
+        Concepts that would make the prerequisites circular are skipped; they are
+        returned with the error, everything else is added.
+        """
+        concepts = list(concepts)
+        accepted = ChangeSet().replace("phase_progress")
+        rejected = []
+        with self.batch():
+            # Undo information for every incoming name, taken before anything changes;
+            # only the accepted ones are written
+            self._prepare(ChangeSet(keys={"concepts": {concept.name for concept in concepts}}).replace("phase_progress"))
+            for concept in concepts:
+                try:
+                    self._graph.add(concept.name, concept.prerequisites, concept.mastery_level >= MASTERY_THRESHOLD)
+                except PrerequisiteCycleError as e:
+                    rejected.append((concept, e))
+                    continue
+                self._put_concept(concept)
+                accepted.touch("concepts", concept.name)
+            self._persist(accepted)
+        return rejected
+    
+    def _put_concept(self, concept: MathConcept):
+        """Store a concept the prerequisite graph has accepted, keeping the indexes in step"""
+        concept_dict = _concept_dict(concept)
+        previous = self.data["concepts"].get(concept.name)
+        if previous is not None:
+            self._count_concept(previous, -1)
         self.data["concepts"][concept.name] = concept_dict
-        self.save_data()
+        self._count_concept(concept_dict)
+        self._reviews.track(concept.name, concept_dict)
+    
+    def _adopt_concept(self, name: str, concept: Optional[Dict]):
+        """Take a concept as another process stored it (None: deleted), keeping the indexes in step"""
+        previous = self.data["concepts"].get(name)
+        if previous is not None:
+            self._count_concept(previous, -1)
+        if concept is None:
+            self._graph.discard(name)  # before the store forgets the concept's edges
+            self._reviews.untrack(name)
+            self.data["concepts"].pop(name, None)
+            self._columns = None  # the columns have no deletion; rebuilt on the next report
+            return
+        self._graph.add(name, concept["prerequisites"], concept["mastery_level"] >= MASTERY_THRESHOLD, check=False)
+        self.data["concepts"][name] = concept
+        self._count_concept(concept)
+        self._reviews.reschedule(name, concept)
     
+    @timed("tracker.update_mastery")
     def update_mastery(self, concept_name: str, new_level: int, time_spent: int):
         """Update mastery level for a concept"""
         if concept_name in self.data["concepts"]:
+            changes = self._prepare(ChangeSet().touch("concepts", concept_name)
+                                    .touch("spaced_repetition", concept_name).replace("phase_progress"))
+            self._count_concept(self.data["concepts"][concept_name], -1)
+            old_level = self.data["concepts"][concept_name]["mastery_level"]
             self.data["concepts"][concept_name]["mastery_level"] = new_level
             self.data["concepts"][concept_name]["time_invested"] += time_spent
             self.data["concepts"][concept_name]["last_reviewed"] = datetime.date.today().isoformat()
-            self._update_phase_progress()
-            self.save_data()
+            self._count_concept(self.data["concepts"][concept_name])
+            self._graph.set_mastered(concept_name, new_level >= MASTERY_THRESHOLD)
+            self._reviews.review(concept_name, new_level)
+            event = mastery_event(self.data["concepts"][concept_name], old_level, new_level, time_spent)
+            self._update_phase_progress()  # O(phases) from the running totals
+            self._persist(changes, [event])
+    
+    def bulk_update_mastery(self, updates: Iterable[Tuple[str, int, int]]):
+        """Apply many (concept_name, new_level, time_spent) updates as one batch"""
+        with self.batch():
+            for concept_name, new_level, time_spent in updates:
+                self.update_mastery(concept_name, new_level, time_spent)
+    
+    def study_analytics(self, window_days: int = 7) -> Iterator[Dict]:
+        """Daily rolling study time per phase, mastery velocity and per-module
+        time-to-mastery, streamed from the study log in one pass"""
+        return stream_analytics(self.study_log, window_days, MASTERY_THRESHOLD)
+    
+    def reviews_due(self, on: Optional[str] = None, limit: Optional[int] = None) -> List[str]:
+        """Concepts due for review on or before a date (default today), most overdue first"""
+        return self._reviews.due(on, limit)
+    
+    def next_reviews(self, count: int = 10) -> List[Tuple[str, str]]:
+        """The next scheduled reviews as (concept_name, due_date)"""
+        return self._reviews.upcoming(count)
+    
+    def bulk_reschedule(self, reviews: Iterable[Tuple[str, int, str]]):
+        """Replay a review log of (concept_name, quality 0-5, ISO date) in order, as one batch"""
+        with self.batch():
+            def known_reviews():
+                for concept_name, quality, reviewed_on in reviews:
+                    if concept_name in self.data["concepts"]:
+                        self._prepare(ChangeSet().touch("spaced_repetition", concept_name))
+                        yield concept_name, quality, reviewed_on
+            
+            changes = ChangeSet()
+            for concept_name in self._reviews.replay(known_reviews()):
+                changes.touch("spaced_repetition", concept_name)
+            self._persist(changes)
+    
+    @contextmanager
+    def batch(self):
+        """Group mutations: apply them in memory, then recompute and persist once at the end.
+        
+        If anything in the block raises, the in-memory data is rolled back and nothing
+        is written. Nested batches join the outermost one.
+        """
+        if self._batch_changes is not None:
+            yield self
+            return
+        self._batch_changes = ChangeSet()
+        try:
+            yield self
+            changes = self._batch_changes
+            if "phase_progress" in changes.sections:
+                self._update_phase_progress()
+            self._write(changes, self._pending_events)
+        except BaseException:
+            self._rollback()
+            raise
+        finally:
+            self._batch_changes = None
+            self._pending_events = []
+            self._undo_log = []
+            self._undo_seen = set()
+    
+    def _prepare(self, changes: ChangeSet) -> ChangeSet:
+        """Inside a batch, remember how to undo the parts changes is about to touch"""
+        if self._batch_changes is None:
+            return changes
+        for section, keys in changes.keys.items():
+            for key in keys:
+                if ("key", section, key) not in self._undo_seen:
+                    self._undo_seen.add(("key", section, key))
+                    old = self.data[section].get(key, _MISSING)
+                    self._undo_log.append(("key", section, key, old if old is _MISSING else copy.deepcopy(old)))
+        for section in changes.appended:
+            if ("length", section) not in self._undo_seen:
+                self._undo_seen.add(("length", section))
+                self._undo_log.append(("length", section, len(self.data[section])))
+        for section in changes.sections:
+            if ("section", section) not in self._undo_seen:
+                self._undo_seen.add(("section", section))
+                self._undo_log.append(("section", section, copy.deepcopy(self.data[section])))
+        return changes
+    
+    def _rollback(self):
+        """Undo everything the current batch changed, newest first"""
+        for entry in reversed(self._undo_log):
+            if entry[0] == "key":
+                _, section, key, old = entry
+                if old is _MISSING:
+                    self.data[section].pop(key, None)
+                else:
+                    self.data[section][key] = old
+            elif entry[0] == "length":
+                _, section, length = entry
+                del self.data[section][length:]
+            else:
+                _, section, old = entry
+                self.data[section] = old
+        self._rebuild_indexes()
+    
+    def _rebuild_indexes(self):
+        """Recompute everything derived from the concepts from scratch"""
+        self._phase_stats = self._compute_phase_stats()
+        self._graph = PrerequisiteGraph.from_concepts(self.data["concepts"], MASTERY_THRESHOLD)
+        self._reviews = ReviewScheduler(self.data["spaced_repetition"], self.data["concepts"])
+        self._columns = None
     
+    @timed("tracker.update_phase_progress")
     def _update_phase_progress(self):
         """Calculate progress for each phase based on concept mastery"""
+        self.data["phase_progress"].update(self._phase_progress(self._phase_stats))
+    
+    @staticmethod
+    def _phase_progress(phase_stats: Dict[int, PhaseStats]) -> Dict[str, float]:
+        """Mastery fraction of every phase that has concepts"""
+        progress = {}
         for phase_num in range(1, 10):
-            phase_concepts = [
-                c for c in self.data["concepts"].values() 
-                if c["phase"] == phase_num
-            ]
-            if phase_concepts:
-                total_mastery = sum(c["mastery_level"] for c in phase_concepts)
-                max_possible = len(phase_concepts) * 5  # Max mastery level is 5
-                progress = total_mastery / max_possible if max_possible > 0 else 0
-                self.data["phase_progress"][str(phase_num)] = progress
+            stats = phase_stats.get(phase_num)
+            if stats and stats.concepts:
+                max_possible = stats.concepts * 5  # Max mastery level is 5
+                progress[str(phase_num)] = stats.mastery_sum / max_possible
+        return progress
+    
+    def _count_concept(self, concept: Dict, sign: int = 1):
+        """Add a concept to (or remove it from) the running phase totals"""
+        self._phase_stats.setdefault(concept["phase"], PhaseStats()).add(concept, sign)
+        if sign > 0 and self._columns is not None:
+            self._columns.set(self.data["concepts"].id_of(concept["name"]), concept)
+    
+    def _concept_columns(self) -> "ConceptColumns":
+        """The columnar view of the concepts, kept in step with them once built"""
+        if self._columns is None:
+            from tracker_columns import ConceptColumns
+            self._columns = ConceptColumns.from_concepts(self.data["concepts"])
+        return self._columns
+    
+    def _compute_phase_stats(self) -> Dict[int, PhaseStats]:
+        """Full rescan of the concepts into per-phase totals"""
+        stats: Dict[int, PhaseStats] = {}
+        for concept in self.data["concepts"].values():
+            stats.setdefault(concept["phase"], PhaseStats()).add(concept)
+        return stats
+    
+    def phase_stats_consistent(self) -> bool:
+        """Check the running phase totals against a full recompute"""
+        nonempty = {phase: stats for phase, stats in self._phase_stats.items() if stats.concepts}
+        return nonempty == self._compute_phase_stats()
     
     def add_research_project(self, project: ResearchProject):
         """Add a research project"""
+        changes = self._prepare(ChangeSet().append("research_projects"))
         project_dict = asdict(project)
         self.data["research_projects"].append(project_dict)
-        self.save_data()
+        self._persist(changes)
     
     def add_career_goal(self, goal: CareerGoal):
         """Add a career goal"""
+        changes = self._prepare(ChangeSet().append("career_goals"))
         goal_dict = asdict(goal)
         self.data["career_goals"].append(goal_dict)
-        self.save_data()
+        self._persist(changes)
     
+    @timed("tracker.recommendations")
     def get_current_recommendations(self) -> Dict:
         """Get personalized recommendations based on current progress"""
         recommendations = {
@@ -247,108 +402,54 @@ class CompleteMathTracker:
         
         recommendations["phase_focus"] = f"Phase {current_phase}: {self.phases[current_phase]['name']}"
         
-        # Find concepts needing review (not reviewed in last 30 days)
-        thirty_days_ago = (datetime.date.today() - datetime.timedelta(days=30)).isoformat()
-        for concept_name, concept in self.data["concepts"].items():
-            if concept.get("last_reviewed", "1900-01-01") < thirty_days_ago:
-                recommendations["review_needed"].append(concept_name)
-        
-        # Find next concepts to learn
-        mastered_concepts = [
-            name for name, concept in self.data["concepts"].items()
-            if concept["mastery_level"] >= 4  # Consider 4+ as mastered
-        ]
+        # Concepts whose spaced-repetition review is due
+        recommendations["review_needed"] = self._reviews.due()
         
-        for concept_name, concept in self.data["concepts"].items():
-            if (concept["mastery_level"] < 4 and 
-                all(prereq in mastered_concepts for prereq in concept["prerequisites"])):
-                recommendations["next_concepts"].append(concept_name)
+        # Next concepts to learn: the prerequisite graph's frontier
+        recommendations["next_concepts"] = self._graph.next_concepts()
         
         return recommendations
     
+    @timed("tracker.learning_path")
     def generate_learning_path(self, career_goal: str, timeline_years: int) -> Dict:
-        """Generate a personalized learning path based on career goals"""
-        career_paths = {
-            "academic": {
-                "required_phases": [1, 2, 3, 4, 5, 6, 7, 8],
-                "emphasis": ["theoretical_depth", "research_skills", "publication"],
-                "timeline_multiplier": 1.2  # Academic path takes longer
-            },
-            "industry": {
-                "required_phases": [1, 2, 3, 4, 5, 6],
-                "emphasis": ["applied_skills", "computational", "collaboration"],
-                "timeline_multiplier": 0.8  # Industry path can be faster
-            },
-            "consulting": {
-                "required_phases": [1, 2, 3, 4, 5],
-                "emphasis": ["broad_knowledge", "communication", "problem_solving"],
-                "timeline_multiplier": 0.7
-            },
-            "tech": {
-                "required_phases": [1, 2, 3, 4, 5, 7],  # Skip some pure math, focus on computational
-                "emphasis": ["programming", "algorithms", "machine_learning"],
-                "timeline_multiplier": 0.6
-            }
-        }
+        """Generate a personalized learning path based on career goals
         
-        if career_goal not in career_paths:
-            return {"error": "Invalid career goal"}
-        
-        path = career_paths[career_goal]
-        adjusted_timeline = timeline_years * path["timeline_multiplier"]
-        
-        # Calculate time allocation for each phase
-        total_months = sum(
-            self.phases[phase]["duration_months"] if isinstance(self.phases[phase]["duration_months"], int) 
-            else 12  # Default for ongoing phases
-            for phase in path["required_phases"]
-        )
-        
-        time_allocation = {}
-        for phase in path["required_phases"]:
-            phase_months = (self.phases[phase]["duration_months"] 
-                          if isinstance(self.phases[phase]["duration_months"], int) else 12)
-            allocated_time = (phase_months / total_months) * (adjusted_timeline * 12)
-            time_allocation[phase] = allocated_time
-        
-        return {
-            "career_goal": career_goal,
-            "timeline_years": adjusted_timeline,
-            "required_phases": path["required_phases"],
-            "emphasis_areas": path["emphasis"],
-            "time_allocation": time_allocation,
-            "milestones": self._generate_milestones(path["required_phases"], adjusted_timeline)
-        }
+        Besides the catalog milestones, "projected_milestones" schedules the required
+        phases from the current phase progress and study velocity. Paths are memoized
+        (LRU) on goal, timeline, progress snapshot, velocity and date; every call gets
+        its own copy of the memoized path.
+        """
+        return thaw(learning_path(career_goal, timeline_years, *self._planning_snapshot(), datetime.date.today()))
     
-    def _generate_milestones(self, phases: List[int], timeline_years: float) -> List[Dict]:
-        """Generate milestone timeline for career path"""
-        milestones = []
-        cumulative_time = 0
-        
-        for phase in phases:
-            phase_info = self.phases[phase]
-            phase_duration = (phase_info["duration_months"] 
-                            if isinstance(phase_info["duration_months"], int) else 12)
-            
-            cumulative_time += phase_duration
-            milestone_date = datetime.date.today() + datetime.timedelta(days=cumulative_time * 30)
-            
-            milestones.append({
-                "phase": phase,
-                "name": phase_info["name"],
-                "target_date": milestone_date.isoformat(),
-                "level": phase_info["level"],
-                "key_skills": phase_info["modules"][:3]  # Top 3 modules
-            })
+    def learning_path_grid(self, career_goals: Iterable[str], timelines: Iterable[float]) -> Dict:
+        """Milestone plans for every career goal x timeline pair in one vectorized call"""
+        return learning_path_grid(career_goals, timelines, *self._planning_snapshot())
+    
+    def _planning_snapshot(self) -> Tuple[Tuple[float, ...], Tuple[int, ...], float]:
+        """(phase progress, concepts per phase, velocity): what milestone plans depend on"""
+        progress = tuple(self.data["phase_progress"][str(phase)] for phase in PHASE_NUMBERS)
+        concepts = tuple(self._phase_stats[phase].concepts if phase in self._phase_stats else 0
+                         for phase in PHASE_NUMBERS)
+        return progress, concepts, round(self.study_velocity(), 3)
+    
+    def study_velocity(self, window_days: int = 30) -> float:
+        """Mastery levels gained per day over the last window_days, from the study log
         
-        return milestones
+        Cached until the log changes (or the day does); a change reads just the
+        events appended since the last call.
+        """
+        key = (self.study_log.version(), datetime.date.today(), window_days)
+        if self._velocity_cache is None or self._velocity_cache[0] != key:
+            self._velocity_cache = (key, self._mastery_gains.velocity(window_days, key[1]))
+        return self._velocity_cache[1]
     
+    @timed("tracker.report")
     def generate_comprehensive_report(self) -> Dict:
         """Generate a comprehensive progress report"""
-        total_concepts = len(self.data["concepts"])
-        mastered_concepts = sum(1 for c in self.data["concepts"].values() if c["mastery_level"] >= 4)
+        total_concepts = sum(stats.concepts for stats in self._phase_stats.values())
+        mastered_concepts = sum(stats.mastered for stats in self._phase_stats.values())
         
-        total_time = sum(c["time_invested"] for c in self.data["concepts"].values())
+        total_time = sum(stats.time_invested for stats in self._phase_stats.values())
         
         phase_progress = {
             int(k): v for k, v in self.data["phase_progress"].items()
@@ -356,6 +457,11 @@ class CompleteMathTracker:
         
         current_phase = max(k for k, v in phase_progress.items() if v > 0.1)
         
+        # Breakdowns and distributions come from vectorized group-bys over the columns
+        columns = self._concept_columns().summary(MASTERY_THRESHOLD)
+        empty_phase = {"concepts": 0, "mastered": 0, "avg_mastery": 0.0, "avg_difficulty": 0.0,
+                       "study_time_hours": 0.0}
+        
         return {
             "overall_progress": {
                 "concepts_mastered": f"{mastered_concepts}/{total_concepts}",
@@ -367,10 +473,13 @@ class CompleteMathTracker:
             "phase_breakdown": {
                 phase: {
                     "progress": progress * 100,
-                    "status": "Completed" if progress >= 0.9 else "In Progress" if progress > 0 else "Not Started"
+                    "status": "Completed" if progress >= 0.9 else "In Progress" if progress > 0 else "Not Started",
+                    **columns["phases"].get(phase, empty_phase)
                 }
                 for phase, progress in phase_progress.items()
             },
+            "module_breakdown": columns["modules"],
+            "distribution": columns["percentiles"],
             "research_activity": {
                 "active_projects": len([p for p in self.data["research_projects"] if p["status"] == "active"]),
                 "completed_projects": len([p for p in self.data["research_projects"] if p["status"] == "completed"]),
@@ -385,35 +494,242 @@ class CompleteMathTracker:
             "recommendations": self.get_current_recommendations()
         }
     
-    def visualize_progress(self, save_path: str = "math_progress.png"):
-        """Create a visual progress chart"""
+    def _progress_chart(self) -> Dict:
+        """The phase progress bar chart, as data"""
+        from tracker_charts import bar_chart
+        
         phases = list(range(1, 10))
         progress = [self.data["phase_progress"][str(p)] * 100 for p in phases]
         phase_names = [self.phases[p]["name"][:20] + "..." if len(self.phases[p]["name"]) > 20 
                       else self.phases[p]["name"] for p in phases]
         
-        plt.figure(figsize=(15, 8))
-        bars = plt.bar(phases, progress, color=['green' if p >= 90 else 'orange' if p >= 50 else 'red' for p in progress])
+        return bar_chart(
+            "Complete Mathematics Mastery Progress", [f"P{p}" for p in phases], progress,
+            xlabel="Phase", ylabel="Progress (%)",
+            colors=['green' if p >= 90 else 'orange' if p >= 50 else 'red' for p in progress],
+            annotations=[f"{p:.1f}%\n{name}" for p, name in zip(progress, phase_names)]
+        )
+    
+    def _chart_renderer(self, dpi: int):
+        from tracker_charts import ChartRenderer
+        return ChartRenderer(self.data_file.with_suffix(".charts"), dpi)
+    
+    @timed("tracker.visualize_progress")
+    def visualize_progress(self, save_path: str = "math_progress.png", fmt: Optional[str] = None,
+                           dpi: int = 300, show: bool = False) -> bool:
+        """Create a visual progress chart
         
-        plt.xlabel('Phase')
-        plt.ylabel('Progress (%)')
-        plt.title('Complete Mathematics Mastery Progress')
-        plt.xticks(phases, [f"P{p}" for p in phases], rotation=45)
+        Renders headlessly (PNG or SVG, from fmt or the file suffix) and serves the
+        file from the chart cache when the progress has not changed; show=True also
+        opens the chart in a window. Returns True if the cached chart was used.
+        """
+        chart = self._progress_chart()
+        cached = self._chart_renderer(dpi).render(chart, save_path, fmt)
+        if show:
+            import matplotlib.pyplot as plt
+            from tracker_charts import draw_bar_chart
+            
+            figure = plt.figure(figsize=chart["figsize"])
+            draw_bar_chart(figure.add_subplot(), chart)
+            plt.show()
+            plt.close(figure)
+        return cached
+    
+    def render_breakdown_charts(self, output_dir: str, fmt: str = "png", dpi: int = 150) -> Dict[str, int]:
+        """Render a chart per phase (average mastery of each module) and per module
+        (concepts at each mastery level) in one pass; returns rendered/cached counts"""
+        from tracker_charts import bar_chart, chart_filename
         
-        # Add phase names as labels
-        for i, (bar, name) in enumerate(zip(bars, phase_names)):
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + 1,
-                    f"{height:.1f}%\n{name}", ha='center', va='bottom', fontsize=8, rotation=45)
+        columns = self._concept_columns()
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        def charts():
+            for phase, modules in sorted(columns.phase_module_mastery().items()):
+                title = f"Phase {phase}: {self.phases[phase]['name']}" if phase in self.phases else f"Phase {phase}"
+                yield (bar_chart(title, list(modules), list(modules.values()), xlabel="Module",
+                                 ylabel="Average mastery level (0-5)", figsize=(10, 6)),
+                       output_dir / f"phase_{phase}.{fmt}")
+            for module, counts in columns.module_mastery_histograms().items():
+                yield (bar_chart(module, [str(level) for level in range(len(counts))], counts,
+                                 xlabel="Mastery level", ylabel="Concepts", figsize=(8, 5)),
+                       output_dir / f"module_{chart_filename(module)}.{fmt}")
+        
+        return self._chart_renderer(dpi).render_many(charts(), fmt)
+    
+    def _persist(self, changes: ChangeSet, events: Iterable[Dict] = ()):
+        """Write just the changed parts through the storage backend (deferred inside a batch)"""
+        if self._batch_changes is not None:
+            self._batch_changes.merge(changes)
+            self._pending_events.extend(events)
+        else:
+            self._write(changes, events)
+    
+    def _write(self, changes: ChangeSet, events: Iterable[Dict]):
+        """Store changes and log events now, or hold them for flush() after defer_writes()"""
+        if self._deferred_changes is not None:
+            self._deferred_changes.merge(changes)
+            self._deferred_events.extend(events)
+        else:
+            self._store(changes, events)
     
+    def _store(self, changes: ChangeSet, events: Iterable[Dict]):
+        """Write changes (rebasing onto newer data from other processes) and log events"""
+        self.adopt(self._write_stored(changes, events))
+    
+    @timed("tracker.store")
+    def _write_stored(self, changes: ChangeSet, events: Iterable[Dict]) -> StoredChanges:
+        """Write changes and log events; returns what other processes stored, not adopted yet"""
+        others = StoredChanges()
+        if changes:
+            others = self.storage.write(self.data, changes, lambda stored: self._merged_sections(stored, changes))
+        self.study_log.append_many(events)
+        return others
+    
+    def _merged_sections(self, others: StoredChanges, changes: ChangeSet) -> Dict:
+        """The derived sections changes replaces, recomputed over our data plus what others stored
+        
+        Called while the write holds the storage lock; reads the tracker, changes nothing.
+        """
+        if "phase_progress" not in changes.sections:
+            return {}
+        concepts = self.data["concepts"]
+        if "concepts" in others.sections:  # replaced wholesale: total it up with our changes on top
+            ours = changes.keys.get("concepts", set())
+            stats: Dict[int, PhaseStats] = {}
+            merged = [c for name, c in others.sections["concepts"].items() if name not in ours]
+            for concept in merged + [concepts[name] for name in ours if name in concepts]:
+                stats.setdefault(concept["phase"], PhaseStats()).add(concept)
+        else:
+            stats = {phase: dataclasses.replace(totals) for phase, totals in self._phase_stats.items()}
+            changed = others.keys.get("concepts", {})
+            for name in list(changed) + list(others.deleted.get("concepts", ())):
+                previous = concepts.get(name)
+                if previous is not None:
+                    stats[previous["phase"]].add(previous, -1)
+            for concept in changed.values():
+                stats.setdefault(concept["phase"], PhaseStats()).add(concept)
+        return {"phase_progress": {**self.data["phase_progress"], **self._phase_progress(stats)}}
+    
+    @timed("tracker.adopt")
+    def adopt(self, others: StoredChanges) -> bool:
+        """Bring what other processes stored into memory, updating the indexes for just those
+        entries (the whole of a section only if they replaced it); returns False if there was nothing
+        """
+        if not others:
+            return False
+        for section, value in others.sections.items():
+            self.data[section] = ConceptStore(value) if section == "concepts" else value
+        if {"concepts", "spaced_repetition"} & others.sections.keys():
+            self._rebuild_indexes()
+        
+        for section, entries in others.keys.items():
+            if section == "concepts":
+                for name, concept in entries.items():
+                    self._adopt_concept(name, concept)
+            else:
+                self.data.setdefault(section, {}).update(entries)
+        for section, keys in others.deleted.items():
+            for key in keys:
+                if section == "concepts":
+                    self._adopt_concept(key, None)
+                else:
+                    self.data[section].pop(key, None)
+        for name in {*others.keys.get("spaced_repetition", ()), *others.deleted.get("spaced_repetition", ())}:
+            if name in self.data["concepts"]:
+                self._reviews.reschedule(name, self.data["concepts"][name])
+        for section, (position, items) in others.appended.items():
+            self.data.setdefault(section, [])[position:position] = items
+        
+        if "concepts" in others.keys or "concepts" in others.deleted or "concepts" in others.sections:
+            self._update_phase_progress()
+        return True
+    
+    def defer_writes(self):
+        """Keep applying changes in memory but hold their writes until flush().
+        
+        Meant for a long-running process that persists in the background; unlike
+        batch() nothing is rolled back, every change is kept and written eventually.
+        """
+        if self._deferred_changes is None:
+            self._deferred_changes = ChangeSet()
+    
+    def flush(self) -> bool:
+        """Write everything held back since defer_writes(); returns False if there was nothing.
+        
+        If the write fails the changes are kept for the next flush.
+        """
+        others = self.write_held()
+        if others is None:
+            return False
+        self.adopt(others)
+        return True
+    
+    def write_held(self) -> Optional[StoredChanges]:
+        """The disk half of flush(): write what is held back and return what other processes
+        stored meanwhile, for adopt(); None if there was nothing to write.
+        
+        Reads the tracker but changes nothing it holds, so it can run on a worker thread
+        while readers carry on, as long as no other mutation runs until adopt().
+        """
+        changes, events = self._deferred_changes, self._deferred_events
+        if not changes and not events:
+            return None
+        self._deferred_changes, self._deferred_events = ChangeSet(), []
+        try:
+            return self._write_stored(changes, events)
+        except BaseException:
+            changes.merge(self._deferred_changes)
+            self._deferred_changes = changes
+            self._deferred_events = events + self._deferred_events
+            raise
+    
+    @contextmanager
+    def held_writes(self):
+        """Apply changes in memory and write them once, when the block ends
+        
+        For bulk work on storage where every write costs the whole document.
+        Unlike batch() the changes are not rolled back if the block raises; what
+        was applied is still written. If writes are already deferred, they stay so.
+        """
+        if self._deferred_changes is not None:
+            yield self
+            return
+        self.defer_writes()
+        try:
+            yield self
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._deferred_changes = None
+
+    @contextmanager
+    def bulk_load(self):
+        """Add many concepts in batches: the storage indexes are rebuilt once at the
+        end, and on storage where every write costs the whole document the batches
+        are held (held_writes()) and written once.
+        
+        The cyclic garbage collector is paused for the block: a large load allocates
+        millions of (acyclic) records, and each full collection would walk them all.
+        """
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            with self.storage.bulk_load():
+                if self.storage.incremental:
+                    yield self
+                else:
+                    with self.held_writes():
+                        yield self
+        finally:
+            if collecting:
+                gc.enable()
+
+    @timed("tracker.save_data")
     def save_data(self):
-        """Save data to JSON file"""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        """Save all data through the storage backend"""
+        self.storage.save(self.data)
 
 # Example CLI interface
 if __name__ == "__main__":
@@ -424,13 +740,75 @@ if __name__ == "__main__":
     parser.add_argument("--path", type=str, help="Generate learning path for career goal")
     parser.add_argument("--timeline", type=int, default=8, help="Timeline in years for career path")
     parser.add_argument("--visualize", action="store_true", help="Create progress visualization")
-    parser.add_argument("--add-concept", action="store_true", help="Add a new concept")
-    parser.add_argument("--update-mastery", nargs=3, help="Update mastery: concept_name new_level time_spent")
+    parser.add_argument("--format", choices=["png", "svg"], default="png", help="Chart file format")
+    parser.add_argument("--dpi", type=int, default=300, help="Chart resolution")
+    parser.add_argument("--show", action="store_true", help="Also open the progress chart in a window")
+    parser.add_argument("--chart-dir", type=str, metavar="DIR",
+                        help="Render per-phase and per-module charts into DIR")
+    parser.add_argument("--add-concept", action="store_true", help="Add new concepts (saved together at the end)")
+    parser.add_argument("--update-mastery", nargs=3, action="append", metavar=("CONCEPT", "LEVEL", "MINUTES"),
+                        help="Update mastery; repeat to apply several updates with one write")
+    parser.add_argument("--analytics", type=int, nargs="?", const=7, metavar="DAYS",
+                        help="Study analytics from the event log over a rolling window of DAYS")
+    parser.add_argument("--due", type=int, nargs="?", const=20, metavar="N", help="List the next N reviews due")
+    parser.add_argument("--serve", action="store_true", help="Keep the tracker resident behind a local HTTP/JSON API")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address for --serve")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --serve")
+    parser.add_argument("--data-file", type=str, default="complete_math_data.json", help="Tracker data file")
+    parser.add_argument("--storage", choices=["json", "sqlite"], help="Storage backend (default: from file suffix)")
+    parser.add_argument("--migrate-to-sqlite", type=str, metavar="DB", help="Copy the JSON data file into a SQLite database")
+    parser.add_argument("--import", dest="import_file", type=str, metavar="FILE",
+                        help="Add the concepts in a .csv, .jsonl or .parquet curriculum file")
+    parser.add_argument("--export", type=str, metavar="FILE",
+                        help="Write all concepts to a .csv, .jsonl or .parquet curriculum file")
+    parser.add_argument("--chunk-size", type=int, default=10_000,
+                        help="Records validated and committed together by --import/--export")
+    parser.add_argument("--profile", type=str, nargs="?", const="tracker_profile", metavar="PREFIX",
+                        help="Time the command: write PREFIX.pstats (cProfile) and PREFIX.metrics.json")
+    parser.add_argument("--metrics-format", choices=["json", "prometheus"], default="json",
+                        help="Format of the --profile metrics file")
     
     args = parser.parse_args()
-    tracker = CompleteMathTracker()
     
-    if args.report:
+    if args.profile:
+        import atexit
+        import tracker_metrics
+        paths = tracker_metrics.profile_until_exit(args.profile, args.metrics_format)
+        atexit.register(lambda: print(f"\n⏱️  Profile:\n{tracker_metrics.summary()}\n"
+                                      f"   Saved {paths['pstats']} and {paths['metrics']}"))
+    
+    if args.migrate_to_sqlite:
+        from tracker_storage import migrate_json_to_sqlite
+        count = migrate_json_to_sqlite(args.data_file, args.migrate_to_sqlite)
+        print(f"✅ Migrated {count} concepts to {args.migrate_to_sqlite}")
+        raise SystemExit(0)
+    
+    tracker = CompleteMathTracker(args.data_file, args.storage)
+    
+    if args.serve:
+        from tracker_server import serve
+        serve(tracker, args.host, args.port)
+    
+    elif args.import_file:
+        from tracker_io import import_concepts
+        stats = import_concepts(tracker, args.import_file, chunk_size=args.chunk_size)
+        rate = stats["imported"] / stats["seconds"] if stats["seconds"] else 0
+        print(f"✅ Imported {stats['imported']} concepts in {stats['seconds']:.2f} s ({rate:,.0f} concepts/s)")
+        if stats["rejected"]:
+            print(f"❌ Rejected {stats['rejected']} records:")
+            for number, message in stats["errors"]:
+                print(f"   Record {number}: {message}")
+        if stats["unresolved"]:
+            print(f"⚠️  Prerequisites not tracked yet: {stats['unresolved']}")
+    
+    elif args.export:
+        from tracker_io import export_concepts
+        stats = export_concepts(tracker, args.export, chunk_size=args.chunk_size)
+        rate = stats["exported"] / stats["seconds"] if stats["seconds"] else 0
+        print(f"✅ Exported {stats['exported']} concepts to {args.export} in {stats['seconds']:.2f} s "
+              f"({rate:,.0f} concepts/s)")
+    
+    elif args.report:
         report = tracker.generate_comprehensive_report()
         print("📊 COMPREHENSIVE MATHEMATICS PROGRESS REPORT")
         print("=" * 50)
@@ -446,6 +824,11 @@ if __name__ == "__main__":
         for phase, info in report["phase_breakdown"].items():
             print(f"   Phase {phase}: {info['progress']:.1f}% ({info['status']})")
         
+        distribution = report["distribution"]
+        print(f"\n📐 Distribution:")
+        print(f"   Median Mastery Level: {distribution['mastery_level'][50]:.1f}")
+        print(f"   90th Percentile Study Time: {distribution['study_time_hours'][90]:.1f} hours")
+        
         research = report["research_activity"]
         print(f"\n🔬 Research Activity:")
         print(f"   Active Projects: {research['active_projects']}")
@@ -474,31 +857,74 @@ if __name__ == "__main__":
             print(f"\n📅 Milestones:")
             for milestone in path['milestones']:
                 print(f"   {milestone['target_date']}: Complete {milestone['name']}")
+            
+            print(f"\n🚀 Projected at your current pace:")
+            for milestone in path['projected_milestones']:
+                print(f"   {milestone['target_date']}: Complete {milestone['name']} "
+                      f"({milestone['progress']:.0f}% done, by {milestone['basis']})")
     
     elif args.visualize:
-        tracker.visualize_progress()
-        print("📊 Progress visualization saved as 'math_progress.png'")
+        save_path = f"math_progress.{args.format}"
+        cached = tracker.visualize_progress(save_path, args.format, args.dpi, args.show)
+        print(f"📊 Progress visualization saved as '{save_path}'" + (" (unchanged, from cache)" if cached else ""))
+    
+    elif args.chart_dir:
+        counts = tracker.render_breakdown_charts(args.chart_dir, args.format, args.dpi)
+        print(f"📊 Charts saved to {args.chart_dir}: {counts['rendered']} rendered, {counts['cached']} from cache")
+    
+    elif args.analytics:
+        latest = None
+        for latest in tracker.study_analytics(args.analytics):
+            pass
+        if latest is None:
+            print("📭 No study events logged yet")
+        else:
+            print(f"📈 STUDY ANALYTICS ({args.analytics}-day window, as of {latest['date']})")
+            for phase, minutes in latest["study_minutes_by_phase"].items():
+                print(f"   Phase {phase}: {minutes / 60:.1f} hours")
+            print(f"   Mastery velocity: {latest['mastery_velocity']:.2f} levels/day")
+            for module, minutes in latest["time_to_mastery"].items():
+                print(f"   {module}: {minutes / 60:.1f} hours to mastery")
+    
+    elif args.due:
+        due_today = tracker.reviews_due()
+        print(f"🔁 Reviews due today: {len(due_today)}")
+        for concept_name, due in tracker.next_reviews(args.due):
+            print(f"   {due}: {concept_name}")
     
     elif args.add_concept:
-        print("➕ Add New Concept")
-        name = input("Concept name: ")
-        phase = int(input("Phase (1-9): "))
-        module = input("Module: ")
-        difficulty = int(input("Difficulty (1-10): "))
-        prerequisites = input("Prerequisites (comma-separated): ").split(",")
-        prerequisites = [p.strip() for p in prerequisites if p.strip()]
-        
-        concept = MathConcept(
-            name=name, phase=phase, module=module, difficulty=difficulty,
-            prerequisites=prerequisites, mastery_level=0, time_invested=0
-        )
-        tracker.add_concept(concept)
-        print(f"✅ Added concept: {name}")
+        # Every write rewrites a JSON data file, so the whole session is saved once
+        with tracker.held_writes():
+            while True:
+                print("➕ Add New Concept")
+                name = input("Concept name: ")
+                phase = int(input("Phase (1-9): "))
+                module = input("Module: ")
+                difficulty = int(input("Difficulty (1-10): "))
+                prerequisites = input("Prerequisites (comma-separated): ").split(",")
+                prerequisites = [p.strip() for p in prerequisites if p.strip()]
+                
+                concept = MathConcept(
+                    name=name, phase=phase, module=module, difficulty=difficulty,
+                    prerequisites=prerequisites, mastery_level=0, time_invested=0
+                )
+                dangling = tracker.add_concept(concept)
+                print(f"✅ Added concept: {name}")
+                if dangling:
+                    print(f"⚠️  Prerequisites not tracked yet: {', '.join(dangling)}")
+                try:
+                    another = input("Add another concept? (y/N): ")
+                except EOFError:  # piped input has run out: same as answering no
+                    print()
+                    another = ""
+                if another.strip().lower() != "y":
+                    break
     
     elif args.update_mastery:
-        concept_name, new_level, time_spent = args.update_mastery
-        tracker.update_mastery(concept_name, int(new_level), int(time_spent))
-        print(f"✅ Updated mastery for {concept_name}: Level {new_level}")
+        tracker.bulk_update_mastery((concept_name, int(new_level), int(time_spent))
+                                    for concept_name, new_level, time_spent in args.update_mastery)
+        for concept_name, new_level, _ in args.update_mastery:
+            print(f"✅ Updated mastery for {concept_name}: Level {new_level}")
     
     else:
         print("🧮 Complete Mathematics Mastery Tracker")
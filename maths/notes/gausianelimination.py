@@ -1,49 +1,636 @@
+import functools
+import time
+from dataclasses import dataclass
+
 import numpy as np
 # https://stackoverflow.com/questions/15638650/is-there-a-standard-solution-for-gauss-elimination-in-python
-def gaussian_elimination(matrix, vector):
+
+# Instrumentation hook: None, or observe(name, seconds) called after each
+# timed solver entry point (see set_instrumentation)
+_observe = None
+
+# Panel width of the blocked factorization. Wide enough that the trailing
+# update is dominated by matrix-matrix products, narrow enough that the
+# unblocked panel loop stays cheap.
+DEFAULT_BLOCK_SIZE = 64
+
+# A sparse system goes to banded elimination while the band work array
+# (n × (2·lower + upper + 1)) is at most this many times its nonzero count;
+# wider bands go to sparse LU instead.
+BANDED_FILL_LIMIT = 4
+
+# Mixed precision: refinement converges when cond(A)·eps(float32) is well
+# below 1, so skip straight to a float64 factorization above this product
+REFINEMENT_CONDITION_LIMIT = 0.1
+MAX_REFINEMENT_ITERATIONS = 10
+
+
+def set_instrumentation(observe):
+    """
+    Report how long each call of a solver entry point takes: lu_factor,
+    lu_solve, gaussian_elimination and the batched, banded and sparse solvers.
+
+    Args:
+        observe: callable(name, seconds), e.g. tracker_metrics.record, or
+            None to stop reporting
+    """
+    global _observe
+    _observe = observe
+
+
+def _timed(name):
+    """Decorator: time calls to the function for the instrumentation hook, if one is set."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _observe is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def _factor_panel(a, k0, k1):
+    """
+    Unblocked LU with partial pivoting of the panel a[k0:, k0:k1], in place.
+
+    Row interchanges are only applied inside the panel columns; the caller
+    applies the returned ordering to the rest of the rows.
+
+    Returns:
+        Local row ordering of a[k0:] chosen by the pivot search
+    """
+    panel = a[k0:, k0:k1]
+    order = np.arange(panel.shape[0])
+    for j in range(k1 - k0):
+        # Vectorized pivot search down the current column
+        p = j + int(np.argmax(np.abs(panel[j:, j])))
+        if panel[p, j] == 0:
+            raise ValueError("Matrix is singular and cannot be solved")
+        if p != j:
+            panel[[j, p]] = panel[[p, j]]
+            order[[j, p]] = order[[p, j]]
+
+        # Multipliers go below the diagonal, rank-1 update of the rest of the panel
+        panel[j + 1:, j] /= panel[j, j]
+        panel[j + 1:, j + 1:] -= np.outer(panel[j + 1:, j], panel[j, j + 1:])
+    return order
+
+
+def _permute_rows(block, order):
+    """Reorder the rows of block in place, touching only the rows that move."""
+    moved = np.flatnonzero(order != np.arange(len(order)))
+    if len(moved):
+        block[moved] = block[order[moved]]
+
+
+def _solve_unit_lower(lu, b, block_size=DEFAULT_BLOCK_SIZE):
+    """Solve L y = b in place, L being the unit lower triangle of lu."""
+    n = lu.shape[0]
+    for k0 in range(0, n, block_size):
+        k1 = min(k0 + block_size, n)
+        for i in range(k0 + 1, k1):
+            b[i] -= lu[i, k0:i] @ b[k0:i]
+        if k1 < n:
+            b[k1:] -= lu[k1:, k0:k1] @ b[k0:k1]
+    return b
+
+
+def _solve_upper(lu, b, block_size=DEFAULT_BLOCK_SIZE):
+    """Solve U x = y in place, U being the upper triangle of lu."""
+    n = lu.shape[0]
+    for k1 in range(n, 0, -block_size):
+        k0 = max(k1 - block_size, 0)
+        for i in range(k1 - 1, k0 - 1, -1):
+            b[i] = (b[i] - lu[i, i + 1:k1] @ b[i + 1:k1]) / lu[i, i]
+        if k0 > 0:
+            b[:k0] -= lu[:k0, k0:k1] @ b[k0:k1]
+    return b
+
+
+@_timed("solver.lu_factor")
+def lu_factor(matrix, block_size=DEFAULT_BLOCK_SIZE, dtype=np.float64):
+    """
+    Blocked, right-looking LU factorization with partial pivoting: P A = L U.
+
+    Each panel of block_size columns is factored with the unblocked loop,
+    then the trailing submatrix is updated with a single matrix-matrix
+    product, so almost all of the O(n³) work runs inside BLAS.
+
+    Args:
+        matrix: n×n coefficient matrix (A)
+        block_size: number of columns per panel
+        dtype: floating-point type to factor in
+
+    Returns:
+        (lu, perm) where lu packs L (unit diagonal, below) and U (on and
+        above the diagonal), and perm is the row order so that A[perm] = L U
+    """
+    a = np.array(matrix, dtype=dtype)
+    if a.ndim != 2 or a.shape[0] != a.shape[1]:
+        raise ValueError("Matrix must be square")
+    n = a.shape[0]
+    perm = np.arange(n)
+
+    for k0 in range(0, n, block_size):
+        k1 = min(k0 + block_size, n)
+        order = _factor_panel(a, k0, k1)
+
+        # Carry the panel's interchanges to the rows left and right of it
+        _permute_rows(a[k0:, :k0], order)
+        _permute_rows(a[k0:, k1:], order)
+        _permute_rows(perm[k0:], order)
+
+        if k1 < n:
+            # U12 = L11⁻¹ A12, then A22 -= L21 U12 as one GEMM
+            _solve_unit_lower(a[k0:k1, k0:k1], a[k0:k1, k1:], block_size)
+            a[k1:, k1:] -= a[k1:, k0:k1] @ a[k0:k1, k1:]
+
+    return a, perm
+
+
+@_timed("solver.lu_solve")
+def lu_solve(lu, perm, vector, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Solve A x = b from the factors returned by lu_factor.
+
+    Args:
+        lu: packed L\\U factors
+        perm: row order from lu_factor
+        vector: right-hand side b, shape (n,) or (n, k)
+
+    Returns:
+        Solution x with the same shape as b, in the precision of lu
+    """
+    b = np.asarray(vector, dtype=lu.dtype)[perm]
+    _solve_unit_lower(lu, b, block_size)
+    _solve_upper(lu, b, block_size)
+    return b
+
+
+def _lu_solve_transposed(lu, perm, vector):
+    """Solve Aᵀ x = c from the factors of A: Uᵀ z = c, Lᵀ w = z, x[perm] = w."""
+    b = np.array(vector, dtype=lu.dtype)
+    n = lu.shape[0]
+    for i in range(n):
+        b[i] = (b[i] - lu[:i, i] @ b[:i]) / lu[i, i]
+    for i in range(n - 1, -1, -1):
+        b[i] -= lu[i + 1:, i] @ b[i + 1:]
+    x = np.empty_like(b)
+    x[perm] = b
+    return x
+
+
+def condition_estimate(matrix, lu, perm):
+    """
+    Estimate the 1-norm condition number of A from its LU factors.
+
+    Hager's method (as in LAPACK's gecon): a few solves with A and Aᵀ
+    estimate ‖A⁻¹‖₁ in O(n²) instead of forming the inverse.
+
+    Args:
+        matrix: the original n×n matrix (A)
+        lu, perm: factors of A from lu_factor
+
+    Returns:
+        Estimate of ‖A‖₁·‖A⁻¹‖₁
+    """
+    n = lu.shape[0]
+    if n == 0:
+        return 0.0
+    x = np.full(n, 1.0 / n)
+    inverse_norm = 0.0
+    for _ in range(5):
+        y = lu_solve(lu, perm, x).astype(np.float64)
+        inverse_norm = np.abs(y).sum()
+        z = _lu_solve_transposed(lu, perm, np.where(y >= 0, 1.0, -1.0)).astype(np.float64)
+        j = int(np.argmax(np.abs(z)))
+        if abs(z[j]) <= z @ x:
+            break
+        x = np.zeros(n)
+        x[j] = 1.0
+    return float(np.abs(matrix).sum(axis=0).max() * inverse_norm)
+
+
+@dataclass
+class RefinementInfo:
+    """How the last mixed-precision solve went"""
+    iterations: int
+    converged: bool
+    fell_back: bool
+    condition_estimate: float
+
+
+class LUFactorization:
+    """
+    Factor A once, then solve A x = b for as many right-hand sides as needed.
+
+    The factorization costs O(n³); every solve afterwards is two triangular
+    solves, O(n²) per right-hand side.
+
+    Args:
+        matrix: n×n coefficient matrix (A)
+        block_size: number of columns per panel
+        workers: factor on this many workers with the tiled task scheduler
+            from parallel_elimination (default: single-threaded)
+        executor: "thread" or "process" pool when workers is set
+        precision: "float64", or "mixed" to factor in float32 and recover
+            float64 accuracy by iterative refinement against the original A.
+            Mixed precision falls back to a float64 factorization when the
+            condition estimate is too large or refinement does not converge.
+
+    Attributes:
+        lu: packed L\\U factors
+        piv: row order so that A[piv] = L U
+        refinement: RefinementInfo for the last mixed-precision solve
+    """
+
+    def __init__(self, matrix, block_size=DEFAULT_BLOCK_SIZE, workers=None, executor="thread",
+                 precision="float64"):
+        if precision not in ("float64", "mixed"):
+            raise ValueError(f"Unknown precision: {precision!r} (use 'float64' or 'mixed')")
+        self.block_size = block_size
+        self.workers = workers
+        self.executor = executor
+        self.precision = precision
+        self.refinement = None
+        self.condition = None
+
+        if precision == "mixed":
+            self.matrix = np.array(matrix, dtype=np.float64)
+            try:
+                self._factor(self.matrix, np.float32)
+                self.condition = condition_estimate(self.matrix, self.lu, self.piv)
+            except ValueError:
+                # Singular in float32 (or underflow); float64 may still cope
+                self.condition = np.inf
+            if not self.condition * np.finfo(np.float32).eps < REFINEMENT_CONDITION_LIMIT:
+                self._fall_back()
+                self.refinement = RefinementInfo(0, False, True, self.condition)
+        else:
+            self._factor(matrix, np.float64)
+
+    def _factor(self, matrix, dtype):
+        if self.workers:
+            from parallel_elimination import parallel_lu_factor
+            self.lu, self.piv = parallel_lu_factor(matrix, self.block_size, self.workers, self.executor, dtype)
+        else:
+            self.lu, self.piv = lu_factor(matrix, self.block_size, dtype)
+
+    def _fall_back(self):
+        """Give up on float32 factors for good and factor A in float64."""
+        self._factor(self.matrix, np.float64)
+        self.precision = "float64"
+
+    @property
+    def n(self):
+        return self.lu.shape[0]
+
+    def solve(self, rhs):
+        """
+        Solve against the stored factors.
+
+        Args:
+            rhs: a vector of shape (n,), a block of shape (n, k), or any
+                other iterable of vectors (e.g. a generator)
+
+        Returns:
+            The solution array for array input; for an iterable of vectors,
+            a generator yielding one solution per vector as they arrive
+        """
+        if isinstance(rhs, (np.ndarray, list, tuple)):
+            return self._solve_array(rhs)
+        return (self._solve_array(vector) for vector in rhs)
+
+    def _solve_array(self, rhs):
+        rhs = np.asarray(rhs)
+        if rhs.shape[0] != self.n:
+            raise ValueError(f"Right-hand side has {rhs.shape[0]} rows, expected {self.n}")
+        if self.precision == "mixed":
+            return self._solve_refined(rhs.astype(np.float64))
+        return lu_solve(self.lu, self.piv, rhs, self.block_size)
+
+    def _solve_refined(self, b):
+        """Solve with the float32 factors, then refine: r = b - A x in float64, x += A⁻¹ r."""
+        n = self.n
+        a_norm = np.abs(self.matrix).max()
+        tolerance = np.sqrt(n) * np.finfo(np.float64).eps * a_norm
+
+        x = lu_solve(self.lu, self.piv, b, self.block_size).astype(np.float64)
+        for iteration in range(MAX_REFINEMENT_ITERATIONS + 1):
+            residual = b - self.matrix @ x
+            if np.all(np.abs(residual).max(axis=0) <= tolerance * np.abs(x).max(axis=0)):
+                self.refinement = RefinementInfo(iteration, True, False, self.condition)
+                return x
+            if iteration == MAX_REFINEMENT_ITERATIONS or not np.all(np.isfinite(residual)):
+                break
+            x += lu_solve(self.lu, self.piv, residual, self.block_size)
+
+        self._fall_back()
+        self.refinement = RefinementInfo(iteration, False, True, self.condition)
+        return lu_solve(self.lu, self.piv, b, self.block_size)
+
+
+@_timed("solver.gaussian_elimination")
+def gaussian_elimination(matrix, vector, precision="float64", return_info=False):
     """
     Solve a system of linear equations Ax = b using Gaussian elimination.
-    
+
     Args:
         matrix: n×n coefficient matrix (A)
         vector: n×1 constant vector (b)
-    
+        precision: "float64", or "mixed" for a float32 factorization with
+            iterative refinement (see LUFactorization)
+        return_info: also return how the solve went
+
+    Returns:
+        Solution vector x, or (x, info) with return_info: info is the
+        RefinementInfo of a mixed-precision solve (refinement iterations,
+        whether it converged or fell back to float64), None otherwise
+    """
+    if hasattr(matrix, "indptr") or hasattr(matrix, "tocsr"):
+        x = solve_sparse(matrix, vector)
+        return (x, None) if return_info else x
+    factorization = LUFactorization(matrix, precision=precision)
+    x = factorization.solve(vector)
+    return (x, factorization.refinement) if return_info else x
+
+
+@_timed("solver.batched_gaussian_elimination")
+def batched_gaussian_elimination(matrices, vectors):
+    """
+    Solve a stack of independent systems A[i] x[i] = b[i] in one vectorized pass.
+
+    Pivot search, row swaps and elimination run across the leading batch
+    axis together, so the Python loop is over the n columns only, not over
+    the systems. Meant for many small systems (3×3 up to ~64×64).
+
+    Args:
+        matrices: (batch, n, n) stack of coefficient matrices
+        vectors: (batch, n) stack of constant vectors, or (batch, n, k)
+
+    Returns:
+        (solutions, singular) where solutions has the shape of vectors and
+        singular is a boolean mask over the batch. Singular members do not
+        raise; their solutions are filled with NaN.
+    """
+    a = np.array(matrices, dtype=float)
+    b = np.array(vectors, dtype=float)
+    if a.ndim != 3 or a.shape[1] != a.shape[2]:
+        raise ValueError("Matrices must have shape (batch, n, n)")
+    if b.shape[:2] != a.shape[:2]:
+        raise ValueError("Vectors must have shape (batch, n) or (batch, n, k)")
+    single_rhs = b.ndim == 2
+    if single_rhs:
+        b = b[:, :, None]
+
+    batch, n = a.shape[:2]
+    members = np.arange(batch)
+    singular = np.zeros(batch, dtype=bool)
+
+    # Forward elimination, one column at a time for the whole batch
+    for j in range(n):
+        p = j + np.argmax(np.abs(a[:, j:, j]), axis=1)
+        a[members, j], a[members, p] = a[members, p], a[members, j].copy()
+        b[members, j], b[members, p] = b[members, p], b[members, j].copy()
+
+        pivot = a[:, j, j]
+        zero = pivot == 0
+        singular |= zero
+        pivot = np.where(zero, 1.0, pivot)
+
+        factors = a[:, j + 1:, j] / pivot[:, None]
+        a[:, j + 1:, j:] -= factors[:, :, None] * a[:, None, j, j:]
+        b[:, j + 1:] -= factors[:, :, None] * b[:, None, j]
+
+    # Back substitution, again across the whole batch
+    diagonal = np.diagonal(a, axis1=1, axis2=2)
+    diagonal = np.where(diagonal == 0, 1.0, diagonal)
+    solutions = np.empty_like(b)
+    for i in range(n - 1, -1, -1):
+        known = np.einsum("bj,bjk->bk", a[:, i, i + 1:], solutions[:, i + 1:])
+        solutions[:, i] = (b[:, i] - known) / diagonal[:, i, None]
+    solutions[singular] = np.nan
+
+    if single_rhs:
+        solutions = solutions[:, :, 0]
+    return solutions, singular
+
+
+@_timed("solver.solve_tridiagonal")
+def solve_tridiagonal(lower, diagonal, upper, vector):
+    """
+    Solve a tridiagonal system in O(n) time and memory.
+
+    With scipy installed this is LAPACK's gtsv (through
+    scipy.linalg.solve_banded), which pivots. Without it the Thomas
+    algorithm runs in Python; that does not pivot, so it is only safe for
+    diagonally dominant (or symmetric positive definite) matrices.
+
+    Args:
+        lower: sub-diagonal, length n - 1
+        diagonal: main diagonal, length n
+        upper: super-diagonal, length n - 1
+        vector: constant vector (b), shape (n,) or (n, k)
+
     Returns:
-        Solution vector x
-    """
-    n = len(matrix)
-    
-    # Create augmented matrix [A|b]
-    augmented = np.column_stack([matrix.astype(float), vector.astype(float)])
-    
-    # Forward elimination (create upper triangular matrix)
+        Solution x with the same shape as b
+    """
+    diagonal = np.asarray(diagonal, dtype=float)
+    ab = np.zeros((3, len(diagonal)))
+    ab[0, 1:], ab[1], ab[2, :-1] = upper, diagonal, lower
+    solution = _lapack_solve_banded((1, 1), ab, vector)
+    if solution is not None:
+        return solution
+    return _thomas(lower, diagonal, upper, vector)
+
+
+def _thomas(lower, diagonal, upper, vector):
+    """Thomas algorithm: solve_tridiagonal without scipy, no pivoting."""
+    vector = np.asarray(vector, dtype=float)
+    if vector.ndim == 2:
+        return np.column_stack([_thomas(lower, diagonal, upper, column) for column in vector.T])
+
+    # Plain Python floats: the recurrence is sequential, and scalar float
+    # arithmetic is much cheaper than indexing into numpy arrays
+    a = np.asarray(lower, dtype=float).tolist()
+    d = np.asarray(diagonal, dtype=float).tolist()
+    c = np.asarray(upper, dtype=float).tolist()
+    b = vector.tolist()
+    n = len(d)
+
+    c_prime = [0.0] * n
+    b_prime = [0.0] * n
     for i in range(n):
-        # Find pivot (optional but improves numerical stability)
-        max_row = i
-        for k in range(i + 1, n):
-            if abs(augmented[k, i]) > abs(augmented[max_row, i]):
-                max_row = k
-        
-        # Swap rows
-        augmented[[i, max_row]] = augmented[[max_row, i]]
-        
-        # Make all rows below this one 0 in current column
-        for k in range(i + 1, n):
-            if augmented[i, i] == 0:
-                raise ValueError("Matrix is singular and cannot be solved")
-            
-            factor = augmented[k, i] / augmented[i, i]
-            augmented[k, i:] -= factor * augmented[i, i:]
-    
-    # Back substitution
-    solution = np.zeros(n)
+        denominator = d[i] - (a[i - 1] * c_prime[i - 1] if i else 0.0)
+        if denominator == 0:
+            raise ValueError("Zero pivot in tridiagonal solve; use solve_banded for pivoting")
+        c_prime[i] = c[i] / denominator if i < n - 1 else 0.0
+        b_prime[i] = (b[i] - (a[i - 1] * b_prime[i - 1] if i else 0.0)) / denominator
+
+    x = [0.0] * n
     for i in range(n - 1, -1, -1):
-        solution[i] = augmented[i, n]
-        for j in range(i + 1, n):
-            solution[i] -= augmented[i, j] * solution[j]
-        solution[i] /= augmented[i, i]
-    
-    return solution
+        x[i] = b_prime[i] - (c_prime[i] * x[i + 1] if i < n - 1 else 0.0)
+    return np.array(x)
+
+
+@_timed("solver.solve_banded")
+def solve_banded(l_and_u, ab, vector):
+    """
+    Gaussian elimination with partial pivoting in band storage, O(n·bw²).
+
+    Uses the same layout as scipy.linalg.solve_banded: ab[upper + i - j, j]
+    holds A[i, j]. With scipy installed the solve is LAPACK's gbsv (gtsv
+    for a tridiagonal band); without it the elimination runs here, one
+    column at a time.
+
+    Args:
+        l_and_u: (lower, upper) number of sub- and super-diagonals
+        ab: (lower + upper + 1, n) banded coefficient matrix
+        vector: constant vector (b), shape (n,) or (n, k)
+
+    Returns:
+        Solution x with the same shape as b
+    """
+    lower, upper = l_and_u
+    ab = np.asarray(ab, dtype=float)
+    if ab.shape[0] != lower + upper + 1:
+        raise ValueError("ab must have lower + upper + 1 rows")
+    solution = _lapack_solve_banded((lower, upper), ab, vector)
+    if solution is not None:
+        return solution
+    return _banded_elimination(lower, upper, ab, vector)
+
+
+def _lapack_solve_banded(l_and_u, ab, vector):
+    """scipy.linalg.solve_banded on float input, or None when scipy is not installed."""
+    try:
+        from scipy.linalg import LinAlgError
+        from scipy.linalg import solve_banded as scipy_solve_banded
+    except ImportError:
+        return None
+    try:
+        return scipy_solve_banded(l_and_u, ab, np.asarray(vector, dtype=float))
+    except LinAlgError as e:
+        raise ValueError("Matrix is singular and cannot be solved") from e
+
+
+def _banded_elimination(lower, upper, ab, vector):
+    """
+    solve_banded without scipy. Pivoting can widen the upper band to
+    lower + upper, so the work array has 2·lower + upper + 1 rows; memory
+    stays O(n·bw).
+    """
+    n = ab.shape[1]
+    kv = lower + upper
+
+    # work[kv + i - j, j] = A[i, j]
+    work = np.zeros((lower + kv + 1, n))
+    work[lower:] = ab
+    b = np.array(vector, dtype=float)
+
+    # Row r below the pivot and column t to its right live at band row kv + r - t,
+    # whatever the step; precompute those offsets once
+    offsets = np.arange(kv + 1)
+    update_rows = kv + np.arange(1, lower + 1)[:, None] - offsets[None, 1:]
+
+    for j in range(n):
+        m = min(lower, n - 1 - j)
+        t = min(kv, n - 1 - j)
+        cols = j + offsets[:t + 1]
+
+        p = int(np.argmax(np.abs(work[kv:kv + m + 1, j])))
+        if work[kv + p, j] == 0:
+            raise ValueError("Matrix is singular and cannot be solved")
+        if p:
+            rows_j = kv - offsets[:t + 1]
+            work[rows_j, cols], work[rows_j + p, cols] = work[rows_j + p, cols], work[rows_j, cols].copy()
+            b[[j, j + p]] = b[[j + p, j]]
+
+        if m:
+            factors = work[kv + 1:kv + m + 1, j] / work[kv, j]
+            if t:
+                pivot_row = work[kv - offsets[1:t + 1], cols[1:]]
+                work[update_rows[:m, :t], cols[None, 1:]] -= np.outer(factors, pivot_row)
+            b[j + 1:j + m + 1] -= np.multiply.outer(factors, b[j])
+
+    # Back substitution against the (lower + upper)-wide upper band
+    for j in range(n - 1, -1, -1):
+        t = min(kv, n - 1 - j)
+        row = work[kv - offsets[1:t + 1], j + offsets[1:t + 1]]
+        b[j] = (b[j] - row @ b[j + 1:j + t + 1]) / work[kv, j]
+    return b
+
+
+def _csr_parts(matrix):
+    """(data, indices, indptr, n) from a CSR matrix or a (data, indices, indptr) tuple."""
+    if isinstance(matrix, tuple):
+        data, indices, indptr = (np.asarray(part) for part in matrix)
+    else:
+        if not hasattr(matrix, "indptr"):
+            matrix = matrix.tocsr()
+        if matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("Matrix must be square")
+        data, indices, indptr = matrix.data, matrix.indices, matrix.indptr
+    return np.asarray(data, dtype=float), indices, indptr, len(indptr) - 1
+
+
+@_timed("solver.solve_sparse")
+def solve_sparse(matrix, vector):
+    """
+    Solve A x = b for a sparse A without ever forming the dense matrix.
+
+    The bandwidth is read off the CSR structure in O(nnz), then:
+    - tridiagonal and diagonally dominant: solve_tridiagonal
+    - narrow band: banded elimination with partial pivoting
+    - anything else: sparse LU with a COLAMD fill-reducing column
+      ordering (needs scipy)
+
+    Memory scales with the number of nonzeros (times the bandwidth on the
+    banded path), not with n².
+
+    Args:
+        matrix: CSR matrix (e.g. scipy.sparse.csr_matrix, or any scipy sparse
+            format) or a (data, indices, indptr) tuple
+        vector: constant vector (b), shape (n,) or (n, k)
+
+    Returns:
+        Solution x with the same shape as b
+    """
+    data, indices, indptr, n = _csr_parts(matrix)
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    offsets = indices - rows
+    lower = max(0, -int(offsets.min())) if len(offsets) else 0
+    upper = max(0, int(offsets.max())) if len(offsets) else 0
+
+    if lower <= 1 and upper <= 1:
+        bands = np.zeros((3, n))
+        np.add.at(bands, (1 - offsets, indices), data)
+        sup, diagonal, sub = bands[0, 1:], bands[1], bands[2, :-1]
+        off_diagonal = np.abs(np.r_[0.0, sub]) + np.abs(np.r_[sup, 0.0])
+        if np.all(np.abs(diagonal) >= off_diagonal) and np.all(diagonal != 0):
+            return solve_tridiagonal(sub, diagonal, sup, vector)
+
+    if (2 * lower + upper + 1) * n <= BANDED_FILL_LIMIT * max(len(data), n):
+        ab = np.zeros((lower + upper + 1, n))
+        np.add.at(ab, (upper - offsets, indices), data)
+        return solve_banded((lower, upper), ab, vector)
+
+    try:
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.linalg import splu
+    except ImportError as e:
+        raise ImportError("General sparse systems need scipy for sparse LU (pip install scipy)") from e
+    csc = csr_matrix((data, indices, indptr), shape=(n, n)).tocsc()
+    try:
+        factors = splu(csc, permc_spec="COLAMD")
+    except RuntimeError as e:
+        raise ValueError("Matrix is singular and cannot be solved") from e
+    return factors.solve(np.asarray(vector, dtype=float))
 
 
 # Example usage
@@ -52,16 +639,23 @@ if __name__ == "__main__":
     # 2x + y - z = 8
     # -3x - y + 2z = -11
     # -2x + y + 2z = -3
-    
+
     A = np.array([
         [2123, 11221, -11213],
         [-3033, -11221, 212121],
         [-2678, 11345, 21212]
     ])
-    
+
     b = np.array([8, -11, -3])
-    
+
     solution = gaussian_elimination(A, b)
     print("Solution (x, y, z):", solution)
     print("Verification A @ x =", A @ solution)
     print("Expected b =", b)
+
+    # The same system stacked with a singular one, solved in one batched call
+    solutions, singular = batched_gaussian_elimination(
+        np.stack([A, np.ones((3, 3))]), np.stack([b, b])
+    )
+    print("Batched solutions:", solutions)
+    print("Singular members:", singular)
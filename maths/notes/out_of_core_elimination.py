@@ -0,0 +1,140 @@
+"""
+Out-of-core LU factorization for matrices larger than RAM.
+
+The matrix stays on disk as a numpy.memmap (or a .npy file opened as
+one) and is factored in place, one column panel at a time, left-looking:
+
+    for each panel j:
+        read panel j into memory
+        for each earlier panel k:
+            apply panel k's row interchanges to panel j
+            U[k, j] = L[k, k]⁻¹ A[k, j]
+            A[below k, j] -= L[below k, k] U[k, j]   (L[below k, k] streamed in row chunks)
+        factor panel j with partial pivoting and write it back
+
+Only one panel plus one chunk of an earlier panel are resident at a time,
+so memory_budget bounds the working set whatever the size of the matrix.
+Row interchanges are kept per panel instead of being applied back to the
+earlier L columns, which would mean rewriting the whole file; the solve
+replays them in order.
+"""
+
+import os
+
+import numpy as np
+
+from gausianelimination import _factor_panel, _permute_rows, _solve_unit_lower, _solve_upper
+
+# Bytes of matrix data kept in memory at once (panel + streamed chunk)
+DEFAULT_MEMORY_BUDGET = 1 << 30
+
+# Wider panels mean fewer passes over the file, but a slower unblocked panel loop
+MAX_PANEL_WIDTH = 1024
+
+
+def _open_matrix(matrix):
+    """Memmap a .npy path for in-place updates, or check an array/memmap given directly."""
+    if isinstance(matrix, (str, os.PathLike)):
+        matrix = np.load(matrix, mmap_mode="r+")
+    if matrix.dtype != np.float64:
+        raise ValueError("Out-of-core factorization works in place and needs a float64 matrix")
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Matrix must be square")
+    return matrix
+
+
+def _row_chunks(start, stop, rows_per_chunk):
+    for r0 in range(start, stop, rows_per_chunk):
+        yield r0, min(r0 + rows_per_chunk, stop)
+
+
+class OutOfCoreLU:
+    """
+    LU factorization of an on-disk matrix with bounded resident memory.
+
+    The matrix is overwritten with its factors, like LAPACK's getrf.
+
+    Args:
+        matrix: n×n float64 numpy.memmap, or the path of a .npy file
+        memory_budget: bytes of matrix data to keep in memory at once
+    """
+
+    def __init__(self, matrix, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.a = _open_matrix(matrix)
+        self.memory_budget = memory_budget
+        n = self.n
+        itemsize = self.a.itemsize
+
+        # Half the budget for the panel, the rest for streamed chunks
+        self.panel_width = int(max(1, min(MAX_PANEL_WIDTH, n, memory_budget // (2 * max(n, 1) * itemsize))))
+        self.chunk_rows = int(max(1, (memory_budget - n * self.panel_width * itemsize)
+                                  // (self.panel_width * itemsize)))
+        self.panels = [(k0, min(k0 + self.panel_width, n)) for k0 in range(0, n, self.panel_width)]
+        self.orders = []
+        self._factor()
+
+    @property
+    def n(self):
+        return self.a.shape[0]
+
+    def _factor(self):
+        a, n = self.a, self.n
+        for j0, j1 in self.panels:
+            panel = np.array(a[:, j0:j1])
+
+            # Bring panel j up to date with every earlier panel
+            for (k0, k1), order in zip(self.panels, self.orders):
+                _permute_rows(panel[k0:], order)
+                _solve_unit_lower(np.array(a[k0:k1, k0:k1]), panel[k0:k1], k1 - k0)
+                for r0, r1 in _row_chunks(k1, n, self.chunk_rows):
+                    panel[r0:r1] -= a[r0:r1, k0:k1] @ panel[k0:k1]
+
+            self.orders.append(_factor_panel(panel[j0:], 0, j1 - j0))
+            a[:, j0:j1] = panel
+
+        if isinstance(a, np.memmap):
+            a.flush()
+
+    def solve(self, vector):
+        """
+        Solve A x = b against the on-disk factors.
+
+        Args:
+            vector: constant vector (b), shape (n,) or (n, k), held in memory
+
+        Returns:
+            Solution x with the same shape as b
+        """
+        a, n = self.a, self.n
+        b = np.array(vector, dtype=float)
+        if b.shape[0] != n:
+            raise ValueError(f"Right-hand side has {b.shape[0]} rows, expected {n}")
+
+        # Forward: replay each panel's interchanges, then its L block
+        for (k0, k1), order in zip(self.panels, self.orders):
+            _permute_rows(b[k0:], order)
+            _solve_unit_lower(np.array(a[k0:k1, k0:k1]), b[k0:k1], k1 - k0)
+            for r0, r1 in _row_chunks(k1, n, self.chunk_rows):
+                b[r0:r1] -= a[r0:r1, k0:k1] @ b[k0:k1]
+
+        # Backward: U is final, solve bottom panel up
+        for k0, k1 in reversed(self.panels):
+            _solve_upper(np.array(a[k0:k1, k0:k1]), b[k0:k1], k1 - k0)
+            for r0, r1 in _row_chunks(0, k0, self.chunk_rows):
+                b[r0:r1] -= a[r0:r1, k0:k1] @ b[k0:k1]
+        return b
+
+
+def out_of_core_gaussian_elimination(matrix, vector, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Solve A x = b for an on-disk A, overwriting A with its LU factors.
+
+    Args:
+        matrix: n×n float64 numpy.memmap, or the path of a .npy file
+        vector: constant vector (b)
+        memory_budget: bytes of matrix data to keep in memory at once
+
+    Returns:
+        Solution vector x
+    """
+    return OutOfCoreLU(matrix, memory_budget).solve(vector)
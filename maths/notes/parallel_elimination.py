@@ -0,0 +1,170 @@
+"""
+Multi-core blocked LU factorization.
+
+The matrix is cut into block_size × block_size tiles. Each elimination
+step k becomes a small task graph:
+
+    panel(k)        factor the column panel k with partial pivoting
+    swap_trsm(k, j) apply panel k's row interchanges to column block j,
+                    then U[k, j] = L[k, k]⁻¹ A[k, j]
+    gemm(k, i, j)   A[i, j] -= L[i, k] U[k, j]
+
+and a scheduler runs every task as soon as the tasks it depends on are
+done, on a thread pool (numpy drops the GIL inside BLAS) or on a process
+pool sharing the matrix through multiprocessing.shared_memory. Panel
+k + 1 only waits for its own column of step k, so it overlaps with the
+rest of the step k update (lookahead).
+
+Keep the BLAS library single-threaded (e.g. OMP_NUM_THREADS=1) when using
+several workers, or the two levels of threading fight over the cores.
+"""
+
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from gausianelimination import _factor_panel, _permute_rows, _solve_unit_lower
+
+DEFAULT_PARALLEL_BLOCK_SIZE = 256
+
+# Matrix shared with the current worker process (process pool only)
+_worker_matrix = None
+
+
+def _panel_task(a, k0, k1):
+    return _factor_panel(a, k0, k1)
+
+
+def _swap_trsm_task(a, k0, k1, j0, j1, order):
+    block = a[k0:, j0:j1]
+    _permute_rows(block, order)
+    _solve_unit_lower(a[k0:k1, k0:k1], block[:k1 - k0], k1 - k0)
+
+
+def _gemm_task(a, i0, i1, j0, j1, k0, k1):
+    a[i0:i1, j0:j1] -= a[i0:i1, k0:k1] @ a[k0:k1, j0:j1]
+
+
+def _attach_shared_matrix(name, shape, dtype):
+    global _worker_matrix
+    segment = shared_memory.SharedMemory(name=name)
+    # Keep the segment object alive as long as the array view on it
+    _worker_matrix = (segment, np.ndarray(shape, dtype=dtype, buffer=segment.buf))
+
+
+def _run_in_worker(task, *args):
+    return task(_worker_matrix[1], *args)
+
+
+class _TaskGraph:
+    """Dependency-counting scheduler: submits tasks to an executor as they become ready."""
+
+    def __init__(self):
+        self.tasks = {}
+        self.dependents = {}
+        self.waiting_on = {}
+
+    def add(self, key, priority, task, args, deps=()):
+        deps = [d for d in deps if d in self.tasks]
+        self.tasks[key] = (priority, task, args)
+        self.waiting_on[key] = len(deps)
+        for dep in deps:
+            self.dependents.setdefault(dep, []).append(key)
+
+    def run(self, submit, on_done):
+        ready = [(self.tasks[key][0], key) for key, count in self.waiting_on.items() if count == 0]
+        heapq.heapify(ready)
+        running = {}
+
+        while ready or running:
+            while ready:
+                _, key = heapq.heappop(ready)
+                _, task, args = self.tasks[key]
+                running[submit(task, *args(key))] = key
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = running.pop(future)
+                try:
+                    on_done(key, future.result())
+                except BaseException:
+                    for pending in running:
+                        pending.cancel()
+                    raise
+                for dependent in self.dependents.get(key, ()):
+                    self.waiting_on[dependent] -= 1
+                    if self.waiting_on[dependent] == 0:
+                        heapq.heappush(ready, (self.tasks[dependent][0], dependent))
+
+
+def parallel_lu_factor(matrix, block_size=DEFAULT_PARALLEL_BLOCK_SIZE, workers=None, executor="thread",
+                       dtype=np.float64):
+    """
+    Tiled LU factorization with partial pivoting on a pool of workers.
+
+    Args:
+        matrix: n×n coefficient matrix (A)
+        block_size: tile edge length
+        workers: pool size (defaults to os.cpu_count())
+        executor: "thread" or "process"
+        dtype: floating-point type to factor in
+
+    Returns:
+        (lu, perm) in the same format as gausianelimination.lu_factor
+    """
+    a = np.array(matrix, dtype=dtype)
+    if a.ndim != 2 or a.shape[0] != a.shape[1]:
+        raise ValueError("Matrix must be square")
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown executor: {executor!r} (use 'thread' or 'process')")
+    n = a.shape[0]
+    workers = workers or os.cpu_count() or 1
+    bounds = [(k0, min(k0 + block_size, n)) for k0 in range(0, n, block_size)]
+    nblocks = len(bounds)
+    orders = {}
+
+    graph = _TaskGraph()
+    for k in range(nblocks):
+        k0, k1 = bounds[k]
+        # Priorities favour the critical path: earlier steps first, panels before updates
+        graph.add(("panel", k), (k, 0, 0), _panel_task, lambda key: bounds[key[1]],
+                  [("gemm", k - 1, i, k) for i in range(k, nblocks)])
+        for j in range(k + 1, nblocks):
+            graph.add(("trsm", k, j), (k, 1, j), _swap_trsm_task,
+                      lambda key: (*bounds[key[1]], *bounds[key[2]], orders[key[1]]),
+                      [("panel", k)] + [("gemm", k - 1, i, j) for i in range(k, nblocks)])
+            for i in range(k + 1, nblocks):
+                graph.add(("gemm", k, i, j), (k, 2, j), _gemm_task,
+                          lambda key: (*bounds[key[2]], *bounds[key[3]], *bounds[key[1]]),
+                          [("trsm", k, j)])
+
+    def on_done(key, result):
+        if key[0] == "panel":
+            orders[key[1]] = result
+
+    if executor == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            graph.run(lambda task, *args: pool.submit(task, a, *args), on_done)
+    else:
+        segment = shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1))
+        try:
+            shared = np.ndarray(a.shape, dtype=a.dtype, buffer=segment.buf)
+            shared[...] = a
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared_matrix,
+                                     initargs=(segment.name, a.shape, a.dtype)) as pool:
+                graph.run(lambda task, *args: pool.submit(_run_in_worker, task, *args), on_done)
+            a[...] = shared
+            del shared
+        finally:
+            segment.close()
+            segment.unlink()
+
+    # Row interchanges of each panel still have to reach the L columns left of it
+    perm = np.arange(n)
+    for k, (k0, _) in enumerate(bounds):
+        _permute_rows(a[k0:, :k0], orders[k])
+        _permute_rows(perm[k0:], orders[k])
+    return a, perm
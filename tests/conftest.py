@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the tracker tests
+The tracker modules live at the repository root, the solver notes under maths/notes
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+for path in (ROOT, ROOT / "maths" / "notes"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def data_file(request, tmp_path) -> Path:
+    """A fresh tracker data file, once per storage backend"""
+    return tmp_path / ("tracker.db" if request.param == "sqlite" else "tracker.json")
+
+
+@pytest.fixture
+def tracker(data_file):
+    from complete_math_tracker import CompleteMathTracker
+    tracker = CompleteMathTracker(str(data_file))
+    yield tracker
+    tracker.storage.close()
@@ -0,0 +1,103 @@
+"""
+tracker.batch() and bulk_update_mastery: one write per batch and no full rescans,
+and nothing written or kept in memory when the batch fails
+"""
+
+import copy
+
+import pytest
+
+from complete_math_tracker import CompleteMathTracker, MathConcept, ResearchProject
+
+
+def concept(name, phase=1, mastery=0, prerequisites=()) -> MathConcept:
+    return MathConcept(name=name, phase=phase, module=f"Phase {phase} Module 0", difficulty=3,
+                       prerequisites=list(prerequisites), mastery_level=mastery, time_invested=0)
+
+
+def project(title) -> ResearchProject:
+    return ResearchProject(title=title, phase=8, start_date="2026-03-01", status="planning",
+                           collaborators=[], abstract="", milestones=[], publications=[])
+
+
+def state(tracker: CompleteMathTracker) -> dict:
+    return copy.deepcopy({**tracker.data, "concepts": tracker.data["concepts"].to_dict()})
+
+
+@pytest.fixture
+def seeded(tracker):
+    tracker.add_concepts([concept(f"c{i}", phase=1 + i % 3, prerequisites=[f"c{i - 1}"] if i else [])
+                          for i in range(10)])
+    return tracker
+
+
+def spy(monkeypatch, tracker, name) -> list:
+    """Count calls to a tracker or storage method"""
+    owner = tracker.storage if name == "write" else tracker
+    calls, method = [], getattr(owner, name)
+    monkeypatch.setattr(owner, name, lambda *args: calls.append(args) or method(*args))
+    return calls
+
+
+def test_bulk_update_writes_once_without_rescans(seeded, monkeypatch, data_file):
+    writes = spy(monkeypatch, seeded, "write")
+    rescans = spy(monkeypatch, seeded, "_compute_phase_stats")
+
+    seeded.bulk_update_mastery([(f"c{i}", 5, 10) for i in range(6)])
+    assert len(writes) == 1
+    assert rescans == []
+    assert seeded.data["phase_progress"]["1"] == pytest.approx(10 / 20)
+
+    reloaded = CompleteMathTracker(str(data_file))
+    assert state(reloaded) == state(seeded)
+    assert sum(1 for _ in reloaded.study_log) == 6
+    reloaded.storage.close()
+
+
+def test_update_outside_a_batch_recomputes_progress(seeded, monkeypatch):
+    recomputes = spy(monkeypatch, seeded, "_update_phase_progress")
+    seeded.update_mastery("c0", 5, 10)
+    seeded.update_mastery("c3", 5, 10)
+    assert len(recomputes) == 2
+    assert seeded.data["phase_progress"]["1"] == pytest.approx(10 / 20)
+
+
+def test_nested_batches_write_once_at_the_outer_end(seeded, monkeypatch):
+    writes = spy(monkeypatch, seeded, "write")
+    with seeded.batch():
+        seeded.update_mastery("c0", 4, 10)
+        with seeded.batch():
+            seeded.update_mastery("c1", 4, 10)
+            seeded.add_research_project(project("Spectral gaps"))
+        assert writes == []
+    assert len(writes) == 1
+    assert [p["title"] for p in seeded.data["research_projects"]] == ["Spectral gaps"]
+
+
+def test_failed_batch_rolls_back_memory_and_writes_nothing(seeded, monkeypatch, data_file):
+    seeded.update_mastery("c2", 3, 20)
+    seeded.add_research_project(project("Spectral gaps"))
+    before = state(seeded)
+    frontier = seeded._graph.next_concepts()
+    due = seeded.reviews_due("2100-01-01")
+    events = sum(1 for _ in seeded.study_log)
+    writes = spy(monkeypatch, seeded, "write")
+
+    with pytest.raises(KeyError):
+        with seeded.batch():
+            seeded.bulk_update_mastery([("c0", 5, 30), ("c2", 1, 5)])
+            seeded.add_concept(concept("c10", phase=3, mastery=5, prerequisites=["c9"]))
+            seeded.add_concepts([concept("c11", phase=2), concept("c0", phase=3, prerequisites=["c11"])])
+            seeded.add_research_project(project("Random matrices"))
+            seeded.data["concepts"]["missing"]  # fails after every kind of change
+
+    assert writes == []
+    assert state(seeded) == before
+    assert seeded._graph.next_concepts() == frontier
+    assert seeded.reviews_due("2100-01-01") == due
+    assert seeded.phase_stats_consistent()
+    assert sum(1 for _ in seeded.study_log) == events
+
+    reloaded = CompleteMathTracker(str(data_file))
+    assert state(reloaded) == before
+    reloaded.storage.close()
@@ -0,0 +1,161 @@
+"""
+Two trackers on one data file: a stale writer rebases onto what the other stored,
+adopting just those entries, and nobody's update is lost
+"""
+
+import multiprocessing
+
+import pytest
+
+from benchmarks.stress_concurrent_writers import concept_names, writer
+from complete_math_tracker import CompleteMathTracker, MathConcept, ResearchProject
+from tracker_storage import ChangeSet, JsonStorage, SqliteStorage, StaleDataError
+
+
+def concept(name, phase=1, mastery=0, prerequisites=()) -> MathConcept:
+    return MathConcept(name=name, phase=phase, module=f"Phase {phase} Module 0", difficulty=3,
+                       prerequisites=list(prerequisites), mastery_level=mastery, time_invested=0)
+
+
+def same_as_disk(tracker: CompleteMathTracker, data_file) -> bool:
+    """The tracker's data and indexes match a fresh load of the file"""
+    fresh = CompleteMathTracker(str(data_file))
+    try:
+        return (tracker.data["concepts"].to_dict() == fresh.data["concepts"].to_dict()
+                and tracker.data["phase_progress"] == fresh.data["phase_progress"]
+                and tracker.data["spaced_repetition"] == fresh.data["spaced_repetition"]
+                and tracker.data["research_projects"] == fresh.data["research_projects"]
+                and tracker.phase_stats_consistent()
+                and set(tracker._graph.next_concepts()) == set(fresh._graph.next_concepts())
+                and tracker.reviews_due("2100-01-01") == fresh.reviews_due("2100-01-01"))
+    finally:
+        fresh.storage.close()
+
+
+@pytest.fixture
+def writers(data_file):
+    first = CompleteMathTracker(str(data_file))
+    first.add_concepts([concept("limits", mastery=4), concept("derivatives", prerequisites=["limits"]),
+                        concept("integrals", phase=2, prerequisites=["derivatives"])])
+    second = CompleteMathTracker(str(data_file))
+    yield first, second
+    first.storage.close()
+    second.storage.close()
+
+
+def test_stale_writer_rebases_and_adopts(writers, data_file):
+    first, second = writers
+    first.update_mastery("derivatives", 5, 30)
+    first.add_concept(concept("series", phase=2, prerequisites=["integrals"]))
+
+    second.update_mastery("limits", 3, 10)  # stale: must keep first's changes and take them in
+    assert second.data["concepts"]["derivatives"]["mastery_level"] == 5
+    assert "series" in second.data["concepts"]
+    assert second._graph.next_concepts() == ["limits", "integrals"]
+    assert second.data["phase_progress"]["1"] == pytest.approx(8 / 10)
+    assert same_as_disk(second, data_file)
+
+    first.add_research_project(ResearchProject(title="Heat kernels", phase=7, start_date="2026-01-05",
+                                               status="active", collaborators=[], abstract="",
+                                               milestones=[], publications=[]))
+    second.add_concepts([concept("sequences", phase=2, mastery=2)])
+    assert [p["title"] for p in second.data["research_projects"]] == ["Heat kernels"]
+    assert same_as_disk(second, data_file)
+
+    first.update_mastery("integrals", 1, 5)  # first catches up on its next write
+    assert first.data["concepts"]["limits"]["mastery_level"] == 3
+    assert same_as_disk(first, data_file)
+
+
+def test_conflicting_updates_to_one_concept(writers, data_file):
+    first, second = writers
+    first.update_mastery("integrals", 2, 10)
+    second.update_mastery("integrals", 5, 20)  # the later write wins the concept, totals stay right
+    assert second.data["concepts"]["integrals"]["mastery_level"] == 5
+    assert same_as_disk(second, data_file)
+    events = [event for event in second.study_log if event.get("concept") == "integrals"]
+    assert len(events) == 2
+
+
+def test_json_generation_detects_same_size_rewrites(tmp_path):
+    path = tmp_path / "tracker.json"
+    JsonStorage(path).save({"concepts": {}, "phase_progress": {"1": 0.1}})
+    stale, other = JsonStorage(path), JsonStorage(path)
+    stale.load()
+    other.load()
+    other.write({"concepts": {}, "phase_progress": {"1": 0.2}}, ChangeSet().replace("phase_progress"))
+    with pytest.raises(StaleDataError):  # same size, possibly same inode and mtime: still a new version
+        stale.write({"concepts": {}, "phase_progress": {"1": 0.3}}, ChangeSet().replace("phase_progress"))
+    assert JsonStorage(path).load()["phase_progress"] == {"1": 0.2}
+
+
+def test_sqlite_rebase_reads_only_the_logged_rows(tmp_path, monkeypatch):
+    data_file = tmp_path / "tracker.db"
+    first = CompleteMathTracker(str(data_file))
+    first.add_concepts([concept(f"c{i}", phase=1 + i % 9) for i in range(300)])
+    second = CompleteMathTracker(str(data_file))
+    first.update_mastery("c7", 5, 10)
+
+    loads = []
+    load_all = SqliteStorage._load_all
+    monkeypatch.setattr(SqliteStorage, "_load_all", lambda self: loads.append(1) or load_all(self))
+    second.update_mastery("c8", 4, 10)
+    assert loads == []
+    assert second.data["concepts"]["c7"]["mastery_level"] == 5
+    assert same_as_disk(second, data_file)
+
+
+@pytest.mark.parametrize("limits, full_reload", [
+    ({"CHANGELOG_GENERATIONS": 2}, True),  # the log no longer reaches back: everything is compared
+    ({"CHANGELOG_KEYS": 3}, False),        # big writes log whole sections: just those are read
+])
+def test_sqlite_rebase_past_the_change_log(tmp_path, monkeypatch, limits, full_reload):
+    for name, value in limits.items():
+        monkeypatch.setattr(SqliteStorage, name, value)
+    loads = []
+    load_all = SqliteStorage._load_all
+    monkeypatch.setattr(SqliteStorage, "_load_all", lambda self: loads.append(1) or load_all(self))
+    data_file = tmp_path / "tracker.db"
+    first = CompleteMathTracker(str(data_file))
+    first.add_concepts([concept(f"c{i}") for i in range(5)])
+    second = CompleteMathTracker(str(data_file))
+
+    first.add_concepts([concept(f"d{i}", phase=2, mastery=4) for i in range(10)])
+    for i in range(5):
+        first.update_mastery(f"c{i}", 5, 10)
+    loads.clear()
+    second.update_mastery("c0", 1, 5)
+    assert bool(loads) == full_reload
+    assert len(second.data["concepts"]) == 15
+    assert second.data["concepts"]["c4"]["mastery_level"] == 5
+    assert same_as_disk(second, data_file)
+
+
+def test_parallel_writers_lose_nothing(data_file):
+    workers, per_worker, updates = 4, 3, 15
+    tracker = CompleteMathTracker(str(data_file))
+    tracker.add_concepts([concept(name, phase=1 + worker) for worker in range(workers)
+                          for name in concept_names(worker, per_worker)])
+    tracker.storage.close()
+
+    context = multiprocessing.get_context("fork")
+    barrier, results = context.Barrier(workers), context.Queue()
+    processes = [context.Process(target=writer, args=(str(data_file), worker, per_worker, updates, False, 0,
+                                                      barrier, results))
+                 for worker in range(workers)]
+    for process in processes:
+        process.start()
+    expected = {}
+    for _ in processes:
+        expected.update(results.get(timeout=60))
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    final = CompleteMathTracker(str(data_file))
+    for name, (level, minutes) in expected.items():
+        assert final.data["concepts"][name]["mastery_level"] == level
+        assert final.data["concepts"][name]["time_invested"] == minutes
+    assert sum(1 for _ in final.study_log) == workers * updates
+    assert final.phase_stats_consistent()
+    final.storage.close()
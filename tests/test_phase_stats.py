@@ -0,0 +1,149 @@
+"""
+Running per-phase totals and the prerequisite frontier, checked against full recomputes
+after every kind of mutation
+"""
+
+import copy
+
+import pytest
+
+from complete_math_tracker import MASTERY_THRESHOLD, CompleteMathTracker, MathConcept
+from tracker_graph import PrerequisiteCycleError, PrerequisiteGraph
+
+
+def concept(name, phase=1, mastery=0, prerequisites=(), minutes=0) -> MathConcept:
+    return MathConcept(name=name, phase=phase, module=f"Phase {phase} Module 0", difficulty=3,
+                       prerequisites=list(prerequisites), mastery_level=mastery, time_invested=minutes)
+
+
+def expected_frontier(concepts) -> set:
+    """Unmastered concepts whose prerequisites are all mastered concepts, by brute force"""
+    mastered = {name for name, c in concepts.items() if c["mastery_level"] >= MASTERY_THRESHOLD}
+    return {name for name, c in concepts.items()
+            if name not in mastered and all(prereq in mastered for prereq in c["prerequisites"])}
+
+
+def assert_consistent(tracker: CompleteMathTracker):
+    """The running totals and the graph index match what a full rescan of the concepts gives"""
+    concepts = tracker.data["concepts"]
+    assert tracker.phase_stats_consistent()
+    assert set(tracker._graph.next_concepts()) == expected_frontier(concepts)
+    assert tracker.get_current_recommendations()["next_concepts"] == tracker._graph.next_concepts()
+
+    fresh = PrerequisiteGraph.from_concepts(concepts, MASTERY_THRESHOLD)
+    assert graph_state(tracker._graph) == graph_state(fresh)
+    assert tracker._graph.frontier == fresh.frontier
+
+
+def graph_state(graph: PrerequisiteGraph) -> dict:
+    """Per concept id: tracked, mastered, unmet count and dependents (in any order)"""
+    return {concept_id: (graph.tracked[concept_id], graph.mastered[concept_id], graph.unmet[concept_id],
+                         sorted(graph.dependents[concept_id] or ()))
+            for concept_id in range(len(graph.tracked))
+            if graph.tracked[concept_id] or graph.dependents[concept_id]}
+
+
+def assert_progress(tracker: CompleteMathTracker):
+    """Stored phase progress is each phase's mastery sum over its maximum"""
+    for phase in range(1, 10):
+        members = [c for c in tracker.data["concepts"].values() if c["phase"] == phase]
+        if members:
+            expected = sum(c["mastery_level"] for c in members) / (5 * len(members))
+            assert tracker.data["phase_progress"][str(phase)] == pytest.approx(expected)
+
+
+def test_add_concept_counts_and_indexes(tracker):
+    tracker.add_concept(concept("limits", mastery=4, minutes=60))
+    assert_consistent(tracker)
+    assert tracker._graph.next_concepts() == []
+
+    tracker.add_concept(concept("derivatives", prerequisites=["limits"]))
+    tracker.add_concept(concept("integrals", phase=2, prerequisites=["derivatives"]))
+    assert_consistent(tracker)
+    assert tracker._graph.next_concepts() == ["derivatives"]
+    assert tracker._phase_stats[1].concepts == 2
+    assert tracker._phase_stats[1].time_invested == 60
+
+    dangling = tracker.add_concept(concept("series", phase=2, prerequisites=["sequences"]))
+    assert dangling == ["sequences"]
+    assert_consistent(tracker)
+    assert "series" not in tracker._graph.next_concepts()
+
+
+def test_update_mastery_moves_the_frontier(tracker):
+    for c in [concept("limits", mastery=4), concept("derivatives", prerequisites=["limits"]),
+              concept("integrals", phase=2, prerequisites=["derivatives"])]:
+        tracker.add_concept(c)
+
+    tracker.update_mastery("derivatives", 5, 30)
+    assert_consistent(tracker)
+    assert_progress(tracker)
+    assert tracker._graph.next_concepts() == ["integrals"]
+    assert tracker._phase_stats[1].mastered == 2
+
+    tracker.update_mastery("limits", 1, 10)  # forgotten: back on the frontier
+    assert_consistent(tracker)
+    assert_progress(tracker)
+    assert tracker._graph.next_concepts() == ["limits", "integrals"]
+    assert tracker._phase_stats[1].mastery_sum == 6
+    assert tracker._phase_stats[1].time_invested == 40
+
+
+def test_add_concepts_skips_cycles(tracker):
+    tracker.add_concept(concept("limits", mastery=4))
+    tracker.add_concept(concept("derivatives", prerequisites=["limits"]))
+
+    rejected = tracker.add_concepts([
+        concept("integrals", phase=2, mastery=2, prerequisites=["derivatives"]),
+        concept("limits", prerequisites=["integrals"]),  # limits -> integrals -> derivatives -> limits
+        concept("series", phase=2, mastery=5, prerequisites=["limits"]),
+    ])
+    assert [c.name for c, _ in rejected] == ["limits"]
+    assert tracker.data["concepts"]["limits"]["prerequisites"] == []
+    assert tracker.data["concepts"]["limits"]["mastery_level"] == 4
+    assert_consistent(tracker)
+    assert_progress(tracker)
+    assert tracker.data["phase_progress"]["2"] == pytest.approx(7 / 10)
+
+    tracker.add_concept(concept("sequences", phase=2, prerequisites=["reals"]))  # reals is no concept yet
+    with pytest.raises(PrerequisiteCycleError):
+        tracker.add_concept(concept("reals", prerequisites=["sequences"]))
+    assert "reals" not in tracker.data["concepts"]
+    assert_consistent(tracker)
+
+
+def test_rolled_back_batch_restores_totals_and_graph(tracker):
+    tracker.add_concept(concept("limits", mastery=4))
+    tracker.add_concept(concept("derivatives", prerequisites=["limits"]))
+    tracker.update_mastery("derivatives", 2, 15)
+    before = (tracker.data["concepts"].to_dict(), dict(tracker.data["phase_progress"]),
+              tracker._graph.next_concepts(), copy.deepcopy(tracker._phase_stats))
+
+    with pytest.raises(RuntimeError):
+        with tracker.batch():
+            tracker.add_concept(concept("integrals", phase=2, prerequisites=["derivatives"]))
+            tracker.update_mastery("derivatives", 5, 30)
+            tracker.update_mastery("limits", 0, 5)
+            tracker.add_concepts([concept("series", phase=2, mastery=5), concept("limits", phase=3, mastery=1)])
+            assert_consistent(tracker)
+            raise RuntimeError("abort")
+
+    after = (tracker.data["concepts"].to_dict(), dict(tracker.data["phase_progress"]),
+             tracker._graph.next_concepts(), tracker._phase_stats)
+    assert after == before
+    assert_consistent(tracker)
+    assert_progress(tracker)
+
+
+def test_totals_survive_a_reload(tracker, data_file):
+    tracker.add_concepts([concept(f"c{i}", phase=1 + i % 9, mastery=i % 6, minutes=i,
+                                  prerequisites=[f"c{i - 1}"] if i % 3 else [])
+                          for i in range(60)])
+    tracker.update_mastery("c7", 4, 20)
+
+    reloaded = CompleteMathTracker(str(data_file))
+    assert_consistent(reloaded)
+    assert_progress(reloaded)
+    assert reloaded._phase_stats == {phase: stats for phase, stats in tracker._phase_stats.items() if stats.concepts}
+    assert set(reloaded._graph.next_concepts()) == set(tracker._graph.next_concepts())
+    reloaded.storage.close()
@@ -0,0 +1,130 @@
+"""
+Every solver path in maths/notes, checked against numpy.linalg.solve on the same system
+"""
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+from gausianelimination import (LUFactorization, _banded_elimination, _thomas, batched_gaussian_elimination,
+                                gaussian_elimination, set_instrumentation, solve_banded, solve_sparse,
+                                solve_tridiagonal)
+from out_of_core_elimination import out_of_core_gaussian_elimination
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+def system(rng, n):
+    """A well-conditioned random matrix and right-hand side"""
+    return rng.standard_normal((n, n)) + n ** 0.5 * np.eye(n), rng.standard_normal(n)
+
+
+def banded(rng, n, lower, upper):
+    """A random band matrix, not diagonally dominant, in band storage and densely"""
+    ab = rng.standard_normal((lower + upper + 1, n))  # the corner slots outside the matrix are ignored
+    dense = sum(np.diag(ab[upper - offset, max(offset, 0):n + min(offset, 0)], offset)
+                for offset in range(-lower, upper + 1))
+    return ab, dense
+
+
+def test_dense_and_factor_once(rng):
+    matrix, b = system(rng, 150)
+    expected = np.linalg.solve(matrix, b)
+    assert np.allclose(gaussian_elimination(matrix, b), expected)
+
+    factorization = LUFactorization(matrix, block_size=16)
+    block = rng.standard_normal((150, 3))
+    assert np.allclose(factorization.solve(block), np.linalg.solve(matrix, block))
+    assert np.allclose(next(factorization.solve(iter([b]))), expected)
+
+
+def test_mixed_precision(rng):
+    matrix, b = system(rng, 120)
+    x, info = gaussian_elimination(matrix, b, precision="mixed", return_info=True)
+    assert info.converged and not info.fell_back
+    assert np.allclose(x, np.linalg.solve(matrix, b), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel(rng, executor):
+    matrix, b = system(rng, 130)
+    x = LUFactorization(matrix, block_size=32, workers=3, executor=executor).solve(b)
+    assert np.allclose(x, np.linalg.solve(matrix, b))
+
+
+def test_out_of_core(rng, tmp_path):
+    matrix, b = system(rng, 100)
+    path = tmp_path / "matrix.npy"
+    np.save(path, matrix)
+    x = out_of_core_gaussian_elimination(str(path), b, memory_budget=100 * 8 * 24)
+    assert np.allclose(x, np.linalg.solve(matrix, b))
+
+
+def test_batched(rng):
+    matrices = rng.standard_normal((40, 5, 5)) + 3 * np.eye(5)
+    vectors = rng.standard_normal((40, 5))
+    matrices[3] = 1.0
+    solutions, singular = batched_gaussian_elimination(matrices, vectors)
+    assert np.flatnonzero(singular).tolist() == [3]
+    assert np.isnan(solutions[3]).all()
+    expected = np.linalg.solve(matrices[~singular], vectors[~singular][..., None])[..., 0]
+    assert np.allclose(solutions[~singular], expected)
+
+
+@pytest.mark.parametrize("solve", [solve_banded, lambda l_and_u, ab, b: _banded_elimination(*l_and_u, ab, b)],
+                         ids=["lapack", "python"])
+@pytest.mark.parametrize("l_and_u", [(1, 1), (2, 2), (3, 1)])
+def test_banded(rng, solve, l_and_u):
+    ab, dense = banded(rng, 200, *l_and_u)
+    b = rng.standard_normal((200, 2))
+    assert np.allclose(solve(l_and_u, ab, b), np.linalg.solve(dense, b))
+    assert np.allclose(solve(l_and_u, ab, b[:, 0]), np.linalg.solve(dense, b[:, 0]))
+
+
+def test_tridiagonal(rng):
+    ab, dense = banded(rng, 300, 1, 1)
+    lower, diagonal, upper = ab[2, :-1], ab[1], ab[0, 1:]
+    b = rng.standard_normal(300)
+    assert np.allclose(solve_tridiagonal(lower, diagonal, upper, b), np.linalg.solve(dense, b))
+
+    diagonal = np.abs(np.r_[0, lower]) + np.abs(np.r_[upper, 0]) + 1  # the Thomas fallback does not pivot
+    dense = dense + np.diag(diagonal - ab[1])
+    assert np.allclose(_thomas(lower, diagonal, upper, b), np.linalg.solve(dense, b))
+
+
+def test_singular_band_raises(rng):
+    ab, _ = banded(rng, 50, 1, 2)
+    ab[:, 10] = 0  # an all-zero column
+    with pytest.raises(ValueError, match="singular"):
+        solve_banded((1, 2), ab, np.ones(50))
+
+
+@pytest.mark.parametrize("l_and_u", [(1, 1), (3, 2)])
+def test_sparse_band(rng, l_and_u):
+    ab, dense = banded(rng, 250, *l_and_u)
+    b = rng.standard_normal(250)
+    assert np.allclose(solve_sparse(scipy.sparse.csr_matrix(dense), b), np.linalg.solve(dense, b))
+
+
+def test_sparse_lu(rng):
+    dense = scipy.sparse.random(300, 300, density=0.01, random_state=3).toarray() + 4 * np.eye(300)
+    dense[0, -1] = dense[-1, 0] = 1.0  # far off the diagonal: too wide for the band path
+    b = rng.standard_normal(300)
+    matrix = scipy.sparse.csr_matrix(dense)
+    assert np.allclose(gaussian_elimination(matrix, b), np.linalg.solve(dense, b))
+    assert np.allclose(solve_sparse((matrix.data, matrix.indices, matrix.indptr), b), np.linalg.solve(dense, b))
+
+
+def test_instrumentation_hook(rng):
+    calls = []
+    set_instrumentation(lambda name, seconds: calls.append(name))
+    try:
+        gaussian_elimination(*system(rng, 20))
+    finally:
+        set_instrumentation(None)
+    assert sorted(calls) == ["solver.gaussian_elimination", "solver.lu_factor", "solver.lu_solve"]
+    gaussian_elimination(*system(rng, 20))
+    assert len(calls) == 3
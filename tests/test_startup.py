@@ -0,0 +1,61 @@
+"""
+CLI startup: importing the tracker, and the commands that neither report nor plot,
+stay clear of numpy and matplotlib and within an import-time budget
+"""
+
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from complete_math_tracker import CompleteMathTracker, MathConcept
+
+ROOT = Path(__file__).resolve().parents[1]
+TRACKER_SCRIPT = ROOT / "complete_math_tracker.py"
+
+IMPORT_BUDGET_MS = 100
+REPORT_IMPORT_BUDGET_MS = 250  # --report loads numpy for its analytics
+RUNS = 3  # the median import time is checked against the budget
+
+
+def import_profile(arguments, cwd) -> tuple:
+    """Total import time (ms) and the imported top-level packages of one `python -X importtime` run"""
+    result = subprocess.run([sys.executable, "-X", "importtime", *arguments],
+                            capture_output=True, text=True, cwd=cwd, check=True)
+    total_us, packages = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        packages.add(name.strip().split(".")[0])
+        if not name.startswith("  "):  # top level: its cumulative time covers its children
+            total_us += int(cumulative_us)
+    return total_us / 1000, packages
+
+
+def check_startup(arguments, cwd, forbidden, budget_ms):
+    runs = [import_profile(arguments, cwd) for _ in range(RUNS)]
+    assert not set(forbidden) & runs[-1][1]
+    assert statistics.median(ms for ms, _ in runs) <= budget_ms
+
+
+def test_import_is_light():
+    check_startup(["-c", "import complete_math_tracker"], ROOT, ["numpy", "matplotlib"], IMPORT_BUDGET_MS)
+
+
+@pytest.mark.parametrize("arguments, forbidden, budget_ms", [
+    (["--update-mastery", "Limits", "3", "30"], ["numpy", "matplotlib"], IMPORT_BUDGET_MS),
+    (["--due", "5"], ["numpy", "matplotlib"], IMPORT_BUDGET_MS),
+    (["--analytics"], ["numpy", "matplotlib"], IMPORT_BUDGET_MS),
+    (["--report"], ["matplotlib"], REPORT_IMPORT_BUDGET_MS),
+], ids=["update-mastery", "due", "analytics", "report"])
+def test_cli_command_startup(tmp_path, arguments, forbidden, budget_ms):
+    data_file = tmp_path / "startup.json"
+    tracker = CompleteMathTracker(str(data_file))
+    tracker.add_concept(MathConcept(name="Limits", phase=1, module="Differential & Integral Calculus",
+                                    difficulty=3, prerequisites=[], mastery_level=0, time_invested=0))
+    tracker.update_mastery("Limits", 2, 60)  # some phase progress for --report to start from
+    check_startup([str(TRACKER_SCRIPT), *arguments, "--data-file", str(data_file)], tmp_path,
+                  forbidden, budget_ms)
@@ -0,0 +1,123 @@
+"""
+Storage backends: what is written comes back, SQLite writes only the touched rows,
+the JSON migrator copies everything, and the CLI writes once per command
+"""
+
+import io
+import json
+import runpy
+import sys
+from pathlib import Path
+
+from complete_math_tracker import CompleteMathTracker, MathConcept, ResearchProject
+from tracker_storage import ChangeSet, JsonStorage, migrate_json_to_sqlite
+
+
+TRACKER_SCRIPT = Path(__file__).resolve().parents[1] / "complete_math_tracker.py"
+
+
+def concept(name, phase=1, mastery=0, prerequisites=()) -> MathConcept:
+    return MathConcept(name=name, phase=phase, module=f"Phase {phase} Module 0", difficulty=3,
+                       prerequisites=list(prerequisites), mastery_level=mastery, time_invested=0)
+
+
+def populate(tracker: CompleteMathTracker):
+    tracker.add_concepts([concept("limits", mastery=4), concept("derivatives", prerequisites=["limits"]),
+                          concept("integrals", phase=2, prerequisites=["derivatives", "sequences"])])
+    tracker.update_mastery("derivatives", 3, 25)
+    tracker.add_research_project(ResearchProject(title="Heat kernels", phase=7, start_date="2026-01-05",
+                                                 status="active", collaborators=["A. Author"], abstract="",
+                                                 milestones=[], publications=[]))
+    tracker.data["concepts"]["limits"]["notes"] = "epsilon-delta"  # a field beyond the standard ones
+    tracker._persist(ChangeSet().touch("concepts", "limits"))
+
+
+def snapshot(tracker: CompleteMathTracker) -> dict:
+    return json.loads(json.dumps({**tracker.data, "concepts": tracker.data["concepts"].to_dict()}, default=str))
+
+
+def test_round_trip(tracker, data_file):
+    populate(tracker)
+    reloaded = CompleteMathTracker(str(data_file))
+    assert snapshot(reloaded) == snapshot(tracker)
+    assert reloaded.data["concepts"]["limits"]["notes"] == "epsilon-delta"
+    assert reloaded.reviews_due("2100-01-01") == tracker.reviews_due("2100-01-01")
+    reloaded.storage.close()
+
+
+def test_reload_keeps_concept_order(tracker, data_file):
+    names = ["zeta", "alpha", "mu", "beta", "omega", "kappa"]
+    tracker.add_concepts([concept(name) for name in names])
+    tracker.add_concept(concept("delta"))
+    reloaded = CompleteMathTracker(str(data_file))
+    assert list(reloaded.data["concepts"]) == names + ["delta"]
+    assert reloaded._graph.next_concepts() == tracker._graph.next_concepts()
+    reloaded.storage.close()
+
+
+def test_sqlite_writes_only_touched_rows(tmp_path):
+    tracker = CompleteMathTracker(str(tmp_path / "tracker.db"))
+    tracker.add_concepts([concept(f"c{i}", phase=1 + i % 9) for i in range(500)])
+    conn = tracker.storage.conn
+
+    before = conn.total_changes
+    tracker.update_mastery("c42", 4, 30)
+    # the concept, its review state, the nine phase progress entries and the change log
+    assert conn.total_changes - before < 30
+    assert conn.execute("SELECT mastery_level FROM concepts WHERE name = 'c42'").fetchone() == (4,)
+    assert conn.execute("SELECT COUNT(*) FROM concepts").fetchone() == (500,)
+    tracker.storage.close()
+
+
+def test_migrate_json_to_sqlite(tmp_path):
+    tracker = CompleteMathTracker(str(tmp_path / "tracker.json"))
+    populate(tracker)
+    assert migrate_json_to_sqlite(tmp_path / "tracker.json", tmp_path / "tracker.db") == 3
+    migrated = CompleteMathTracker(str(tmp_path / "tracker.db"))
+    assert snapshot(migrated) == snapshot(tracker)
+    migrated.storage.close()
+
+
+def test_held_writes_write_json_once(tmp_path, monkeypatch):
+    tracker = CompleteMathTracker(str(tmp_path / "tracker.json"))
+    tracker.add_concepts([concept(f"c{i}") for i in range(20)])
+    writes = []
+    write = JsonStorage.write
+    monkeypatch.setattr(JsonStorage, "write", lambda self, *args: writes.append(1) or write(self, *args))
+
+    with tracker.held_writes():
+        for i in range(20):
+            tracker.update_mastery(f"c{i}", 4, 10)
+        assert writes == []
+    assert writes == [1]
+    assert all(c["mastery_level"] == 4 for c in CompleteMathTracker(str(tmp_path / "tracker.json"))
+               .data["concepts"].values())
+
+
+def test_cli_updates_share_one_write(tmp_path, monkeypatch):
+    data_file = tmp_path / "tracker.json"
+    tracker = CompleteMathTracker(str(data_file))
+    tracker.add_concepts([concept("limits"), concept("derivatives")])
+    writes = []
+    write = JsonStorage.write
+    monkeypatch.setattr(JsonStorage, "write", lambda self, *args: writes.append(1) or write(self, *args))
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", [str(TRACKER_SCRIPT), "--data-file", str(data_file),
+                                      "--update-mastery", "limits", "4", "30",
+                                      "--update-mastery", "derivatives", "2", "15"])
+    runpy.run_path(str(TRACKER_SCRIPT), run_name="__main__")
+    assert writes == [1]
+    document = json.loads(data_file.read_text())
+    assert document["concepts"]["limits"]["mastery_level"] == 4
+    assert document["concepts"]["derivatives"]["time_invested"] == 15
+
+
+def test_cli_add_concept_from_piped_input(tmp_path, monkeypatch, capsys):
+    data_file = tmp_path / "tracker.json"
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", [str(TRACKER_SCRIPT), "--data-file", str(data_file), "--add-concept"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("limits\n1\nAnalysis\n3\n\n"))  # no answer to "another?"
+    runpy.run_path(str(TRACKER_SCRIPT), run_name="__main__")
+    assert "Added concept: limits" in capsys.readouterr().out
+    assert list(json.loads(data_file.read_text())["concepts"]) == ["limits"]
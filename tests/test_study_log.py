@@ -0,0 +1,61 @@
+"""
+Mastery velocity from the study log: it follows every append, ours or another
+writer's, by reading only what was appended since the last read
+"""
+
+import datetime
+import json
+
+import pytest
+
+from complete_math_tracker import CompleteMathTracker, MathConcept
+from tracker_events import MasteryGains, StudyLog
+
+
+def concept(name, mastery=0) -> MathConcept:
+    return MathConcept(name=name, phase=1, module="Phase 1 Module 0", difficulty=3,
+                       prerequisites=[], mastery_level=mastery, time_invested=0)
+
+
+def event(day: str, old_level: int, new_level: int) -> dict:
+    return {"ts": f"{day}T10:00:00", "concept": "limits", "phase": 1, "module": "Phase 1 Module 0",
+            "old_level": old_level, "new_level": new_level, "minutes": 10}
+
+
+def test_velocity_follows_writes_without_rereading_the_log(tracker, monkeypatch):
+    tracker.add_concepts([concept("limits"), concept("series")])
+    tracker.update_mastery("limits", 3, 20)
+    assert tracker.study_velocity() == pytest.approx(3 / 30)
+
+    monkeypatch.setattr(StudyLog, "__iter__", lambda self: pytest.fail("the whole log was read again"))
+    offsets = []
+    read_from = StudyLog.read_from
+    monkeypatch.setattr(StudyLog, "read_from", lambda self, offset: offsets.append(offset) or read_from(self, offset))
+    tracker.update_mastery("series", 2, 10)
+    tracker.update_mastery("limits", 1, 5)
+    assert tracker.study_velocity() == pytest.approx(3 / 30)
+    assert tracker.study_velocity(window_days=10) == pytest.approx(3 / 10)
+    assert offsets and all(offset > 0 for offset in offsets)  # only the tail after the first read
+
+    other = CompleteMathTracker(str(tracker.data_file))  # another writer appends to the same log
+    other.update_mastery("series", 5, 30)
+    other.storage.close()
+    assert tracker.study_velocity() == pytest.approx(6 / 30)
+
+
+def test_window_and_rewritten_logs(tmp_path):
+    log = StudyLog(tmp_path / "tracker.events.jsonl")
+    log.append_many([event("2026-01-01", 0, 4), event("2026-01-20", 0, 2), event("2026-01-29", 2, 1)])
+    gains = MasteryGains(log)
+    assert gains.velocity(10, datetime.date(2026, 1, 29)) == pytest.approx(1 / 10)
+    assert gains.velocity(30, datetime.date(2026, 1, 30)) == pytest.approx(5 / 30)
+
+    with open(log.path, "a") as f:
+        f.write(json.dumps(event("2026-01-30", 1, 5))[:-10])  # a line still being written
+    assert gains.velocity(30, datetime.date(2026, 1, 30)) == pytest.approx(5 / 30)
+    with open(log.path, "a") as f:
+        f.write(json.dumps(event("2026-01-30", 1, 5))[-10:] + "\n")
+    assert gains.velocity(30, datetime.date(2026, 1, 30)) == pytest.approx(9 / 30)
+
+    log.path.write_text(json.dumps(event("2026-01-30", 0, 1)) + "\n")  # replaced by a shorter log
+    assert gains.velocity(30, datetime.date(2026, 1, 30)) == pytest.approx(1 / 30)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Chart rendering for the Complete Mathematics Mastery Tracker
+Headless Agg rendering onto one reused figure, with outputs cached by a hash of the plotted data
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+FORMATS = ("png", "svg")
+DEFAULT_FIGSIZE = (15, 8)
+MAX_CACHE_ENTRIES = 256
+
+
+def bar_chart(title: str, labels: List[str], values: List[float], xlabel: str = "", ylabel: str = "",
+              colors: Optional[List[str]] = None, annotations: Optional[List[str]] = None,
+              figsize: Tuple[float, float] = DEFAULT_FIGSIZE) -> Dict:
+    """A bar chart as plain data: what gets drawn and what the cache key is computed from"""
+    return {
+        "title": title,
+        "labels": list(labels),
+        "values": [float(value) for value in values],
+        "xlabel": xlabel,
+        "ylabel": ylabel,
+        "colors": colors,
+        "annotations": annotations,
+        "figsize": list(figsize),
+    }
+
+
+def chart_filename(name: str) -> str:
+    """A file-name-safe version of a phase or module name"""
+    return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower() or "chart"
+
+
+def draw_bar_chart(ax, chart: Dict):
+    """Draw a bar_chart() spec onto matplotlib axes"""
+    positions = range(len(chart["values"]))
+    bars = ax.bar(positions, chart["values"], color=chart["colors"])
+    ax.set_xlabel(chart["xlabel"])
+    ax.set_ylabel(chart["ylabel"])
+    ax.set_title(chart["title"])
+    ax.set_xticks(list(positions))
+    ax.set_xticklabels(chart["labels"], rotation=45, ha="right" if len(chart["labels"]) > 9 else "center")
+    for bar, text in zip(bars, chart["annotations"] or []):
+        ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height() + 1, text,
+                ha="center", va="bottom", fontsize=8, rotation=45)
+
+
+class ChartRenderer:
+    """Renders chart specs to files without a GUI backend.
+
+    All charts are drawn on one Figure attached to an Agg canvas directly (not via
+    pyplot), so nothing is registered with pyplot's figure manager and nothing lingers
+    between renders. Each output is stored in the cache directory under a hash of the
+    chart data, format and dpi; rendering an unchanged chart just copies that file.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], dpi: int = 150,
+                 max_entries: int = MAX_CACHE_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.dpi = dpi
+        self.max_entries = max_entries
+        self._figure = None
+
+    def _cache_path(self, chart: Dict, fmt: str) -> Path:
+        payload = json.dumps({"chart": chart, "format": fmt, "dpi": self.dpi}, sort_keys=True)
+        return self.cache_dir / f"{hashlib.sha256(payload.encode()).hexdigest()[:32]}.{fmt}"
+
+    def _draw(self, chart: Dict, path: Path, fmt: str):
+        if self._figure is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+            self._figure = Figure()
+            FigureCanvasAgg(self._figure)
+        figure = self._figure
+        figure.clear()
+        figure.set_size_inches(chart["figsize"])
+        draw_bar_chart(figure.add_subplot(), chart)
+        tmp_path = path.with_name(path.name + ".tmp")
+        figure.savefig(tmp_path, format=fmt, dpi=self.dpi, bbox_inches="tight")
+        os.replace(tmp_path, path)
+
+    def render(self, chart: Dict, save_path: Union[str, Path], fmt: Optional[str] = None) -> bool:
+        """Write the chart to save_path; returns True if it came from the cache"""
+        save_path = Path(save_path)
+        fmt = fmt or save_path.suffix.lstrip(".").lower() or "png"
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported chart format '{fmt}' (expected one of {', '.join(FORMATS)})")
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cached = self._cache_path(chart, fmt)
+        hit = cached.exists()
+        if hit:
+            os.utime(cached)  # recently used entries survive pruning
+        else:
+            self._draw(chart, cached, fmt)
+            self._prune()
+        if save_path.resolve() != cached.resolve():
+            shutil.copyfile(cached, save_path)
+        return hit
+
+    def render_many(self, charts: Iterable[Tuple[Dict, Union[str, Path]]],
+                    fmt: Optional[str] = None) -> Dict[str, int]:
+        """Render (chart, save_path) pairs in one pass over the same figure"""
+        counts = {"rendered": 0, "cached": 0}
+        for chart, save_path in charts:
+            counts["cached" if self.render(chart, save_path, fmt) else "rendered"] += 1
+        return counts
+
+    def _prune(self):
+        """Drop the least recently used outputs beyond max_entries"""
+        entries = [path for path in self.cache_dir.iterdir() if path.suffix.lstrip(".") in FORMATS]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda path: path.stat().st_mtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Columnar concept view for the Complete Mathematics Mastery Tracker
+NumPy arrays per field with an interned module index, for vectorized report analytics
+"""
+
+from array import array
+from typing import Dict, List, Mapping
+
+import numpy as np
+
+from tracker_store import ConceptStore
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+class ConceptColumns:
+    """Concept fields as parallel NumPy columns, one row per concept.
+
+    Rows are appended in amortized O(1) (capacity doubling) and updated in place,
+    found by the concept's ConceptStore id, so the tracker can keep the view in step
+    with its concepts; group-bys are then bincounts over the phase and module code
+    columns.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(capacity, 1)
+        self.size = 0
+        self.rows = array("i")  # row + 1 per concept id, 0 for no row
+        self.module_names: List[str] = []
+        self.module_codes: Dict[str, int] = {}
+        self._phase = np.zeros(capacity, dtype=np.int16)
+        self._difficulty = np.zeros(capacity, dtype=np.int16)
+        self._mastery = np.zeros(capacity, dtype=np.int8)
+        self._time = np.zeros(capacity, dtype=np.int64)
+        self._module = np.zeros(capacity, dtype=np.int32)
+
+    @classmethod
+    def from_concepts(cls, concepts: ConceptStore) -> "ConceptColumns":
+        columns = cls(len(concepts))
+        for name, concept in concepts.items():
+            columns.set(concepts.id_of(name), concept)
+        return columns
+
+    def _grow(self):
+        capacity = 2 * len(self._phase)
+        for attr in ("_phase", "_difficulty", "_mastery", "_time", "_module"):
+            old = getattr(self, attr)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, attr, new)
+
+    def set(self, concept_id: int, concept: Mapping):
+        """Insert or overwrite the row for a concept"""
+        missing = concept_id + 1 - len(self.rows)
+        if missing > 0:
+            self.rows.frombytes(bytes(missing * self.rows.itemsize))
+        row = self.rows[concept_id] - 1
+        if row < 0:
+            if self.size == len(self._phase):
+                self._grow()
+            row = self.size
+            self.rows[concept_id] = row + 1
+            self.size += 1
+        module = concept["module"]
+        code = self.module_codes.get(module)
+        if code is None:
+            code = self.module_codes[module] = len(self.module_names)
+            self.module_names.append(module)
+        self._phase[row] = concept["phase"]
+        self._difficulty[row] = concept["difficulty"]
+        self._mastery[row] = concept["mastery_level"]
+        self._time[row] = concept["time_invested"]
+        self._module[row] = code
+
+    @property
+    def phase(self) -> np.ndarray:
+        return self._phase[:self.size]
+
+    @property
+    def difficulty(self) -> np.ndarray:
+        return self._difficulty[:self.size]
+
+    @property
+    def mastery(self) -> np.ndarray:
+        return self._mastery[:self.size]
+
+    @property
+    def time_invested(self) -> np.ndarray:
+        return self._time[:self.size]
+
+    @property
+    def module(self) -> np.ndarray:
+        return self._module[:self.size]
+
+    def _group(self, codes: np.ndarray, groups: int, threshold: int) -> Dict[str, np.ndarray]:
+        counts = np.bincount(codes, minlength=groups)
+        mastery_sum = np.bincount(codes, weights=self.mastery, minlength=groups)
+        return {
+            "concepts": counts,
+            "mastered": np.bincount(codes, weights=self.mastery >= threshold, minlength=groups),
+            "avg_mastery": np.divide(mastery_sum, counts, out=np.zeros(groups), where=counts > 0),
+            "avg_difficulty": np.divide(np.bincount(codes, weights=self.difficulty, minlength=groups), counts,
+                                        out=np.zeros(groups), where=counts > 0),
+            "time": np.bincount(codes, weights=self.time_invested, minlength=groups),
+        }
+
+    def phase_module_mastery(self) -> Dict[int, Dict[str, float]]:
+        """Average mastery level of each module within each phase"""
+        modules = max(len(self.module_names), 1)
+        key = self.phase.astype(np.int64) * modules + self.module
+        counts = np.bincount(key)
+        sums = np.bincount(key, weights=self.mastery)
+        result: Dict[int, Dict[str, float]] = {}
+        for k in np.flatnonzero(counts):
+            phase, module = divmod(int(k), modules)
+            result.setdefault(phase, {})[self.module_names[module]] = float(sums[k] / counts[k])
+        return result
+
+    def module_mastery_histograms(self, levels: int = 6) -> Dict[str, List[int]]:
+        """How many concepts of each module sit at each mastery level"""
+        key = self.module.astype(np.int64) * levels + np.clip(self.mastery, 0, levels - 1)
+        counts = np.bincount(key, minlength=len(self.module_names) * levels).reshape(-1, levels)
+        return {name: counts[code].tolist() for code, name in enumerate(self.module_names)}
+
+    def summary(self, threshold: int) -> Dict:
+        """Per-phase and per-module breakdowns plus distribution percentiles"""
+        def breakdown(groups: Dict[str, np.ndarray], index) -> Dict:
+            return {
+                key: {
+                    "concepts": int(groups["concepts"][i]),
+                    "mastered": int(groups["mastered"][i]),
+                    "avg_mastery": float(groups["avg_mastery"][i]),
+                    "avg_difficulty": float(groups["avg_difficulty"][i]),
+                    "study_time_hours": float(groups["time"][i]) / 60,
+                }
+                for key, i in index if groups["concepts"][i]
+            }
+
+        phases = self._group(self.phase, int(self.phase.max(initial=0)) + 1, threshold)
+        modules = self._group(self.module, len(self.module_names), threshold)
+        if self.size:
+            mastery_percentiles = np.percentile(self.mastery, PERCENTILES)
+            time_percentiles = np.percentile(self.time_invested, PERCENTILES) / 60
+        else:
+            mastery_percentiles = time_percentiles = np.zeros(len(PERCENTILES))
+        return {
+            "phases": breakdown(phases, ((int(p), p) for p in range(len(phases["concepts"])))),
+            "modules": breakdown(modules, zip(self.module_names, range(len(self.module_names)))),
+            "percentiles": {
+                "mastery_level": {p: float(v) for p, v in zip(PERCENTILES, mastery_percentiles)},
+                "study_time_hours": {p: float(v) for p, v in zip(PERCENTILES, time_percentiles)},
+            },
+        }
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Study event log for the Complete Mathematics Mastery Tracker
+Append-only JSON Lines history of mastery changes, with one-pass streaming analytics
+"""
+
+import collections
+import datetime
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from tracker_metrics import add_bytes, timed
+
+
+class StudyLog:
+    """Append-only JSON Lines file, one compact record per mastery change"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def append(self, event: Dict):
+        self.append_many([event])
+
+    @timed("study_log.append")
+    def append_many(self, events: Iterable[Dict]):
+        lines = [json.dumps(event, separators=(",", ":")) + "\n" for event in events]
+        if lines:
+            # One append-mode write per call, so concurrent writers do not interleave lines
+            data = "".join(lines).encode()
+            with open(self.path, "ab") as f:
+                f.write(data)
+            add_bytes("study_log.append", written=len(data))
+
+    def version(self) -> Optional[Tuple[int, int]]:
+        """(size, mtime) of the log, which changes whenever events are appended"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def read_from(self, offset: int) -> Tuple[List[Dict], int]:
+        """The events appended from byte offset on, and the offset just past them
+        (a line still being written is left for the next read)"""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+        end = data.rfind(b"\n") + 1
+        add_bytes("study_log.read", read=end)
+        return [json.loads(line) for line in data[:end].splitlines() if line.strip()], offset + end
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Stream the events back, one line at a time"""
+        if not self.path.exists():
+            return
+        read = 0
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    read += len(line)
+                    if line.strip():
+                        yield json.loads(line)
+        finally:
+            add_bytes("study_log.read", read=read)
+
+
+def mastery_event(concept: Dict, old_level: int, new_level: int, minutes: int) -> Dict:
+    """The log record for one update_mastery call"""
+    return {
+        "ts": datetime.datetime.now().isoformat(timespec="seconds"),
+        "concept": concept["name"],
+        "phase": concept["phase"],
+        "module": concept["module"],
+        "old_level": old_level,
+        "new_level": new_level,
+        "minutes": minutes,
+    }
+
+
+class MasteryGains:
+    """Net mastery levels gained per day of a study log, one total per day.
+
+    Each read picks up only what was appended since the last one (by this or
+    any other process), so keeping up costs the new events, not the history.
+    """
+
+    def __init__(self, log: StudyLog):
+        self.log = log
+        self.offset = 0
+        self.by_day: Dict[str, int] = collections.Counter()
+
+    def refresh(self):
+        version = self.log.version()
+        if version is None or version[0] < self.offset:  # removed or rewritten: start over
+            self.offset = 0
+            self.by_day.clear()
+        events, self.offset = self.log.read_from(self.offset)
+        for event in events:
+            self.by_day[event["ts"][:10]] += event["new_level"] - event["old_level"]
+
+    def velocity(self, window_days: int, today: datetime.date) -> float:
+        """Levels gained per day over the window_days ending today (never negative)"""
+        self.refresh()
+        start = (today - datetime.timedelta(days=window_days - 1)).isoformat()
+        gained = sum(gain for day, gain in self.by_day.items() if day >= start)
+        return max(gained, 0) / window_days
+
+
+def stream_analytics(events: Iterable[Dict], window_days: int = 7,
+                     threshold: int = 4) -> Iterator[Dict]:
+    """Daily analytics snapshots over a chronological event stream, in one pass.
+
+    Yields, at the end of each day that has events:
+    - study_minutes_by_phase: study time per phase over the trailing window
+    - mastery_velocity: mastery levels gained per day over the trailing window
+    - time_to_mastery: per module, mean study minutes a concept took to first
+      reach the threshold level
+
+    Memory is bounded by the events inside the window plus one entry per
+    concept, not by the length of the history.
+    """
+    window = collections.deque()  # (date, phase, minutes, level change)
+    minutes_by_phase = collections.Counter()
+    level_gain = 0
+    minutes_until_mastered: Dict[str, int] = {}
+    reached_mastery: Set[str] = set()
+    mastered_totals: Dict[str, list] = {}  # module -> [total minutes, concepts]
+    current_day = None
+
+    def snapshot(day):
+        return {
+            "date": day.isoformat(),
+            "study_minutes_by_phase": {phase: minutes for phase, minutes in sorted(minutes_by_phase.items())
+                                       if minutes},
+            "mastery_velocity": level_gain / window_days,
+            "time_to_mastery": {module: total / count for module, (total, count) in mastered_totals.items()},
+        }
+
+    for event in events:
+        day = datetime.date.fromisoformat(event["ts"][:10])
+        if current_day is not None and day != current_day:
+            yield snapshot(current_day)
+        current_day = day
+
+        # Slide the window forward
+        start = day - datetime.timedelta(days=window_days - 1)
+        while window and window[0][0] < start:
+            _, phase, minutes, change = window.popleft()
+            minutes_by_phase[phase] -= minutes
+            level_gain -= change
+
+        change = event["new_level"] - event["old_level"]
+        window.append((day, event["phase"], event["minutes"], change))
+        minutes_by_phase[event["phase"]] += event["minutes"]
+        level_gain += change
+
+        # Time to mastery: accumulate until the first crossing of the threshold
+        name = event["concept"]
+        if name in reached_mastery:
+            continue
+        if name not in minutes_until_mastered and event["old_level"] >= threshold:
+            reached_mastery.add(name)  # already mastered before the log starts
+            continue
+        spent = minutes_until_mastered.pop(name, 0) + event["minutes"]
+        if event["new_level"] >= threshold:
+            reached_mastery.add(name)
+            totals = mastered_totals.setdefault(event["module"], [0, 0])
+            totals[0] += spent
+            totals[1] += 1
+        else:
+            minutes_until_mastered[name] = spent
+
+    if current_day is not None:
+        yield snapshot(current_day)
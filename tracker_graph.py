@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Prerequisite graph index for the Complete Mathematics Mastery Tracker
+Keeps the "ready to learn next" frontier up to date as concepts are added and mastered
+"""
+
+from array import array
+from typing import Iterable, List, Optional, Sequence, Set
+
+from tracker_store import ConceptStore
+
+
+class PrerequisiteCycleError(ValueError):
+    """Raised when adding a concept would make the prerequisites circular"""
+
+
+class PrerequisiteGraph:
+    """Prerequisite DAG over a ConceptStore's concept ids with an incrementally maintained frontier.
+
+    The forward edges are the store's own prerequisite id arrays. Per id the graph
+    adds the concepts that require it (reverse edges), how many of its prerequisites
+    are not yet mastered and whether it is mastered itself. A concept is on the
+    frontier when it is not mastered itself and that count is 0, so mastering or
+    un-mastering a concept only touches its direct dependents.
+
+    A replaced or discarded concept's old edges are read from the store, so the
+    graph must be told (add, discard) before the store changes.
+    """
+
+    def __init__(self, concepts: ConceptStore):
+        self.concepts = concepts
+        self.tracked = bytearray()
+        self.mastered = bytearray()
+        self.unmet = array("i")
+        self.dependents: List[Optional[array]] = []
+        self.frontier: Set[int] = set()
+
+    @classmethod
+    def from_concepts(cls, concepts: ConceptStore, threshold: int) -> "PrerequisiteGraph":
+        """Index the stored concepts (without rejecting cycles already in the data)"""
+        graph = cls(concepts)
+        for name, concept in concepts.items():
+            concept_id = concepts.id_of(name)
+            graph._add(concept_id, graph._edges(concept_id), concept["mastery_level"] >= threshold)
+        return graph
+
+    def _reserve(self, concept_id: int):
+        missing = concept_id + 1 - len(self.tracked)
+        if missing > 0:
+            self.tracked.extend(bytes(missing))
+            self.mastered.extend(bytes(missing))
+            self.unmet.frombytes(bytes(missing * self.unmet.itemsize))
+            self.dependents.extend([None] * missing)
+
+    def _is_tracked(self, concept_id: int) -> bool:
+        return concept_id < len(self.tracked) and self.tracked[concept_id]
+
+    def _edges(self, concept_id: int) -> Sequence[int]:
+        """A concept's prerequisite ids as the store holds them, without repeats (none for a non-concept)"""
+        try:
+            prereqs = self.concepts.prerequisite_ids(concept_id)
+        except KeyError:
+            return ()
+        return list(dict.fromkeys(prereqs)) if len(prereqs) > 1 else prereqs
+
+    def add(self, name: str, prerequisites: Iterable[str], mastered: bool = False,
+            check: bool = True) -> List[str]:
+        """Add or replace a concept; returns its prerequisites that are not concepts (yet).
+
+        Raises PrerequisiteCycleError, leaving the graph untouched, if the concept
+        would (transitively) require itself.
+        """
+        prerequisites = list(dict.fromkeys(prerequisites))
+        if check:
+            cycle = self.find_cycle(name, prerequisites)
+            if cycle:
+                raise PrerequisiteCycleError(
+                    f"Prerequisite cycle through '{name}': {' -> '.join(cycle)}")
+
+        intern = self.concepts.intern
+        prereq_ids = [intern(prereq) for prereq in prerequisites]
+        self._add(intern(name), prereq_ids, mastered)
+        return [prereq for prereq, prereq_id in zip(prerequisites, prereq_ids) if not self.tracked[prereq_id]]
+
+    def _add(self, concept_id: int, prereq_ids: Sequence[int], mastered: bool):
+        self._reserve(max(concept_id, *prereq_ids) if prereq_ids else concept_id)
+        if self.tracked[concept_id]:
+            self._remove(concept_id)
+        self.tracked[concept_id] = 1
+        dependents, is_mastered = self.dependents, self.mastered
+        unmet = 0
+        for prereq in prereq_ids:
+            if dependents[prereq] is None:
+                dependents[prereq] = array("i")
+            dependents[prereq].append(concept_id)
+            unmet += not is_mastered[prereq]
+        self.unmet[concept_id] = unmet
+        if mastered:
+            self._set_mastered(concept_id, True)
+        elif unmet == 0:
+            self.frontier.add(concept_id)
+
+    def _remove(self, concept_id: int):
+        self._set_mastered(concept_id, False)
+        for prereq in self._edges(concept_id):
+            dependents = self.dependents[prereq]
+            dependents.remove(concept_id)
+            if not dependents:
+                self.dependents[prereq] = None
+        self.frontier.discard(concept_id)
+        self.tracked[concept_id] = 0
+        self.unmet[concept_id] = 0
+
+    def discard(self, name: str):
+        """Stop tracking a concept (concepts requiring it keep it as an unmet prerequisite)"""
+        if name in self.concepts and self._is_tracked(self.concepts.id_of(name)):
+            self._remove(self.concepts.id_of(name))
+
+    def set_mastered(self, name: str, mastered: bool):
+        """Record that a concept crossed the mastery threshold (either way)"""
+        if name in self.concepts:
+            self._set_mastered(self.concepts.id_of(name), mastered)
+
+    def _set_mastered(self, concept_id: int, mastered: bool):
+        if not self._is_tracked(concept_id) or mastered == bool(self.mastered[concept_id]):
+            return
+        dependents = self.dependents[concept_id] or ()
+        if mastered:
+            self.mastered[concept_id] = 1
+            self.frontier.discard(concept_id)
+            for dependent in dependents:
+                self.unmet[dependent] -= 1
+                if self.unmet[dependent] == 0 and not self.mastered[dependent]:
+                    self.frontier.add(dependent)
+        else:
+            self.mastered[concept_id] = 0
+            for dependent in dependents:
+                self.unmet[dependent] += 1
+                self.frontier.discard(dependent)
+            if self.unmet[concept_id] == 0:
+                self.frontier.add(concept_id)
+
+    def dangling(self, name: str) -> List[str]:
+        """Prerequisites of a concept that are not tracked concepts"""
+        if name not in self.concepts:
+            return []
+        name_of = self.concepts.name_of
+        return [name_of(prereq) for prereq in self._edges(self.concepts.id_of(name)) if not self._is_tracked(prereq)]
+
+    def find_cycle(self, name: str, prerequisites: List[str]) -> Optional[List[str]]:
+        """The path name -> ... -> name that giving name these prerequisites would close, if any"""
+        if name in prerequisites:
+            return [name, name]
+        concepts = self.concepts
+        target = concepts.intern(name)
+        if not self._has_dependents(target):
+            return None  # nothing requires name, so no path can lead back to it
+
+        start = [concepts.id_of(prereq) for prereq in prerequisites if prereq in concepts]
+        parent = {prereq: target for prereq in start}
+        stack = list(start)
+        while stack:
+            node = stack.pop()
+            for prereq in self._edges(node):
+                if prereq == target:
+                    path = [node]
+                    while path[-1] != target:
+                        path.append(parent[path[-1]])
+                    return [concepts.name_of(step) for step in path[::-1]] + [name]
+                if prereq not in parent:
+                    parent[prereq] = node
+                    stack.append(prereq)
+        return None
+
+    def _has_dependents(self, concept_id: int) -> bool:
+        return concept_id < len(self.dependents) and bool(self.dependents[concept_id])
+
+    def next_concepts(self) -> List[str]:
+        """Unmastered concepts whose prerequisites are all mastered, in the order the store first named them"""
+        name_of = self.concepts.name_of
+        return [name_of(concept_id) for concept_id in sorted(self.frontier)]
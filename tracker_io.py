@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Bulk curriculum import/export for the Complete Mathematics Mastery Tracker
+Streams concepts to and from CSV, JSON Lines and Parquet files in fixed-size chunks
+"""
+
+import csv
+import itertools
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from complete_math_tracker import MathConcept
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+COLUMNS = ("name", "phase", "module", "difficulty", "prerequisites",
+           "mastery_level", "time_invested", "last_reviewed")
+
+CHUNK_SIZE = 10_000  # records validated and committed together
+MAX_REPORTED_ERRORS = 20
+PREREQ_SEPARATOR = ";"  # between prerequisites in a CSV cell
+
+
+class RecordError(ValueError):
+    """Raised for an import record that cannot become a concept"""
+
+
+def file_format(path: Union[str, Path], fmt: Optional[str] = None) -> str:
+    """The explicit format, or the one the file suffix implies"""
+    if fmt:
+        return fmt
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Cannot tell the format of '{path}' from its suffix; "
+                         f"use one of {', '.join(FORMATS)} or pass a format")
+    return FORMATS[suffix]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet import/export needs pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+# -- reading --------------------------------------------------------------------
+
+def read_records(path: Union[str, Path], fmt: Optional[str] = None,
+                 chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[int, Dict]]:
+    """Stream (record number, raw record) pairs from a curriculum file.
+
+    Record numbers count from 1 (the CSV header and blank lines are not records).
+    Only one Parquet row group batch is held in memory at a time.
+    """
+    fmt = file_format(path, fmt)
+    if fmt == "csv":
+        with open(path, newline="") as f:
+            yield from enumerate(csv.DictReader(f), 1)
+    elif fmt == "jsonl":
+        with open(path) as f:
+            number = 0
+            for line in f:
+                if line.strip():
+                    number += 1
+                    try:
+                        yield number, json.loads(line)
+                    except ValueError as e:
+                        yield number, RecordError(f"invalid JSON: {e}")
+    elif fmt == "parquet":
+        parquet = _pyarrow().parquet.ParquetFile(path)
+        number = 0
+        for batch in parquet.iter_batches(batch_size=chunk_size):
+            for record in batch.to_pylist():
+                number += 1
+                yield number, record
+    else:
+        raise ValueError(f"Unknown format '{fmt}'")
+
+
+def _int_field(record: Dict, field: str, low: int, high: int, default: Optional[int] = None) -> int:
+    value = record.get(field)
+    if value is None or value == "":
+        if default is None:
+            raise RecordError(f"missing '{field}'")
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise RecordError(f"'{field}' must be an integer, got {value!r}") from None
+    if number != value and not isinstance(value, str):
+        raise RecordError(f"'{field}' must be an integer, got {value!r}")
+    if not low <= number <= high:
+        raise RecordError(f"'{field}' must be between {low} and {high}, got {number}")
+    return number
+
+
+def validate_record(record: Dict) -> MathConcept:
+    """Turn one raw record into a MathConcept, or raise RecordError"""
+    if isinstance(record, RecordError):
+        raise record
+    if not isinstance(record, dict):
+        raise RecordError("record is not an object")
+    name = record.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise RecordError("missing 'name'")
+    module = record.get("module")
+    if not isinstance(module, str) or not module.strip():
+        raise RecordError("missing 'module'")
+
+    prerequisites = record.get("prerequisites") or []
+    if isinstance(prerequisites, str):
+        prerequisites = prerequisites.split(PREREQ_SEPARATOR)
+    elif not isinstance(prerequisites, (list, tuple)) or not all(isinstance(p, str) for p in prerequisites):
+        raise RecordError("'prerequisites' must be a list of names")
+    prerequisites = [p.strip() for p in prerequisites if p.strip()]
+
+    last_reviewed = record.get("last_reviewed") or None
+    if last_reviewed is not None and not isinstance(last_reviewed, str):
+        last_reviewed = str(last_reviewed)  # Parquet date columns
+
+    return MathConcept(
+        name=name.strip(), phase=_int_field(record, "phase", 1, 9), module=module.strip(),
+        difficulty=_int_field(record, "difficulty", 1, 10), prerequisites=prerequisites,
+        mastery_level=_int_field(record, "mastery_level", 0, 5, 0),
+        time_invested=_int_field(record, "time_invested", 0, 10 ** 9, 0),
+        last_reviewed=last_reviewed)
+
+
+def import_concepts(tracker, path: Union[str, Path], fmt: Optional[str] = None,
+                    chunk_size: int = CHUNK_SIZE) -> Dict:
+    """Validate and add every concept in a curriculum file, one batch per chunk.
+
+    Invalid records (bad ranges, missing fields, prerequisite cycles) are skipped
+    and the first few reported as (record number, message); everything else is committed chunk by
+    chunk, so memory stays bounded by the chunk size plus the tracker itself.
+    Prerequisites may refer to concepts further down the file; the ones no record
+    or existing concept defines are reported as unresolved.
+
+    The import runs under tracker.bulk_load(): SQLite rebuilds its concept indexes
+    once at the end, and with JSON storage, where every write rewrites the whole
+    file, the chunks are still validated and applied one by one but the file is
+    written once at the end.
+    """
+    start = time.perf_counter()
+    records = read_records(path, fmt, chunk_size)
+    stats = {"imported": 0, "rejected": 0, "errors": [], "unresolved": 0}
+    forward = set()  # prerequisites not defined when they were first referenced
+    with tracker.bulk_load():
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            known = tracker.data["concepts"]  # replaced when a write rebases onto another process's data
+            concepts, numbers = [], {}
+            for number, record in chunk:
+                try:
+                    concept = validate_record(record)
+                except RecordError as e:
+                    _reject(stats, number, str(e))
+                    continue
+                concepts.append(concept)
+                numbers[id(concept)] = number
+                forward.update(prereq for prereq in concept.prerequisites if prereq not in known)
+            rejected = tracker.add_concepts(concepts)
+            for concept, error in rejected:
+                _reject(stats, numbers[id(concept)], str(error))
+            stats["imported"] += len(concepts) - len(rejected)
+
+    stats["errors"].sort()
+    stats["unresolved"] = sum(1 for prereq in forward if prereq not in tracker.data["concepts"])
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def _reject(stats: Dict, number: int, message: str):
+    stats["rejected"] += 1
+    if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+        stats["errors"].append((number, message))
+
+
+# -- writing --------------------------------------------------------------------
+
+def _rows(concepts: Iterable[Dict]) -> Iterator[Dict]:
+    for concept in concepts:
+        yield {column: concept[column] for column in COLUMNS}
+
+
+def export_concepts(tracker, path: Union[str, Path], fmt: Optional[str] = None,
+                    chunk_size: int = CHUNK_SIZE) -> Dict:
+    """Write every tracked concept to a curriculum file that import_concepts reads back"""
+    fmt = file_format(path, fmt)
+    start = time.perf_counter()
+    concepts = tracker.data["concepts"]
+    rows = _rows(concepts.values())
+    count = 0
+    if fmt == "csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, COLUMNS)
+            writer.writeheader()
+            for row in rows:
+                row["prerequisites"] = PREREQ_SEPARATOR.join(row["prerequisites"])
+                writer.writerow(row)
+                count += 1
+    elif fmt == "jsonl":
+        with open(path, "w") as f:
+            for row in rows:
+                f.write(json.dumps(row, separators=(",", ":")) + "\n")
+                count += 1
+    elif fmt == "parquet":
+        pa = _pyarrow()
+        schema = pa.schema([("name", pa.string()), ("phase", pa.int8()), ("module", pa.string()),
+                            ("difficulty", pa.int8()), ("prerequisites", pa.list_(pa.string())),
+                            ("mastery_level", pa.int8()), ("time_invested", pa.int64()),
+                            ("last_reviewed", pa.string())])
+        with pa.parquet.ParquetWriter(path, schema) as writer:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                writer.write_table(pa.Table.from_pylist(chunk, schema))
+                count += len(chunk)
+    else:
+        raise ValueError(f"Unknown format '{fmt}'")
+    return {"exported": count, "seconds": time.perf_counter() - start}
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Operation metrics for the Complete Mathematics Mastery Tracker (and the solver notes)
+Per-operation call counts, wall time and bytes read/written, exported as JSON or
+Prometheus text; off unless enabled, when an instrumented call costs one flag check
+"""
+
+import atexit
+import functools
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+# Set to a file path to collect metrics for the whole process and write them there at exit
+ENV_VAR = "TRACKER_METRICS"
+
+PROMETHEUS_SUFFIXES = (".prom", ".txt")
+
+_enabled = False
+
+
+@dataclass
+class Operation:
+    """Running totals for one named operation"""
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+
+_operations: Dict[str, Operation] = {}
+_counters: Dict[str, int] = {}
+
+
+def _operation(name: str) -> Operation:
+    operation = _operations.get(name)
+    if operation is None:
+        operation = _operations[name] = Operation()
+    return operation
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    _operations.clear()
+    _counters.clear()
+
+
+def timed(name: str) -> Callable:
+    """Decorator: count calls to the function and time them under name (inclusive of callees)"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def record(name: str, seconds: float):
+    """Add one call taking seconds to an operation; the hook for code that times itself,
+    like the solver notes (gausianelimination.set_instrumentation(record))"""
+    if _enabled:
+        operation = _operation(name)
+        operation.calls += 1
+        operation.seconds += seconds
+        if seconds > operation.max_seconds:
+            operation.max_seconds = seconds
+
+
+def add_bytes(name: str, read: int = 0, written: int = 0):
+    """Attribute bytes read and/or written to an operation"""
+    if _enabled:
+        operation = _operation(name)
+        operation.bytes_read += read
+        operation.bytes_written += written
+
+
+def count(name: str, amount: int = 1):
+    """Add to a plain counter (rows eliminated, rows written, ...)"""
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+# -- export ---------------------------------------------------------------------
+
+def snapshot() -> Dict:
+    """Everything collected so far as plain data"""
+    return {"operations": {name: asdict(operation) for name, operation in sorted(_operations.items())},
+            "counters": dict(sorted(_counters.items()))}
+
+
+def to_json() -> str:
+    return json.dumps(snapshot(), indent=2)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_prometheus(prefix: str = "tracker") -> str:
+    """Prometheus text exposition format (counters, one series per operation)"""
+    series = [("calls_total", "Calls of the operation", "calls"),
+              ("seconds_total", "Wall time spent in the operation", "seconds"),
+              ("max_seconds", "Slowest single call of the operation", "max_seconds"),
+              ("read_bytes_total", "Bytes the operation read", "bytes_read"),
+              ("written_bytes_total", "Bytes the operation wrote", "bytes_written")]
+    lines = []
+    for suffix, help_text, field in series:
+        metric = f"{prefix}_operation_{suffix}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {'gauge' if field == 'max_seconds' else 'counter'}")
+        for name, operation in sorted(_operations.items()):
+            lines.append(f'{metric}{{operation="{_label(name)}"}} {getattr(operation, field)}')
+    if _counters:
+        metric = f"{prefix}_events_total"
+        lines.append(f"# HELP {metric} Work items counted inside operations")
+        lines.append(f"# TYPE {metric} counter")
+        for name, value in sorted(_counters.items()):
+            lines.append(f'{metric}{{counter="{_label(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def write(path: Union[str, Path], fmt: Optional[str] = None):
+    """Write the metrics as "json" or "prometheus" (default: from the suffix, .prom/.txt for Prometheus)"""
+    path = Path(path)
+    if fmt is None:
+        fmt = "prometheus" if path.suffix in PROMETHEUS_SUFFIXES else "json"
+    path.write_text(to_prometheus() if fmt == "prometheus" else to_json())
+
+
+def summary(limit: int = 15) -> str:
+    """The operations that took the most time, as a small table"""
+    rows = sorted(_operations.items(), key=lambda item: item[1].seconds, reverse=True)[:limit]
+    lines = [f"{'operation':<36} {'calls':>8} {'total ms':>10} {'max ms':>9} {'read':>10} {'written':>10}"]
+    for name, operation in rows:
+        lines.append(f"{name:<36} {operation.calls:>8} {operation.seconds * 1000:>10.2f} "
+                     f"{operation.max_seconds * 1000:>9.2f} {operation.bytes_read:>10} {operation.bytes_written:>10}")
+    return "\n".join(lines)
+
+
+# -- whole-process profiling ----------------------------------------------------
+
+def profile_until_exit(prefix: Union[str, Path], fmt: str = "json") -> Dict[str, Path]:
+    """Collect metrics and run cProfile from now until the process exits, then write
+    <prefix>.pstats (for snakeviz, gprof2dot or flameprof) and the metrics file.
+
+    Returns the paths that will be written.
+    """
+    import cProfile
+
+    paths = {"pstats": Path(f"{prefix}.pstats"),
+             "metrics": Path(f"{prefix}.metrics.{'prom' if fmt == 'prometheus' else 'json'}")}
+    enable()
+    profiler = cProfile.Profile()
+
+    def finish():
+        profiler.disable()
+        profiler.dump_stats(paths["pstats"])
+        write(paths["metrics"], fmt)
+
+    atexit.register(finish)
+    profiler.enable()
+    return paths
+
+
+if os.environ.get(ENV_VAR):
+    enable()
+    atexit.register(write, os.environ[ENV_VAR])
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Phase catalog and learning paths for the Complete Mathematics Mastery Tracker
+The catalog is built once per process as read-only data; learning paths are
+memoized and milestone plans follow the current progress and study velocity
+"""
+
+import datetime
+import functools
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+MAX_MASTERY = 5
+DAYS_PER_MONTH = 30
+ONGOING_PHASE_MONTHS = 12  # planning length for phases with an open-ended duration
+PATH_CACHE_SIZE = 4096
+PHASE_NUMBERS = tuple(range(1, 10))
+
+
+def _freeze(value):
+    """Read-only copy of nested dicts and lists (mapping proxies and tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Plain, independent dicts and lists back from a _freeze()d value"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+PHASE_CATALOG = _freeze({
+    1: {
+        "name": "Foundation (Matematik 5000 4&5)",
+        "duration_weeks": 14,
+        "level": "Advanced High School → Early College",
+        "modules": [
+            "Complex Numbers & Advanced Algebra",
+            "Sequences & Series", 
+            "Differential & Integral Calculus",
+            "Differential Equations",
+            "Linear Algebra Fundamentals",
+            "Vector Calculus & Statistics"
+        ]
+    },
+    2: {
+        "name": "Undergraduate Core Mathematics", 
+        "duration_months": 20,
+        "level": "College Sophomore → Junior",
+        "modules": [
+            "Advanced Calculus & Real Analysis",
+            "Abstract Algebra",
+            "Advanced Linear Algebra", 
+            "Discrete Mathematics & Combinatorics",
+            "Ordinary Differential Equations (Advanced)",
+            "Probability Theory & Statistics",
+            "Mathematical Logic & Set Theory",
+            "Introduction to Topology",
+            "Complex Analysis",
+            "Numerical Analysis"
+        ]
+    },
+    3: {
+        "name": "Advanced Undergraduate",
+        "duration_months": 12, 
+        "level": "Senior Undergraduate → Graduate Preparation",
+        "modules": [
+            "Advanced Real Analysis",
+            "Advanced Abstract Algebra",
+            "Differential Geometry",
+            "Algebraic Topology", 
+            "Partial Differential Equations",
+            "Mathematical Physics"
+        ]
+    },
+    4: {
+        "name": "Graduate Foundations",
+        "duration_months": 24,
+        "level": "First-Year Graduate",
+        "modules": [
+            "Advanced Functional Analysis",
+            "Algebraic Geometry",
+            "Number Theory (Advanced)",
+            "Representation Theory",
+            "Advanced Topology",
+            "Advanced Probability",
+            "Advanced Differential Equations",
+            "Mathematical Logic (Advanced)"
+        ]
+    },
+    5: {
+        "name": "Advanced Graduate",
+        "duration_months": 12,
+        "level": "Advanced Graduate → PhD Candidacy", 
+        "modules": [
+            "Research Area Specialization",
+            "Advanced Research Methods"
+        ]
+    },
+    6: {
+        "name": "Research Preparation",
+        "duration_months": 12,
+        "level": "PhD Research Preparation",
+        "modules": [
+            "Literature Mastery",
+            "Research Problem Identification", 
+            "Advanced Seminar Participation",
+            "Qualifying Examination Preparation"
+        ]
+    },
+    7: {
+        "name": "Specialized Research Tracks",
+        "duration_months": 12,
+        "level": "Advanced PhD Research",
+        "modules": [
+            "Pure Mathematics Research Frontiers",
+            "Applied Mathematics Research Frontiers",
+            "Computational & Data Science"
+        ]
+    },
+    8: {
+        "name": "Cutting-Edge Research Topics", 
+        "duration_months": 12,
+        "level": "Research Leadership",
+        "modules": [
+            "Emerging Mathematical Fields",
+            "Advanced Research Methodologies",
+            "Mathematical Innovation",
+            "Research Impact & Legacy"
+        ]
+    },
+    9: {
+        "name": "Mathematical Frontiers & Beyond",
+        "duration_months": "Ongoing",
+        "level": "Research Pioneer",
+        "modules": [
+            "Unsolved Problems & Grand Challenges",
+            "Future Mathematics"
+        ]
+    }
+})
+
+CAREER_PATHS = _freeze({
+    "academic": {
+        "required_phases": [1, 2, 3, 4, 5, 6, 7, 8],
+        "emphasis": ["theoretical_depth", "research_skills", "publication"],
+        "timeline_multiplier": 1.2  # Academic path takes longer
+    },
+    "industry": {
+        "required_phases": [1, 2, 3, 4, 5, 6],
+        "emphasis": ["applied_skills", "computational", "collaboration"],
+        "timeline_multiplier": 0.8  # Industry path can be faster
+    },
+    "consulting": {
+        "required_phases": [1, 2, 3, 4, 5],
+        "emphasis": ["broad_knowledge", "communication", "problem_solving"],
+        "timeline_multiplier": 0.7
+    },
+    "tech": {
+        "required_phases": [1, 2, 3, 4, 5, 7],  # Skip some pure math, focus on computational
+        "emphasis": ["programming", "algorithms", "machine_learning"],
+        "timeline_multiplier": 0.6
+    }
+})
+
+
+def _planned_months(info) -> float:
+    if "duration_weeks" in info:
+        return info["duration_weeks"] * 7 / DAYS_PER_MONTH
+    return info["duration_months"] if isinstance(info["duration_months"], int) else ONGOING_PHASE_MONTHS
+
+
+PHASE_MONTHS = MappingProxyType({phase: _planned_months(info) for phase, info in PHASE_CATALOG.items()})
+
+
+def planned_milestones(phases: Sequence[int], today: datetime.date) -> List[Dict]:
+    """Phase completion dates if every phase takes its catalog duration, starting today"""
+    milestones = []
+    cumulative_time = 0
+
+    for phase in phases:
+        phase_info = PHASE_CATALOG[phase]
+        cumulative_time += PHASE_MONTHS[phase]
+        milestone_date = today + datetime.timedelta(days=cumulative_time * DAYS_PER_MONTH)
+
+        milestones.append({
+            "phase": phase,
+            "name": phase_info["name"],
+            "target_date": milestone_date.isoformat(),
+            "level": phase_info["level"],
+            "key_skills": list(phase_info["modules"][:3])  # Top 3 modules
+        })
+
+    return milestones
+
+
+def plan_milestones(phases: Sequence[int], allocation: Dict[int, float], progress: Sequence[float],
+                    concepts: Sequence[int], velocity: float, today: datetime.date) -> List[Dict]:
+    """Projected phase completion dates from where the learner is now.
+
+    Phases are finished in order. A phase with tracked concepts takes its remaining
+    mastery levels divided by the measured velocity (levels per day); without
+    concepts or without a velocity it takes the unfinished share of its allocated
+    months. progress and concepts are indexed by phase - 1.
+    """
+    milestones = []
+    elapsed = 0.0
+    for phase in phases:
+        remaining = max(0.0, 1.0 - progress[phase - 1])
+        if remaining == 0:
+            days, basis = 0.0, "completed"
+        elif concepts[phase - 1] and velocity > 0:
+            days, basis = remaining * MAX_MASTERY * concepts[phase - 1] / velocity, "velocity"
+        else:
+            days, basis = remaining * allocation[phase] * DAYS_PER_MONTH, "plan"
+        elapsed += days
+        milestones.append({
+            "phase": phase,
+            "name": PHASE_CATALOG[phase]["name"],
+            "progress": progress[phase - 1] * 100,
+            "remaining_days": days,
+            "target_date": (today + datetime.timedelta(days=round(elapsed))).isoformat(),
+            "basis": basis,
+        })
+    return milestones
+
+
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def learning_path(career_goal: str, timeline_years: float, progress: Tuple[float, ...],
+                  concepts: Tuple[int, ...], velocity: float, today: datetime.date) -> MappingProxyType:
+    """A learning path for a career goal, memoized on all of its inputs.
+
+    The result is shared between callers with the same inputs, so it is read-only
+    (mapping proxies and tuples); thaw() it for a copy to modify.
+    """
+    if career_goal not in CAREER_PATHS:
+        return _freeze({"error": "Invalid career goal"})
+
+    path = CAREER_PATHS[career_goal]
+    adjusted_timeline = timeline_years * path["timeline_multiplier"]
+    phases = list(path["required_phases"])
+
+    # Calculate time allocation for each phase
+    total_months = sum(PHASE_MONTHS[phase] for phase in phases)
+    time_allocation = {phase: (PHASE_MONTHS[phase] / total_months) * (adjusted_timeline * 12)
+                       for phase in phases}
+
+    return _freeze({
+        "career_goal": career_goal,
+        "timeline_years": adjusted_timeline,
+        "required_phases": phases,
+        "emphasis_areas": list(path["emphasis"]),
+        "time_allocation": time_allocation,
+        "milestones": planned_milestones(phases, today),
+        "projected_milestones": plan_milestones(phases, time_allocation, progress, concepts, velocity, today),
+    })
+
+
+def learning_path_grid(career_goals: Iterable[str], timelines: Iterable[float], progress: Sequence[float],
+                       concepts: Sequence[int], velocity: float) -> Dict:
+    """plan_milestones for every (goal, timeline) pair at once, as NumPy arrays.
+
+    Returns, with G goals, T timelines and the 9 phases on the last axis:
+    - timeline_years (G, T): timelines after each goal's multiplier
+    - allocation_months (G, T, 9): allocated months, 0 for phases a goal skips
+    - milestone_days (G, T, 9): days from today until each phase is done, NaN if skipped
+    - completion_days (G, T): days from today until the whole path is done
+    """
+    import numpy as np
+
+    career_goals = list(career_goals)
+    timelines = np.asarray(list(timelines), dtype=float)
+    unknown = [goal for goal in career_goals if goal not in CAREER_PATHS]
+    if unknown:
+        raise ValueError(f"Invalid career goal(s): {', '.join(unknown)}")
+
+    required = np.zeros((len(career_goals), len(PHASE_NUMBERS)), dtype=bool)
+    for i, goal in enumerate(career_goals):
+        required[i, np.asarray(CAREER_PATHS[goal]["required_phases"]) - 1] = True
+    multiplier = np.array([CAREER_PATHS[goal]["timeline_multiplier"] for goal in career_goals])
+    months = np.array([PHASE_MONTHS[phase] for phase in PHASE_NUMBERS])
+
+    share = np.where(required, months, 0.0)
+    share /= share.sum(axis=1, keepdims=True)
+    adjusted = multiplier[:, None] * timelines[None, :]
+    allocation = share[:, None, :] * adjusted[:, :, None] * 12
+
+    remaining = np.clip(1.0 - np.asarray(progress, dtype=float), 0.0, None)
+    concepts = np.asarray(concepts, dtype=float)
+    by_velocity = (concepts > 0) & (velocity > 0)
+    velocity_days = np.divide(remaining * MAX_MASTERY * concepts, velocity if velocity > 0 else 1.0)
+    days = np.where(by_velocity, velocity_days, remaining * allocation * DAYS_PER_MONTH)
+    days = np.where(required[:, None, :], days, 0.0)
+
+    return {
+        "career_goals": career_goals,
+        "timelines": timelines,
+        "timeline_years": adjusted,
+        "allocation_months": allocation,
+        "milestone_days": np.where(required[:, None, :], np.cumsum(days, axis=2), np.nan),
+        "completion_days": days.sum(axis=2),
+    }
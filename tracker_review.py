@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Spaced-repetition scheduling for the Complete Mathematics Mastery Tracker
+SM-2 style ease/interval updates with a due-date index for fast "what is due" queries
+"""
+
+import bisect
+import datetime
+import functools
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from tracker_store import ConceptStore
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_QUALITY = 3  # SM-2 grades below this restart the repetitions
+
+# Concepts reviewed before scheduling existed come due this many days after
+# their last review (the old fixed 30-day rule); never-reviewed ones are due now
+LEGACY_REVIEW_DAYS = 30
+NEVER_REVIEWED = "1900-01-01"
+
+DateLike = Union[str, datetime.date]
+
+
+def _as_date(value: Optional[DateLike]) -> datetime.date:
+    if value is None:
+        return datetime.date.today()
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    return value
+
+
+@functools.lru_cache(maxsize=4096)
+def _ordinal(iso_date: str) -> int:
+    """Day number of an ISO date; the few distinct due dates are parsed once each"""
+    return datetime.date.fromisoformat(iso_date).toordinal()
+
+
+def _iso(ordinal: int) -> str:
+    return datetime.date.fromordinal(ordinal).isoformat()
+
+
+def sm2_update(state: Optional[Dict], quality: int, reviewed_on: datetime.date) -> Dict:
+    """Next SM-2 state after a review graded 0-5 (the tracker's mastery scale)"""
+    state = state or {}
+    ease = state.get("ease", DEFAULT_EASE)
+    interval = state.get("interval", 0)
+    repetitions = state.get("repetitions", 0)
+
+    if quality >= PASSING_QUALITY:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = round(interval * ease)
+        repetitions += 1
+    else:
+        repetitions = 0
+        interval = 1
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+    return {
+        "ease": round(ease, 4),
+        "interval": interval,
+        "repetitions": repetitions,
+        "last_review": reviewed_on.isoformat(),
+        "due": (reviewed_on + datetime.timedelta(days=interval)).isoformat(),
+    }
+
+
+class ReviewScheduler:
+    """Per-concept review state plus a due-date index over the ConceptStore's concept ids.
+
+    The state dicts live in the tracker's "spaced_repetition" section and are
+    updated in place. Each concept id's due date is kept as a day ordinal, and the
+    ids are kept sorted by (due date, name), which answers "due on a date" and
+    "next N reviews" with a binary search plus the k results, instead of a scan
+    over every concept. Newly tracked concepts are only appended and merged in by
+    one sort when the index is next used, so adding many concepts does not insert
+    them one by one.
+    """
+
+    def __init__(self, states: Dict[str, Dict], concepts: ConceptStore):
+        self.states = states
+        self.concepts = concepts
+        self._due = array("i")  # due date ordinal per concept id, 0 if not scheduled
+        for name, concept in concepts.items():
+            concept_id = concepts.id_of(name)
+            self._reserve(concept_id)
+            self._due[concept_id] = _ordinal(self._initial_due(name, concept))
+        self._rebuild_index()
+
+    def _initial_due(self, name: str, concept: Dict) -> str:
+        if name in self.states:
+            return self.states[name]["due"]
+        last_reviewed = concept.get("last_reviewed")
+        if not last_reviewed:
+            return NEVER_REVIEWED
+        due = datetime.date.fromisoformat(last_reviewed) + datetime.timedelta(days=LEGACY_REVIEW_DAYS + 1)
+        return due.isoformat()
+
+    def _reserve(self, concept_id: int):
+        missing = concept_id + 1 - len(self._due)
+        if missing > 0:
+            self._due.frombytes(bytes(missing * self._due.itemsize))
+
+    def _key(self, concept_id: int) -> Tuple[int, str]:
+        return self._due[concept_id], self.concepts.name_of(concept_id)
+
+    def _rebuild_index(self):
+        scheduled = (concept_id for concept_id, due in enumerate(self._due) if due)
+        self._index = array("i", sorted(scheduled, key=self._key))
+        self._unsorted: List[int] = []
+
+    def _sorted_index(self) -> array:
+        if self._unsorted:
+            # two sorted runs: the sort is a linear merge
+            self._index = array("i", sorted([*self._index, *sorted(self._unsorted, key=self._key)], key=self._key))
+            self._unsorted = []
+        return self._index
+
+    def _unindex(self, concept_id: int):
+        index = self._sorted_index()
+        del index[bisect.bisect_left(index, self._key(concept_id), key=self._key)]
+
+    def _set_due(self, concept_id: int, due: int):
+        self._reserve(concept_id)
+        if self._due[concept_id]:
+            self._unindex(concept_id)
+        self._due[concept_id] = due
+        bisect.insort(self._sorted_index(), concept_id, key=self._key)
+
+    def track(self, name: str, concept: Dict):
+        """Start scheduling a concept (no-op if it is already scheduled)"""
+        concept_id = self.concepts.intern(name)
+        self._reserve(concept_id)
+        if not self._due[concept_id]:
+            self._due[concept_id] = _ordinal(self._initial_due(name, concept))
+            self._unsorted.append(concept_id)
+
+    def reschedule(self, name: str, concept: Dict):
+        """Re-read a concept's due date after its state or concept changed elsewhere"""
+        concept_id = self.concepts.intern(name)
+        due = _ordinal(self._initial_due(name, concept))
+        self._reserve(concept_id)
+        if self._due[concept_id] != due:
+            self._set_due(concept_id, due)
+
+    def untrack(self, name: str):
+        """Stop scheduling a concept"""
+        concept_id = self.concepts.intern(name)
+        if concept_id < len(self._due) and self._due[concept_id]:
+            self._unindex(concept_id)
+            self._due[concept_id] = 0
+
+    def review(self, name: str, quality: int, reviewed_on: Optional[DateLike] = None) -> Dict:
+        """Record a review and reschedule the concept"""
+        state = sm2_update(self.states.get(name), quality, _as_date(reviewed_on))
+        self.states[name] = state
+        self._set_due(self.concepts.intern(name), _ordinal(state["due"]))
+        return state
+
+    def replay(self, reviews: Iterable[Tuple[str, int, DateLike]]) -> Set[str]:
+        """Apply a review log in order, re-sorting the index once at the end; returns the concepts touched"""
+        touched = set()
+        for name, quality, reviewed_on in reviews:
+            state = sm2_update(self.states.get(name), quality, _as_date(reviewed_on))
+            self.states[name] = state
+            concept_id = self.concepts.intern(name)
+            self._reserve(concept_id)
+            self._due[concept_id] = _ordinal(state["due"])
+            touched.add(name)
+        self._rebuild_index()
+        return touched
+
+    def due(self, on: Optional[DateLike] = None, limit: Optional[int] = None) -> List[str]:
+        """Concepts due on or before a date (default today), most overdue first"""
+        index = self._sorted_index()
+        end = bisect.bisect_right(index, (_as_date(on).toordinal(), "\U0010ffff"), key=self._key)
+        if limit is not None:
+            end = min(end, limit)
+        name_of = self.concepts.name_of
+        return [name_of(concept_id) for concept_id in index[:end]]
+
+    def upcoming(self, count: int) -> List[Tuple[str, str]]:
+        """The next count reviews as (concept, due date), whenever they fall"""
+        return [(self.concepts.name_of(concept_id), _iso(self._due[concept_id]))
+                for concept_id in self._sorted_index()[:count]]
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Local HTTP/JSON API for the Complete Mathematics Mastery Tracker
+Keeps one tracker resident in an asyncio server: reads are answered from memory,
+writes are serialized and persisted in the background
+"""
+
+import asyncio
+import contextlib
+import datetime
+import json
+import signal
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+PERSIST_INTERVAL = 1.0  # seconds between background flushes
+MAX_BODY = 1 << 20
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    """An error answered to the client as {"error": message} with this status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TrackerServer:
+    """Serves a CompleteMathTracker over HTTP/1.1 with keep-alive.
+
+    GET  /report, /recommendations, /path?goal=...&timeline=..., /due?limit=..., /health
+    POST /mastery  {"concept": ..., "level": 0-5, "minutes": ...}
+
+    Everything runs on one event loop, so readers never wait on each other and
+    always see a consistent tracker. Writes take a lock that the background flush
+    also holds while the held-back changes are written from a worker thread; what
+    other processes stored meanwhile is brought into the tracker back on the loop.
+    GET responses are cached until the next change (or the next day, since due
+    reviews and milestone dates depend on today).
+    """
+
+    def __init__(self, tracker, persist_interval: float = PERSIST_INTERVAL):
+        self.tracker = tracker
+        self.persist_interval = persist_interval
+        self.version = 0  # bumped on every change to the tracker, invalidates the response cache
+        self._cache: Dict[str, bytes] = {}
+        self._cache_stamp: Optional[Tuple[int, datetime.date]] = None
+        self._write_lock = asyncio.Lock()
+        tracker.defer_writes()
+
+    # -- routes ---------------------------------------------------------------
+
+    def _get(self, path: str, query: Dict[str, str]) -> Dict:
+        if path == "/report":
+            return self.tracker.generate_comprehensive_report()
+        if path == "/recommendations":
+            return self.tracker.get_current_recommendations()
+        if path == "/path":
+            if "goal" not in query:
+                raise HTTPError(400, "Missing 'goal' parameter")
+            path_info = self.tracker.generate_learning_path(query["goal"].lower(),
+                                                            self._int(query.get("timeline", "8"), "timeline"))
+            if "error" in path_info:
+                raise HTTPError(400, path_info["error"])
+            return path_info
+        if path == "/due":
+            limit = self._int(query["limit"], "limit") if "limit" in query else None
+            return {"due": self.tracker.reviews_due(query.get("on"), limit)}
+        if path == "/health":
+            return {"status": "ok", "version": self.version}
+        raise HTTPError(404, f"No route for GET {path}")
+
+    async def _post(self, path: str, body: Dict) -> Dict:
+        if path != "/mastery":
+            raise HTTPError(404, f"No route for POST {path}")
+        concept = body.get("concept")
+        level = body.get("level")
+        minutes = body.get("minutes", 0)
+        if not isinstance(concept, str) or not isinstance(level, int) or not isinstance(minutes, int):
+            raise HTTPError(400, "Expected {\"concept\": str, \"level\": int, \"minutes\": int}")
+        if not 0 <= level <= 5:
+            raise HTTPError(400, "Mastery level must be between 0 and 5")
+        async with self._write_lock:
+            if concept not in self.tracker.data["concepts"]:
+                raise HTTPError(404, f"Unknown concept '{concept}'")
+            self.tracker.update_mastery(concept, level, minutes)
+            self.version += 1
+            current = self.tracker.data["concepts"][concept]
+            return {"concept": concept, "mastery_level": current["mastery_level"],
+                    "time_invested": current["time_invested"], "version": self.version}
+
+    @staticmethod
+    def _int(value: str, name: str) -> int:
+        try:
+            return int(value)
+        except ValueError:
+            raise HTTPError(400, f"'{name}' must be an integer") from None
+
+    async def handle(self, method: str, target: str, body: bytes) -> Tuple[int, bytes]:
+        """Route one request; returns (status, JSON body)"""
+        url = urlsplit(target)
+        try:
+            if method == "GET":
+                stamp = (self.version, datetime.date.today())
+                if stamp != self._cache_stamp:
+                    self._cache.clear()
+                    self._cache_stamp = stamp
+                payload = self._cache.get(target)
+                if payload is None:
+                    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                    payload = self._cache[target] = json.dumps(self._get(url.path, query)).encode()
+                return 200, payload
+            if method == "POST":
+                try:
+                    data = json.loads(body or b"{}")
+                except ValueError:
+                    raise HTTPError(400, "Request body is not valid JSON") from None
+                if not isinstance(data, dict):
+                    raise HTTPError(400, "Request body must be a JSON object")
+                return 200, json.dumps(await self._post(url.path, data)).encode()
+            raise HTTPError(405, f"Method {method} not allowed")
+        except HTTPError as e:
+            return e.status, json.dumps({"error": str(e)}).encode()
+        except Exception as e:
+            return 500, json.dumps({"error": f"{type(e).__name__}: {e}"}).encode()
+
+    # -- HTTP -----------------------------------------------------------------
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY:
+                    status, payload = 413, json.dumps({"error": "Request body too large"}).encode()
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.handle(method.upper(), target, body)
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    # -- persistence ----------------------------------------------------------
+
+    async def flush(self) -> bool:
+        """Write the held-back changes from a worker thread, with writers paused"""
+        async with self._write_lock:
+            others = await asyncio.get_running_loop().run_in_executor(None, self.tracker.write_held)
+            if others is None:
+                return False
+            # Adopting mutates the tracker, so it happens here on the loop, between requests
+            if self.tracker.adopt(others):
+                self.version += 1
+            return True
+
+    async def _persist_loop(self):
+        while True:
+            await asyncio.sleep(self.persist_interval)
+            try:
+                await self.flush()
+            except Exception as e:  # keep serving; the changes stay queued for the next attempt
+                print(f"⚠️  Background save failed: {type(e).__name__}: {e}")
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    ready: Optional[asyncio.Event] = None):
+        """Serve until cancelled, then write out anything still pending"""
+        server = await asyncio.start_server(self._client, host, port)
+        persister = asyncio.create_task(self._persist_loop())
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            persister.cancel()
+            await self.flush()
+
+
+def serve(tracker, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          persist_interval: float = PERSIST_INTERVAL):
+    """Run the API in the foreground until interrupted (Ctrl+C or SIGTERM)"""
+    async def main():
+        with contextlib.suppress(NotImplementedError):  # no signal handlers on Windows
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        await TrackerServer(tracker, persist_interval).serve(host, port)
+
+    print(f"🌐 Serving tracker API on http://{host}:{port} (Ctrl+C to stop)", flush=True)
+    try:
+        asyncio.run(main())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    print("💾 Pending changes saved", flush=True)
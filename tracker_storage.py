@@ -0,0 +1,647 @@
+#!/usr/bin/env python3
+"""
+Storage backends for the Complete Mathematics Mastery Tracker
+JSON (one document, the original format) or SQLite (indexed tables, per-row updates)
+
+Both are safe for several processes sharing one file: writes are atomic and
+checked against the version that was loaded, and a write that finds a newer
+version rebases its changes onto it instead of overwriting them. The write then
+reports what the other processes stored (StoredChanges), so the caller can
+bring just those entries into memory.
+"""
+
+import json
+import operator
+import os
+import re
+import tempfile
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from tracker_metrics import add_bytes, count, timed
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic renames
+    fcntl = None
+
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+# A JSON document starts with its generation, so a writer can check it from the first bytes
+GENERATION_KEY = "_generation"
+_GENERATION_HEAD = re.compile(rb'\{\s*"' + GENERATION_KEY.encode() + rb'":\s*(\d+)')
+
+# Marks a key that is in a ChangeSet but no longer in the data
+_DELETED = object()
+
+# Given what other processes stored since our version, returns the sections the write
+# replaces wholesale, recomputed over their data and ours (derived totals)
+Rebase = Callable[["StoredChanges"], Dict]
+
+
+class StaleDataError(RuntimeError):
+    """Raised when the stored data changed since it was loaded and the write has no rebase"""
+
+
+def _to_json(value):
+    """json.dump default= hook: mapping-like stores (see tracker_store) become plain dicts"""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+@dataclass
+class ChangeSet:
+    """Which parts of the tracker data changed since the last write"""
+    keys: Dict[str, Set[str]] = field(default_factory=dict)  # dict section -> changed or deleted keys
+    appended: Dict[str, int] = field(default_factory=dict)   # list section -> items appended at the end
+    sections: Set[str] = field(default_factory=set)          # sections replaced wholesale
+
+    def touch(self, section: str, key: str) -> "ChangeSet":
+        self.keys.setdefault(section, set()).add(key)
+        return self
+
+    def append(self, section: str, count: int = 1) -> "ChangeSet":
+        self.appended[section] = self.appended.get(section, 0) + count
+        return self
+
+    def replace(self, section: str) -> "ChangeSet":
+        self.sections.add(section)
+        return self
+
+    def merge(self, other: "ChangeSet") -> "ChangeSet":
+        for section, keys in other.keys.items():
+            self.keys.setdefault(section, set()).update(keys)
+        for section, count in other.appended.items():
+            self.append(section, count)
+        self.sections |= other.sections
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(self.keys or self.appended or self.sections)
+
+
+@dataclass
+class StoredChanges:
+    """What other processes stored since our version, apart from the parts we wrote ourselves"""
+    keys: Dict[str, Dict[str, Dict]] = field(default_factory=dict)  # dict section -> key -> stored value
+    deleted: Dict[str, Set[str]] = field(default_factory=dict)      # dict section -> keys no longer stored
+    appended: Dict[str, Tuple[int, List]] = field(default_factory=dict)  # list section -> (position, items)
+    sections: Dict[str, object] = field(default_factory=dict)       # replaced sections, as stored after our write
+
+    def __bool__(self) -> bool:
+        return bool(self.keys or self.deleted or self.appended or self.sections)
+
+
+def _plain(value):
+    return value.to_dict() if hasattr(value, "to_dict") else value
+
+
+def _diff(document: Dict, data: Dict, changes: ChangeSet) -> StoredChanges:
+    """What a newer stored document holds that data does not, apart from the parts changes covers"""
+    others = StoredChanges()
+    for section, stored in document.items():
+        if section in changes.sections:
+            continue
+        ours = data.get(section, _DELETED)
+        if isinstance(stored, Mapping) and isinstance(ours, Mapping):
+            skip = changes.keys.get(section, ())
+            for key, value in stored.items():
+                if key not in skip and _plain(ours.get(key, _DELETED)) != value:
+                    others.keys.setdefault(section, {})[key] = value
+            deleted = {key for key in ours if key not in stored and key not in skip}
+            if deleted:
+                others.deleted[section] = deleted
+        elif isinstance(stored, list) and isinstance(ours, list):
+            known = len(ours) - changes.appended.get(section, 0)
+            if stored[:known] != ours[:known]:
+                others.sections[section] = stored
+            elif len(stored) > known:
+                others.appended[section] = (known, stored[known:])
+        elif stored != ours:
+            others.sections[section] = stored
+    return others
+
+
+def _apply(document: Dict, data: Dict, changes: ChangeSet, sections: Dict) -> Dict:
+    """Write changes from data over a newer stored document; sections replace ours wholesale"""
+    for section, keys in changes.keys.items():
+        if section in changes.sections:
+            continue
+        target = document.setdefault(section, {})
+        for key in keys:
+            value = data[section].get(key, _DELETED)
+            if value is _DELETED:
+                target.pop(key, None)
+            else:
+                target[key] = _plain(value)
+    for section, count in changes.appended.items():
+        if count and section not in changes.sections:
+            document.setdefault(section, []).extend(data[section][-count:])
+    for section in changes.sections:
+        document[section] = sections[section] if section in sections else data[section]
+    return document
+
+
+class JsonStorage:
+    """The whole tracker document in one JSON file; every write rewrites the file.
+
+    The version of the document is a generation counter stored as its first key
+    and bumped by every write, so two different documents never share a version
+    (file identity does not work: renames reuse inodes, timestamps are coarse and
+    sizes repeat). Writes hold an exclusive lock on a sidecar ".lock" file only for
+    the check-and-rename step; loading takes no lock at all.
+
+    A write also fsyncs the new file before the rename, so many small changes
+    in a row are best grouped (tracker.batch() or tracker.held_writes()).
+    """
+
+    name = "json"
+    incremental = False  # a write costs the whole document, however little changed
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.version: Optional[int] = None  # generation last loaded or written, None: no file
+
+    def _current_version(self) -> Optional[int]:
+        try:
+            with open(self.path, 'rb') as f:
+                head = f.read(64)
+        except FileNotFoundError:
+            return None
+        match = _GENERATION_HEAD.match(head)
+        return int(match.group(1)) if match else 0  # written before generations were stored
+
+    @timed("storage.json.load")
+    def load(self) -> Optional[Dict]:
+        try:
+            f = open(self.path, 'r')
+        except FileNotFoundError:
+            self.version = None
+            return None
+        with f:
+            add_bytes("storage.json.load", read=os.fstat(f.fileno()).st_size)
+            data = json.load(f)
+        self.version = data.pop(GENERATION_KEY, 0)  # of the exact document read
+        return data
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    @timed("storage.json.replace")
+    def _replace(self, data: Dict, generation: int):
+        # Write a temporary file and rename it over the old one, so readers
+        # and crashes only ever see a complete document
+        fd, tmp_path = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp",
+                                        dir=str(self.path.parent))
+        try:
+            os.chmod(tmp_path, self.path.stat().st_mode & 0o777 if self.path.exists() else 0o644)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({GENERATION_KEY: generation, **data}, f, indent=2, default=_to_json)
+                f.flush()
+                os.fsync(f.fileno())
+                add_bytes("storage.json.replace", written=f.tell())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.version = generation
+
+    def save(self, data: Dict):
+        """Replace the stored document with data, whatever version is on disk"""
+        with self._locked():
+            self._replace(data, (self._current_version() or 0) + 1)
+
+    @timed("storage.json.write")
+    def write(self, data: Dict, changes: ChangeSet, rebase: Optional[Rebase] = None) -> StoredChanges:
+        """Store data; if another process wrote since our version, store our changes over
+        its document instead. Returns what the other processes stored."""
+        others = StoredChanges()
+        with self._locked():
+            current = self._current_version()
+            if current != self.version:
+                if rebase is None:
+                    raise StaleDataError(f"{self.path} changed since it was loaded")
+                with open(self.path, 'r') as f:
+                    add_bytes("storage.json.write", read=os.fstat(f.fileno()).st_size)
+                    stored = json.load(f)
+                stored.pop(GENERATION_KEY, None)
+                others = _diff(stored, data, changes)
+                data = _apply(stored, data, changes, rebase(others))
+            # A JSON document cannot be patched in place
+            self._replace(data, (current or 0) + 1)
+        return others
+
+    @contextmanager
+    def bulk_load(self):
+        """Nothing to set up: a bulk load is one whole-document write either way"""
+        yield self
+
+    def close(self):
+        pass
+
+
+class SqliteStorage:
+    """Tracker data in SQLite: concepts, projects and study sessions as indexed tables.
+
+    Every other section is kept generically: dict sections as (section, key) rows,
+    list sections as ordered rows, scalars as single values. A write only touches
+    the rows named in its ChangeSet, inside one transaction.
+
+    Every write also logs the keys and sections it changed under a new generation,
+    so a connection that finds another one wrote since its version reads back just
+    those rows instead of everything.
+    """
+
+    name = "sqlite"
+    incremental = True
+
+    CHANGELOG_GENERATIONS = 1000  # writes kept in the change log; a reader further behind reloads in full
+    CHANGELOG_KEYS = 1000         # a write changing more keys of a section logs the section as replaced
+
+    CONCEPT_COLUMNS = ["name", "phase", "module", "difficulty", "prerequisites",
+                       "mastery_level", "time_invested", "last_reviewed"]
+    CONCEPT_INDEXES = ["concepts_phase", "concepts_module", "concepts_mastery"]
+
+    # List sections with their own table, and the item fields promoted to indexed columns
+    LIST_TABLES = {
+        "research_projects": ("research_projects", ["title", "phase", "status"]),
+        "study_sessions": ("study_sessions", ["concept", "date"]),
+    }
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sections (
+            name TEXT PRIMARY KEY, kind TEXT NOT NULL, position INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS concepts (
+            name TEXT PRIMARY KEY, phase INTEGER, module TEXT, difficulty INTEGER,
+            prerequisites TEXT, mastery_level INTEGER, time_invested INTEGER,
+            last_reviewed TEXT, extra TEXT);
+        CREATE INDEX IF NOT EXISTS concepts_phase ON concepts (phase);
+        CREATE INDEX IF NOT EXISTS concepts_module ON concepts (module);
+        CREATE INDEX IF NOT EXISTS concepts_mastery ON concepts (mastery_level);
+        CREATE TABLE IF NOT EXISTS research_projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, phase INTEGER, status TEXT,
+            data TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS research_projects_status ON research_projects (status);
+        CREATE INDEX IF NOT EXISTS research_projects_phase ON research_projects (phase);
+        CREATE TABLE IF NOT EXISTS study_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, concept TEXT, date TEXT, data TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS study_sessions_concept ON study_sessions (concept);
+        CREATE INDEX IF NOT EXISTS study_sessions_date ON study_sessions (date);
+        CREATE TABLE IF NOT EXISTS entries (
+            section TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL,
+            PRIMARY KEY (section, key));
+        CREATE TABLE IF NOT EXISTS items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, section TEXT NOT NULL, data TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS items_section ON items (section, id);
+        CREATE TABLE IF NOT EXISTS scalars (section TEXT PRIMARY KEY, data TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS changelog (
+            generation INTEGER NOT NULL, kind TEXT NOT NULL, section TEXT NOT NULL, key TEXT);
+        CREATE INDEX IF NOT EXISTS changelog_generation ON changelog (generation);
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        import sqlite3  # only the SQLite backend pays for the import
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._sections = {name: kind for name, kind in
+                          self.conn.execute("SELECT name, kind FROM sections")}
+        self.version: Optional[int] = None  # PRAGMA data_version as of the last load or write
+        self.generation: Optional[int] = None  # change log generation as of the last load or write
+
+    def _data_version(self) -> int:
+        # Changes whenever another connection commits, never for our own commits
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _generation(self) -> int:
+        return self.conn.execute("SELECT MAX(generation) FROM changelog").fetchone()[0] or 0
+
+    # Loading
+
+    @timed("storage.sqlite.load")
+    def load(self) -> Optional[Dict]:
+        with self.conn:  # one read transaction, so the sections are consistent with each other
+            self.conn.execute("BEGIN")
+            self.version = self._data_version()
+            self.generation = self._generation()
+            return self._load_all()
+
+    def _load_all(self) -> Optional[Dict]:
+        rows = self.conn.execute("SELECT name, kind FROM sections ORDER BY position").fetchall()
+        self._sections = {name: kind for name, kind in rows}
+        if not rows:
+            return None
+        return {name: self._load_section(name, kind) for name, kind in rows}
+
+    def _load_section(self, section: str, kind: str):
+        if section == "concepts":
+            return {row[0]: self._concept_from_row(row) for row in self.conn.execute(
+                f"SELECT {', '.join(self.CONCEPT_COLUMNS)}, extra FROM concepts ORDER BY rowid")}
+        if section in self.LIST_TABLES or kind == "list":
+            return self._load_items(section)
+        if kind == "dict":
+            return {key: json.loads(data) for key, data in self.conn.execute(
+                "SELECT key, data FROM entries WHERE section = ? ORDER BY rowid", (section,))}
+        row = self.conn.execute("SELECT data FROM scalars WHERE section = ?", (section,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _load_items(self, section: str, start: int = 0) -> List:
+        """A list section's items from position start on"""
+        if section in self.LIST_TABLES:
+            rows = self.conn.execute(f"SELECT data FROM {self.LIST_TABLES[section][0]} ORDER BY id "
+                                     f"LIMIT -1 OFFSET ?", (start,))
+        else:
+            rows = self.conn.execute("SELECT data FROM items WHERE section = ? ORDER BY id LIMIT -1 OFFSET ?",
+                                     (section, start))
+        return [json.loads(data) for (data,) in rows]
+
+    def _load_keys(self, section: str, keys: Iterable[str]) -> Dict:
+        """The stored values of some keys of a dict section (absent keys are left out)"""
+        keys, found = list(keys), {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            marks = ", ".join("?" * len(chunk))
+            if section == "concepts":
+                for row in self.conn.execute(f"SELECT {', '.join(self.CONCEPT_COLUMNS)}, extra FROM concepts "
+                                             f"WHERE name IN ({marks})", chunk):
+                    found[row[0]] = self._concept_from_row(row)
+            else:
+                for key, data in self.conn.execute(f"SELECT key, data FROM entries "
+                                                   f"WHERE section = ? AND key IN ({marks})", [section, *chunk]):
+                    found[key] = json.loads(data)
+        return found
+
+    def _stored_changes(self, data: Dict, changes: ChangeSet, generation: int) -> StoredChanges:
+        """What other connections stored since our version, read back through the change log"""
+        self._sections = {name: kind for name, kind in self.conn.execute("SELECT name, kind FROM sections")}
+        if self.generation is None or not 0 < generation - self.generation < self.CHANGELOG_GENERATIONS:
+            # The log does not reach back to our version (or the writer did not log)
+            return _diff(self._load_all() or {}, data, changes)
+
+        logged = self.conn.execute("SELECT DISTINCT kind, section, key FROM changelog WHERE generation > ?",
+                                   (self.generation,)).fetchall()
+        others = StoredChanges()
+        replaced = {section for kind, section, _ in logged if kind == "section"} - changes.sections
+        for section in replaced:
+            others.sections[section] = self._load_section(section, self._sections[section])
+        keys: Dict[str, Set[str]] = {}
+        for kind, section, key in logged:
+            if section in replaced or section in changes.sections:
+                continue
+            if kind == "key" and key not in changes.keys.get(section, ()):
+                keys.setdefault(section, set()).add(key)
+            elif kind == "append":
+                known = len(data.get(section, ())) - changes.appended.get(section, 0)
+                items = self._load_items(section, known)
+                if items:
+                    others.appended[section] = (known, items)
+        for section, names in keys.items():
+            found = self._load_keys(section, names)
+            if found:
+                others.keys[section] = found
+            if len(found) < len(names):
+                others.deleted[section] = names - found.keys()
+        return others
+
+    def _concept_from_row(self, row) -> Dict:
+        concept = dict(zip(self.CONCEPT_COLUMNS, row))
+        concept["prerequisites"] = json.loads(concept["prerequisites"])
+        if row[-1]:
+            concept.update(json.loads(row[-1]))
+        return concept
+
+    # Writing
+
+    @timed("storage.sqlite.save")
+    def save(self, data: Dict):
+        """Replace everything stored with data, in one transaction"""
+        changed = self.conn.total_changes
+        with self.conn:
+            generation = self._generation() + 1
+            for table in ["sections", "concepts", "entries", "items", "scalars"] + \
+                    [table for table, _ in self.LIST_TABLES.values()]:
+                self.conn.execute(f"DELETE FROM {table}")
+            self._sections = {}
+            for section in data:
+                self._replace_section(section, data[section])
+            self._log(generation, ChangeSet(sections=set(data)))
+        self.version = self._data_version()
+        self.generation = generation
+        count("storage.sqlite.rows_written", self.conn.total_changes - changed)
+
+    @timed("storage.sqlite.write")
+    def write(self, data: Dict, changes: ChangeSet, rebase: Optional[Rebase] = None) -> StoredChanges:
+        """Apply a ChangeSet row by row, in one transaction, and return what others stored.
+
+        Only the changed rows are written, even if another connection committed since
+        our version: then its changes are read back from the change log, and the
+        sections we replace wholesale (derived totals) come from rebase(its changes).
+        """
+        changed = self.conn.total_changes
+        others, sections = StoredChanges(), {}
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")  # take the write lock before checking the version
+            generation = self._generation()
+            if self._data_version() != self.version:
+                if rebase is None:
+                    raise StaleDataError(f"{self.path} changed since it was loaded")
+                others = self._stored_changes(data, changes, generation)
+                sections = rebase(others)
+            self._write_changes(data, changes, sections)
+            self._log(generation + 1, changes)
+            for section in others.sections:  # as stored now, with our changes in
+                others.sections[section] = self._load_section(section, self._sections[section])
+        self.version = self._data_version()
+        self.generation = generation + 1
+        count("storage.sqlite.rows_written", self.conn.total_changes - changed)
+        return others
+
+    def _log(self, generation: int, changes: ChangeSet):
+        """Record what a write changed under its generation, and forget the oldest writes"""
+        rows = [(generation, "section", section, None) for section in changes.sections]
+        for section, keys in changes.keys.items():
+            if section in changes.sections:
+                continue
+            if len(keys) > self.CHANGELOG_KEYS:
+                rows.append((generation, "section", section, None))
+            else:
+                rows.extend((generation, "key", section, key) for key in keys)
+        rows.extend((generation, "append", section, None) for section, count in changes.appended.items()
+                    if count and section not in changes.sections)
+        self.conn.executemany("INSERT INTO changelog (generation, kind, section, key) VALUES (?, ?, ?, ?)", rows)
+        self.conn.execute("DELETE FROM changelog WHERE generation <= ?", (generation - self.CHANGELOG_GENERATIONS,))
+
+    def _write_changes(self, data: Dict, changes: ChangeSet, sections: Dict):
+        for section in changes.sections:
+            self._replace_section(section, sections[section] if section in sections else data[section])
+        for section, keys in changes.keys.items():
+            if section in changes.sections:
+                continue
+            self._register(section, data[section])
+            if section == "concepts":
+                self._put_concepts(data[section], keys)
+                continue
+            for key in keys:
+                self._put_key(section, key, data[section].get(key, _DELETED))
+        for section, count in changes.appended.items():
+            if section in changes.sections:
+                continue
+            self._register(section, data[section])
+            for item in data[section][len(data[section]) - count:]:
+                self._append_item(section, item)
+
+    def _register(self, section: str, value):
+        if section not in self._sections:
+            kind = "dict" if isinstance(value, Mapping) else "list" if isinstance(value, list) else "scalar"
+            self.conn.execute("INSERT OR IGNORE INTO sections (name, kind, position) VALUES (?, ?, ?)",
+                              (section, kind, len(self._sections)))
+            self._sections[section] = kind
+
+    def _replace_section(self, section: str, value):
+        self._register(section, value)
+        if section == "concepts":
+            self.conn.execute("DELETE FROM concepts")
+        elif section in self.LIST_TABLES:
+            self.conn.execute(f"DELETE FROM {self.LIST_TABLES[section][0]}")
+        else:
+            for table in ("entries", "items", "scalars"):
+                self.conn.execute(f"DELETE FROM {table} WHERE section = ?", (section,))
+
+        if isinstance(value, Mapping):
+            for key in value:
+                self._put_key(section, key, value[key])
+        elif isinstance(value, list):
+            for item in value:
+                self._append_item(section, item)
+        else:
+            self.conn.execute("INSERT INTO scalars (section, data) VALUES (?, ?)", (section, json.dumps(value)))
+
+    def _put_key(self, section: str, key: str, value):
+        if value is _DELETED:
+            if section == "concepts":
+                self.conn.execute("DELETE FROM concepts WHERE name = ?", (key,))
+            else:
+                self.conn.execute("DELETE FROM entries WHERE section = ? AND key = ?", (section, key))
+        elif section == "concepts":
+            self.conn.execute(self._upsert_concept_sql(), self._concept_row(value))
+        else:
+            self.conn.execute(
+                "INSERT INTO entries (section, key, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (section, key) DO UPDATE SET data = excluded.data",
+                (section, key, json.dumps(value)))
+
+    def _put_concepts(self, concepts: Mapping, names: Iterable[str]):
+        """Upsert or delete many concepts with one statement each way.
+
+        New rows are inserted in the order the concept store holds them (names is
+        usually a set), so a reload lists them in the same order as before.
+        """
+        rows, deleted = [], []
+        if hasattr(concepts, "id_of"):
+            names = sorted(names, key=lambda name: concepts.id_of(name) if name in concepts else -1)
+        for name in names:
+            concept = concepts.get(name)
+            if concept is None:
+                deleted.append((name,))
+            else:
+                rows.append(self._concept_row(concept))
+        if deleted:
+            self.conn.executemany("DELETE FROM concepts WHERE name = ?", deleted)
+        if rows:
+            self.conn.executemany(self._upsert_concept_sql(), rows)
+
+    def _concept_row(self, concept) -> List:
+        if hasattr(concept, "to_dict"):
+            concept = concept.to_dict()  # one pass over a stored record instead of a lookup per column
+        if concept.keys() == _CONCEPT_KEYS:  # the usual case: no lookups, no extra column
+            row = list(_concept_values(concept))
+            row[_PREREQUISITES_COLUMN] = _json_encode(row[_PREREQUISITES_COLUMN])
+            row.append(None)
+            return row
+        extra = {k: v for k, v in concept.items() if k not in _CONCEPT_KEYS}
+        row = [concept.get(column) for column in self.CONCEPT_COLUMNS]
+        row[_PREREQUISITES_COLUMN] = _json_encode(concept.get("prerequisites", []))
+        row.append(json.dumps(extra) if extra else None)
+        return row
+
+    def _upsert_concept_sql(self) -> str:
+        return (f"INSERT INTO concepts ({', '.join(self.CONCEPT_COLUMNS)}, extra) "
+                f"VALUES ({', '.join('?' * (len(self.CONCEPT_COLUMNS) + 1))}) "
+                f"ON CONFLICT (name) DO UPDATE SET "
+                + ", ".join(f"{c} = excluded.{c}" for c in self.CONCEPT_COLUMNS[1:] + ["extra"]))
+
+    def _append_item(self, section: str, item):
+        if section in self.LIST_TABLES:
+            table, columns = self.LIST_TABLES[section]
+            values = [item.get(column) if isinstance(item, dict) else None for column in columns]
+            self.conn.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}, data) VALUES ({', '.join('?' * (len(columns) + 1))})",
+                values + [json.dumps(item)])
+        else:
+            self.conn.execute("INSERT INTO items (section, data) VALUES (?, ?)", (section, json.dumps(item)))
+
+    @contextmanager
+    def bulk_load(self):
+        """Write many concepts without keeping the concept indexes up to date row by row.
+
+        The indexes are dropped for the block and built once at the end, which
+        about halves the cost of inserting a large curriculum. Queries in other
+        connections still work meanwhile, only without the indexes.
+        """
+        with self.conn:
+            for index in self.CONCEPT_INDEXES:
+                self.conn.execute(f"DROP INDEX IF EXISTS {index}")
+        try:
+            yield self
+        finally:
+            self.conn.executescript(self.SCHEMA)  # CREATE INDEX IF NOT EXISTS puts them back
+
+    def close(self):
+        self.conn.close()
+
+
+_CONCEPT_KEYS = frozenset(SqliteStorage.CONCEPT_COLUMNS)
+_concept_values = operator.itemgetter(*SqliteStorage.CONCEPT_COLUMNS)
+_PREREQUISITES_COLUMN = SqliteStorage.CONCEPT_COLUMNS.index("prerequisites")
+_json_encode = json.JSONEncoder().encode  # json.dumps with default arguments, minus its argument checks
+
+
+def open_storage(path: Union[str, Path], backend: Optional[str] = None):
+    """Open the storage backend for path: "json", "sqlite", or picked from the file suffix"""
+    path = Path(path)
+    if backend is None:
+        backend = "sqlite" if path.suffix in SQLITE_SUFFIXES else "json"
+    if backend == "json":
+        return JsonStorage(path)
+    if backend == "sqlite":
+        return SqliteStorage(path)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def migrate_json_to_sqlite(json_path: Union[str, Path], sqlite_path: Union[str, Path]) -> int:
+    """One-shot copy of a JSON tracker file into a SQLite database; returns the concept count"""
+    data = JsonStorage(json_path).load()
+    if data is None:
+        raise FileNotFoundError(f"No tracker data at {json_path}")
+    storage = SqliteStorage(sqlite_path)
+    try:
+        storage.save(data)
+    finally:
+        storage.close()
+    return len(data.get("concepts", {}))
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Compact concept store for the Complete Mathematics Mastery Tracker
+Concepts as immutable records with interned strings and integer prerequisite ids,
+exposed through the same mapping interface as the dict-of-dicts it replaces
+"""
+
+import sys
+from array import array
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+CONCEPT_FIELDS = ("name", "phase", "module", "difficulty", "prerequisites",
+                  "mastery_level", "time_invested", "last_reviewed")
+
+_RECORD_FIELDS = ("phase", "module", "difficulty", "mastery_level", "time_invested", "last_reviewed")
+
+_FIELD_SET = frozenset(CONCEPT_FIELDS)
+_RECORD_INDEX = {field: index for index, field in enumerate(_RECORD_FIELDS)}
+
+# Marks an extra field being deleted
+_DELETE = object()
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class ConceptRecord(NamedTuple):
+    """One concept without its name (the store key) and with prerequisites as a
+    slice of the store's id array; updates replace the record"""
+    phase: int
+    module: str
+    difficulty: int
+    mastery_level: int
+    time_invested: int
+    last_reviewed: Optional[str]
+    prereq_start: int
+    prereq_count: int
+    extra: Optional[Dict] = None  # fields beyond the standard ones, if any
+
+
+class ConceptView(MutableMapping):
+    """Dict-like handle on one stored concept; reads and writes go through to the store"""
+
+    __slots__ = ("_store", "_id")
+
+    def __init__(self, store: "ConceptStore", concept_id: int):
+        self._store = store
+        self._id = concept_id
+
+    def __getitem__(self, key: str):
+        return self._store._get_field(self._id, key)
+
+    def __setitem__(self, key: str, value):
+        self._store._set_field(self._id, key, value)
+
+    def __delitem__(self, key: str):
+        if key in CONCEPT_FIELDS:
+            raise KeyError(f"Cannot delete concept field '{key}'")
+        self._store._set_field(self._id, key, _DELETE)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from CONCEPT_FIELDS
+        extra = self._store._records[self._id].extra
+        if extra:
+            yield from extra
+
+    def __len__(self) -> int:
+        extra = self._store._records[self._id].extra
+        return len(CONCEPT_FIELDS) + (len(extra) if extra else 0)
+
+    def to_dict(self) -> Dict:
+        return self._store._as_dict(self._id)
+
+    def __copy__(self) -> Dict:
+        return self.to_dict()
+
+    def __deepcopy__(self, memo) -> Dict:
+        return self.to_dict()  # prerequisites are materialized as a fresh list
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+class ConceptStore(MutableMapping):
+    """Concept name -> concept, stored compactly.
+
+    Every name (concept or prerequisite) is interned once and given an integer id.
+    Records are NamedTuples indexed by id, modules and review dates are interned
+    strings, and all prerequisite lists live in one array('i') of ids. Item access
+    returns a ConceptView, so existing code that reads and assigns concept fields
+    keeps working; plain dicts are only built when a concept is copied or
+    serialized.
+    """
+
+    def __init__(self, concepts: Union[Mapping, Iterable[Tuple[str, Mapping]]] = ()):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._records: List[Optional[ConceptRecord]] = []
+        self._prereqs = array("i")
+        self._garbage = 0  # prerequisite slots no longer referenced by any record
+        self._size = 0
+        self.update(concepts)
+
+    # Ids and prerequisites
+
+    def intern(self, name: str) -> int:
+        """The id of a name, giving it one if it has none (it need not be a concept)"""
+        concept_id = self._ids.get(name)
+        if concept_id is None:
+            name = sys.intern(name)
+            concept_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._records.append(None)
+        return concept_id
+
+    def _store_prereqs(self, names: Iterable[str]) -> Tuple[int, int]:
+        prereqs, ids = self._prereqs, self._ids
+        start = len(prereqs)
+        for name in names:
+            concept_id = ids.get(name)
+            prereqs.append(self.intern(name) if concept_id is None else concept_id)
+        return start, len(prereqs) - start
+
+    def _release_prereqs(self, record: ConceptRecord):
+        self._garbage += record.prereq_count
+        if self._garbage > 1024 and self._garbage * 2 > len(self._prereqs):
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the prerequisite array without the slices of replaced records"""
+        prereqs = array("i")
+        for concept_id, record in enumerate(self._records):
+            if record is not None:
+                start = len(prereqs)
+                prereqs.extend(self._prereqs[record.prereq_start:record.prereq_start + record.prereq_count])
+                self._records[concept_id] = record._replace(prereq_start=start)
+        self._prereqs = prereqs
+        self._garbage = 0
+
+    def _prereq_names(self, record: ConceptRecord) -> List[str]:
+        names = self._names
+        return [names[i] for i in self._prereqs[record.prereq_start:record.prereq_start + record.prereq_count]]
+
+    def prerequisite_ids(self, concept_id: int) -> array:
+        """The prerequisite ids of a concept (see name_of)"""
+        record = self._records[concept_id]
+        if record is None:
+            raise KeyError(self._names[concept_id])
+        return self._prereqs[record.prereq_start:record.prereq_start + record.prereq_count]
+
+    def id_of(self, name: str) -> int:
+        return self._ids[name]
+
+    def name_of(self, concept_id: int) -> str:
+        return self._names[concept_id]
+
+    # Field access for ConceptView
+
+    def _get_field(self, concept_id: int, key: str):
+        record = self._records[concept_id]
+        if record is None:
+            raise KeyError(self._names[concept_id])
+        index = _RECORD_INDEX.get(key)
+        if index is not None:
+            return record[index]
+        if key == "name":
+            return self._names[concept_id]
+        if key == "prerequisites":
+            return self._prereq_names(record)
+        if record.extra and key in record.extra:
+            return record.extra[key]
+        raise KeyError(key)
+
+    def _set_field(self, concept_id: int, key: str, value):
+        record = self._records[concept_id]
+        if record is None:
+            raise KeyError(self._names[concept_id])
+        if key == "name":
+            if value != self._names[concept_id]:
+                raise ValueError("A stored concept cannot be renamed in place")
+        elif key == "prerequisites":
+            self._release_prereqs(record)
+            start, count = self._store_prereqs(value)
+            self._records[concept_id] = record._replace(prereq_start=start, prereq_count=count)
+        elif key in _RECORD_FIELDS:
+            self._records[concept_id] = record._replace(**{key: _intern(value)})
+        else:
+            extra = dict(record.extra or {})
+            if value is _DELETE:
+                extra.pop(key, None)
+            else:
+                extra[key] = value
+            self._records[concept_id] = record._replace(extra=extra or None)
+
+    def _as_dict(self, concept_id: int) -> Dict:
+        record = self._records[concept_id]
+        if record is None:
+            raise KeyError(self._names[concept_id])
+        concept = {"name": self._names[concept_id], "phase": record.phase, "module": record.module,
+                   "difficulty": record.difficulty, "prerequisites": self._prereq_names(record),
+                   "mastery_level": record.mastery_level, "time_invested": record.time_invested,
+                   "last_reviewed": record.last_reviewed}
+        if record.extra:
+            concept.update(record.extra)
+        return concept
+
+    # Mapping interface
+
+    def __getitem__(self, name: str) -> ConceptView:
+        concept_id = self._ids.get(name)
+        if concept_id is None or self._records[concept_id] is None:
+            raise KeyError(name)
+        return ConceptView(self, concept_id)
+
+    def __setitem__(self, name: str, concept: Mapping):
+        prerequisites = list(concept.get("prerequisites", ()))  # read before concept's own record changes
+        concept_id = self._ids.get(name)
+        if concept_id is None:
+            concept_id = self.intern(name)
+        old = self._records[concept_id]
+        if old is not None:
+            self._release_prereqs(old)
+        else:
+            self._size += 1
+        start, count = self._store_prereqs(prerequisites)
+        extra = None
+        if len(concept) != len(CONCEPT_FIELDS) or not _FIELD_SET.issuperset(concept):
+            extra = {key: concept[key] for key in concept.keys() - _FIELD_SET} or None
+        get = concept.get
+        self._records[concept_id] = ConceptRecord(
+            get("phase"), _intern(get("module")), get("difficulty"), get("mastery_level"),
+            get("time_invested"), _intern(get("last_reviewed")), start, count, extra)
+
+    def __delitem__(self, name: str):
+        concept_id = self._ids.get(name)
+        if concept_id is None or self._records[concept_id] is None:
+            raise KeyError(name)
+        self._release_prereqs(self._records[concept_id])
+        self._records[concept_id] = None  # the id stays interned: other concepts may require it
+        self._size -= 1
+
+    def get(self, name: str, default=None):
+        concept_id = self._ids.get(name)
+        if concept_id is None or self._records[concept_id] is None:
+            return default
+        return ConceptView(self, concept_id)
+
+    def __contains__(self, name) -> bool:
+        concept_id = self._ids.get(name)
+        return concept_id is not None and self._records[concept_id] is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for concept_id, record in enumerate(self._records):
+            if record is not None:
+                yield self._names[concept_id]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def items(self) -> "_StoreItems":
+        return _StoreItems(self)
+
+    def values(self) -> "_StoreValues":
+        return _StoreValues(self)
+
+    def _views(self) -> Iterator[Tuple[str, ConceptView]]:
+        for concept_id, record in enumerate(self._records):
+            if record is not None:
+                yield self._names[concept_id], ConceptView(self, concept_id)
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Plain dict-of-dicts copy, the layout of the JSON file"""
+        names, prereqs, concepts = self._names, self._prereqs, {}
+        for name, record in zip(names, self._records):
+            if record is None:
+                continue
+            phase, module, difficulty, mastery_level, time_invested, last_reviewed, start, count, extra = record
+            concept = concepts[name] = {
+                "name": name, "phase": phase, "module": module, "difficulty": difficulty,
+                "prerequisites": [names[i] for i in prereqs[start:start + count]] if count else [],
+                "mastery_level": mastery_level, "time_invested": time_invested, "last_reviewed": last_reviewed}
+            if extra:
+                concept.update(extra)
+        return concepts
+
+    def __deepcopy__(self, memo) -> Dict[str, Dict]:
+        return self.to_dict()
+
+    def __repr__(self) -> str:
+        return f"<ConceptStore: {len(self)} concepts>"
+
+
+class _StoreItems(ItemsView):
+    """(name, view) pairs without a name lookup per item"""
+
+    def __iter__(self):
+        return self._mapping._views()
+
+
+class _StoreValues(ValuesView):
+
+    def __iter__(self):
+        return (view for _, view in self._mapping._views())